@@ -3,23 +3,25 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 
+from .password_hashing import hashing_pool, pwd_context  # noqa: F401  (pwd_context kept importable from here)
 from .schemas import TokenData
 
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "change-me-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 1 day
 
-# Use pbkdf2_sha256 instead of bcrypt to avoid backend issues / 72-byte limit
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
-
+# Hashing runs in a process pool, see password_hashing
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return hashing_pool.verify(plain_password, hashed_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_pool.verify_async(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return hashing_pool.hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
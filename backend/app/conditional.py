@@ -0,0 +1,87 @@
+# backend/app/conditional.py
+
+import hashlib
+import os
+from typing import Callable, Optional
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+
+from .data_version import get_data_versions
+from .database import get_db
+
+# Part of every validator. Change it with a release that changes what these
+# endpoints return, so clients do not keep revalidating the old shape.
+ETAG_SALT = os.getenv("ETAG_SALT", "")
+
+
+def make_etag(*parts) -> str:
+    """A weak ETag for a response determined by `parts`."""
+    digest = hashlib.sha1(repr((ETAG_SALT,) + parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match against `etag`, compared weakly as RFC 9110 asks for GET."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(_opaque(tag) == _opaque(etag) for tag in if_none_match.split(","))
+
+
+def _check(request: Request, response: Response, db: Session, counters, user):
+    parts = [request.url.path, str(request.query_params)]
+    if counters:
+        versions = get_data_versions(db, counters)
+        parts.append(tuple(versions[name] for name in counters))
+    if user is not None:
+        # What the routes read from the principal (county grants may be cached
+        # for a while, so they are part of the validator, not a counter)
+        parts.append((user.id, user.email, user.full_name, user.is_admin, tuple(sorted(user.allowed_counties))))
+
+    etag = make_etag(*parts)
+    headers = {"ETag": etag, "Cache-Control": "no-cache" if user is None else "private, no-cache"}
+    if user is not None:
+        headers["Vary"] = "Authorization"
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        # Raised from a dependency, so the route never queries or serializes
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+
+def conditional_get(*counters: str, principal: Optional[Callable] = None):
+    """
+    Route dependency for read endpoints whose response is a function of the
+    given data-version counters (see data_version), the request URL and, with
+    `principal` (get_current_user / get_current_admin), the caller. Sets an
+    ETag from those and answers a matching If-None-Match with 304 before the
+    route runs.
+
+        @router.get("/counties", dependencies=[conditional_get(VOTERS, principal=get_current_admin)])
+
+    The counters are read before the route's own queries, so a change
+    committed in between can only make the ETag older than the body, which
+    costs one extra full response, never a stale one.
+    """
+    if principal is None:
+
+        def dependency(request: Request, response: Response, db: Session = Depends(get_db)):
+            _check(request, response, db, counters, None)
+
+    else:
+
+        def dependency(
+            request: Request,
+            response: Response,
+            db: Session = Depends(get_db),
+            user=Depends(principal),
+        ):
+            _check(request, response, db, counters, user)
+
+    return Depends(dependency)
@@ -0,0 +1,76 @@
+# backend/app/county_counts.py
+
+from typing import Mapping, Optional, Sequence
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+from .models import CountyVoterCount, Voter
+from .voter_import import dialect_insert
+
+
+def refresh_county_counts(db: Session):
+    """
+    Recount voters per county into county_voter_counts, inside the caller's
+    transaction. Only for filling the table on databases that predate it;
+    imports keep it current with apply_county_deltas.
+    """
+    county = func.coalesce(Voter.county, "")
+    merged = dict(db.query(county, func.count(Voter.id)).group_by(county).all())
+
+    db.query(CountyVoterCount).filter(CountyVoterCount.county.notin_(list(merged))).delete(
+        synchronize_session=False
+    )
+    if merged:
+        stmt = dialect_insert(db)(CountyVoterCount.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CountyVoterCount.county],
+            set_={"voters": stmt.excluded.voters},
+        )
+        db.execute(stmt, [{"county": c, "voters": n} for c, n in merged.items()])
+
+
+def apply_county_deltas(db: Session, deltas: Mapping[str, int]):
+    """
+    Add an import's change in voters per county (new voters, voters moved
+    between counties; see upsert_voter_chunk) to county_voter_counts, inside
+    the caller's transaction. Each count is incremented in place, so
+    concurrent imports add up.
+    """
+    changed = {county: n for county, n in deltas.items() if n}
+    if not changed:
+        return
+    table = CountyVoterCount.__table__
+    stmt = dialect_insert(db)(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.county],
+        set_={"voters": table.c.voters + stmt.excluded.voters},
+    )
+    db.execute(stmt, [{"county": c, "voters": n} for c, n in changed.items()])
+    db.query(CountyVoterCount).filter(
+        CountyVoterCount.county.in_(list(changed)), CountyVoterCount.voters <= 0
+    ).delete(synchronize_session=False)
+
+
+def clear_county_counts(db: Session):
+    db.query(CountyVoterCount).delete(synchronize_session=False)
+
+
+def county_total(db: Session, counties: Optional[Sequence[str]] = None) -> int:
+    """Voters in the given counties (every county when None)."""
+    query = db.query(func.coalesce(func.sum(CountyVoterCount.voters), 0))
+    if counties is not None:
+        query = query.filter(CountyVoterCount.county.in_(list(counties)))
+    return query.scalar()
+
+
+def ensure_county_counts():
+    """Fill the counts table on databases that had voters before it existed."""
+    db = SessionLocal()
+    try:
+        if db.query(CountyVoterCount).first() is None and db.query(Voter.id).first() is not None:
+            refresh_county_counts(db)
+            db.commit()
+    finally:
+        db.close()
@@ -0,0 +1,311 @@
+# backend/app/county_snapshots.py
+"""
+Prebuilt, gzip-compressed, columnar snapshots of each county's voters for
+offline use. A snapshot is JSON:
+
+    {"county": ..., "voters": n, "change_seq": ...,
+     "columns": {"id": [...], "voter_id": [...], "city": {"values": [...], "codes": [...]}, ...}}
+
+Every column is a list with one entry per voter, or, for repetitive columns
+(city, precinct, party...), a dictionary of distinct values plus one index
+per voter. change_seq is the VOTER_CHANGES number the snapshot is current
+to: continue from there with /sync/changes (GET /voters/snapshots hands
+out the cursor for it).
+
+Files are named by the sha256 of their bytes and listed in manifest.json,
+so every worker process serves the same snapshots and a content hash is
+also a stable ETag. Builds hold a lock file in the directory, so only one
+process rewrites the snapshots and the manifest at a time.
+"""
+
+import fcntl
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from .data_version import VOTER_CHANGES, VOTERS_EPOCH, get_data_version
+from .database import SessionLocal
+from .live_updates import DASHBOARD_COLUMNS
+from .models import Voter
+from .paths import SNAPSHOTS_DIR
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+BUILD_LOCK = ".build.lock"
+
+# A column is dictionary-encoded when it has at most this share of distinct values.
+DICTIONARY_RATIO = 0.25
+
+# Rows fetched per round trip while a county is read.
+SNAPSHOT_BATCH_SIZE = int(os.getenv("SNAPSHOT_BATCH_SIZE", "2000"))
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+def _slug(county: str) -> str:
+    return _SLUG_RE.sub("-", county.lower()).strip("-") or "county"
+
+
+class _ColumnSpool:
+    """
+    One column of a snapshot being built: its values, JSON-encoded, one per
+    line in a temp file, and their distinct values while there are few
+    enough to dictionary-encode the column.
+    """
+
+    def __init__(self, max_distinct: float):
+        self.file = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+        self.max_distinct = max_distinct
+        self.distinct: Optional[Dict[str, int]] = {}
+        self.count = 0
+
+    def add(self, value):
+        # JSON escapes newlines, so every value stays on its own line
+        encoded = json.dumps(value, default=str, separators=(",", ":"))
+        self.file.write(encoded)
+        self.file.write("\n")
+        self.count += 1
+        if self.distinct is not None:
+            self.distinct.setdefault(encoded, len(self.distinct))
+            if len(self.distinct) > self.max_distinct:
+                self.distinct = None
+
+    def write_to(self, out):
+        self.file.seek(0)
+        values = (line[:-1] for line in self.file)
+        if self.distinct is not None and len(self.distinct) <= DICTIONARY_RATIO * self.count:
+            out.write('{"values":[' + ",".join(self.distinct) + '],"codes":')
+            _write_list(out, (str(self.distinct[value]) for value in values))
+            out.write("}")
+        else:
+            _write_list(out, values)
+
+    def close(self):
+        self.file.close()
+
+
+def _write_list(out, items):
+    out.write("[")
+    for i, item in enumerate(items):
+        if i:
+            out.write(",")
+        out.write(item)
+    out.write("]")
+
+
+class _HashingWriter:
+    """Passes writes through to `raw`, hashing and counting the bytes."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.sha256 = hashlib.sha256()
+        self.bytes = 0
+
+    def write(self, data) -> int:
+        self.sha256.update(data)
+        self.bytes += len(data)
+        return self.raw.write(data)
+
+    def flush(self):
+        self.raw.flush()
+
+
+def _write_atomic(path: str, data: bytes):
+    fd, tmp = tempfile.mkstemp(dir=SNAPSHOTS_DIR, prefix=".tmp_")
+    with os.fdopen(fd, "wb") as out:
+        out.write(data)
+    os.replace(tmp, path)
+
+
+class CountySnapshots:
+    """
+    Builds the snapshots and reads the manifest. Rebuilding only rewrites
+    counties whose voters changed: a county's (voter count, highest
+    change_seq) is recorded with its snapshot and compared on every build.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._building = False
+        self._pending = False
+        self._manifest: Dict[str, dict] = {}
+        self._manifest_mtime: Optional[float] = None
+
+    # -------------------------------------------------
+    # Reading
+    # -------------------------------------------------
+    def manifest(self) -> Dict[str, dict]:
+        """county -> {file, sha256, bytes, voters, change_seq, built_at}; reloaded when the file changes."""
+        path = os.path.join(self.directory, MANIFEST)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return {}
+        with self._lock:
+            if mtime != self._manifest_mtime:
+                try:
+                    self._manifest = self._read_manifest()
+                    self._manifest_mtime = mtime
+                except (OSError, ValueError):
+                    logger.exception("Could not read the county snapshot manifest")
+            return self._manifest
+
+    def _read_manifest(self) -> Dict[str, dict]:
+        with open(os.path.join(self.directory, MANIFEST), "r", encoding="utf-8") as f:
+            return json.load(f).get("counties", {})
+
+    def path_of(self, entry: dict) -> str:
+        return os.path.join(self.directory, entry["file"])
+
+    # -------------------------------------------------
+    # Building
+    # -------------------------------------------------
+    def build(self, db: Session) -> int:
+        """Bring every county's snapshot up to date. Returns how many were (re)written."""
+        # Every worker process rebuilds after an import. One at a time, so no
+        # process deletes files another has just listed in the manifest.
+        with open(os.path.join(self.directory, BUILD_LOCK), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            return self._build(db)
+
+    def _build(self, db: Session) -> int:
+        epoch = get_data_version(db, VOTERS_EPOCH)
+        change_seq = get_data_version(db, VOTER_CHANGES)
+        state = {
+            county: [n, top]
+            for county, n, top in db.query(Voter.county, func.count(Voter.id), func.max(Voter.change_seq))
+            .filter(Voter.county.isnot(None), Voter.county != "")
+            .group_by(Voter.county)
+        }
+
+        # Read under the lock, not from the cache: the last build may have been another process's
+        try:
+            old = self._read_manifest()
+        except (OSError, ValueError):
+            old = {}
+        manifest: Dict[str, dict] = {}
+        written = 0
+        for county, (n, top) in sorted(state.items()):
+            entry = old.get(county)
+            if (
+                entry
+                and entry.get("epoch") == epoch
+                and entry.get("state") == [n, top]
+                and os.path.exists(self.path_of(entry))
+            ):
+                manifest[county] = entry
+                continue
+
+            manifest[county] = {
+                **self._write_snapshot(db, county, n, change_seq),
+                "change_seq": change_seq,
+                "built_at": datetime.utcnow().isoformat() + "Z",
+                "epoch": epoch,
+                "state": [n, top],
+            }
+            written += 1
+
+        if written or set(manifest) != set(old):
+            _write_atomic(
+                os.path.join(self.directory, MANIFEST),
+                json.dumps({"counties": manifest}, indent=1).encode("utf-8"),
+            )
+            self._remove_unlisted(manifest)
+        return written
+
+    def _write_snapshot(self, db: Session, county: str, expected: int, change_seq: int) -> dict:
+        """
+        Stream one county's voters into a snapshot file: rows are read in
+        batches and spooled per column, then the columns are written through
+        gzip to a temp file that is hashed as it is written.
+        """
+        names = [c.key for c in DASHBOARD_COLUMNS]
+        spools = [_ColumnSpool(DICTIONARY_RATIO * expected) for _ in names]
+        tmp = None
+        try:
+            statement = select(*DASHBOARD_COLUMNS).where(Voter.county == county).order_by(Voter.id)
+            voters = 0
+            for row in db.execute(statement.execution_options(yield_per=SNAPSHOT_BATCH_SIZE)):
+                for spool, value in zip(spools, row):
+                    spool.add(value)
+                voters += 1
+
+            fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp_")
+            with os.fdopen(fd, "wb") as raw:
+                hashed = _HashingWriter(raw)
+                # mtime=0 keeps the bytes (and so the hash) a function of the content
+                with io.TextIOWrapper(gzip.GzipFile(fileobj=hashed, mode="wb", mtime=0), encoding="utf-8") as out:
+                    head = {"county": county, "voters": voters, "change_seq": change_seq}
+                    out.write(json.dumps(head, separators=(",", ":"))[:-1] + ',"columns":{')
+                    for i, (name, spool) in enumerate(zip(names, spools)):
+                        out.write(("," if i else "") + json.dumps(name) + ":")
+                        spool.write_to(out)
+                    out.write("}}")
+
+            sha256 = hashed.sha256.hexdigest()
+            filename = f"{_slug(county)}-{sha256[:16]}.json.gz"
+            os.replace(tmp, os.path.join(self.directory, filename))
+            tmp = None
+            return {"file": filename, "sha256": sha256, "bytes": hashed.bytes, "voters": voters}
+        finally:
+            for spool in spools:
+                spool.close()
+            if tmp is not None:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+
+    def _remove_unlisted(self, manifest: Dict[str, dict]):
+        keep = {entry["file"] for entry in manifest.values()} | {MANIFEST}
+        for name in os.listdir(self.directory):
+            if name.endswith(".json.gz") and name not in keep:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def _rebuild(self):
+        while True:
+            db = SessionLocal()
+            try:
+                written = self.build(db)
+                if written:
+                    logger.info("Rebuilt %d county snapshots", written)
+            except Exception:
+                logger.exception("Could not build county snapshots")
+            finally:
+                db.close()
+            with self._lock:
+                if not self._pending:
+                    self._building = False
+                    return
+                self._pending = False
+
+    def start_rebuild(self):
+        """
+        Rebuild in a background thread. A request made while a build runs
+        queues one more pass, so changes committed mid-build are picked up.
+        """
+        with self._lock:
+            if self._building:
+                self._pending = True
+                return
+            self._building = True
+        threading.Thread(target=self._rebuild, name="county-snapshots", daemon=True).start()
+
+
+county_snapshots = CountySnapshots(SNAPSHOTS_DIR)
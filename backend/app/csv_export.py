@@ -0,0 +1,76 @@
+# backend/app/csv_export.py
+
+import csv
+import os
+import zlib
+from typing import Iterator, List, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.sql import Select
+
+from .database import SessionLocal
+
+# Rows fetched from the database (server-side cursor on Postgres) and sent to
+# the client per batch.
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+
+
+class _Pending:
+    """File-like target for csv.writer that hands back what was written since the last take()."""
+
+    def __init__(self):
+        self._parts: List[str] = []
+
+    def write(self, text: str):
+        self._parts.append(text)
+
+    def take(self) -> bytes:
+        data = "".join(self._parts).encode("utf-8")
+        self._parts = []
+        return data
+
+
+def iter_csv(header: Sequence[str], statement: Select, compress: bool = False) -> Iterator[bytes]:
+    """
+    Run `statement` and yield it as CSV, one chunk per EXPORT_BATCH_SIZE rows,
+    so memory stays flat however large the export is. With `compress` the
+    chunks form one gzip stream, flushed after every batch so the client
+    keeps receiving data.
+
+    Uses a session of its own: the response is still streaming after the
+    request's session has been closed.
+    """
+    pending = _Pending()
+    writer = csv.writer(pending)
+    compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31: gzip container
+
+    def encoded(data: bytes) -> bytes:
+        if compressor is None:
+            return data
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    writer.writerow(header)
+    yield encoded(pending.take())
+
+    db = SessionLocal()
+    try:
+        result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for batch in result.partitions():
+            writer.writerows([["" if value is None else value for value in row] for row in batch])
+            yield encoded(pending.take())
+    finally:
+        db.close()
+
+    if compressor is not None:
+        yield compressor.flush()
+
+
+def csv_response(filename: str, header: Sequence[str], statement: Select, compress: bool = False) -> StreamingResponse:
+    """A download of iter_csv(); `filename` gets .gz appended when compressed."""
+    if compress:
+        filename += ".gz"
+    return StreamingResponse(
+        iter_csv(header, statement, compress),
+        media_type="application/gzip" if compress else "text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
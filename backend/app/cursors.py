@@ -0,0 +1,35 @@
+# backend/app/cursors.py
+
+import base64
+import hashlib
+import json
+
+from fastapi import HTTPException
+
+
+def encode_cursor(order: str, key: list) -> str:
+    raw = json.dumps({"o": order, "k": key}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, order: str, length: int) -> list:
+    """
+    Cursors are opaque to clients: base64(JSON) of the sort key of the last row
+    returned, tagged with the ordering they belong to. A cursor from another
+    ordering (or anything else) is a 400.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if data["o"] == order and isinstance(data["k"], list) and len(data["k"]) == length:
+            return data["k"]
+    except (ValueError, KeyError, TypeError):
+        pass
+    raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def counties_digest(user) -> str:
+    """Names the set of counties the caller may see (admins: all of them), for sync cursors."""
+    if user.is_admin:
+        return "*"
+    return hashlib.sha256("\n".join(sorted(user.allowed_counties)).encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,123 @@
+# backend/app/data_version.py
+
+from typing import Dict
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+from .models import DataVersion, UserVoterTag, Voter
+
+# Bumped by voter imports, voted imports, deleting voters and contact edits.
+VOTERS = "voters"
+
+# Bumped only by voter-file imports that change rows and by deleting voters:
+# for what only the voter file sets (names, addresses), see suggest_index.
+VOTER_FILE = "voter_file"
+
+# Change sequences for /sync/changes (see next_change_seq): one for voter
+# rows, one for tags, so tagging never waits on a running import. The epoch
+# is bumped when every voter is deleted, which no row can record.
+VOTER_CHANGES = "voter_changes"
+TAG_CHANGES = "tag_changes"
+VOTERS_EPOCH = "voters_epoch"
+
+# The highest VOTER_CHANGES number whose county moves were pruned, and the
+# highest TAG_CHANGES number whose untaggings were (see sync_history).
+VOTER_HISTORY_PRUNED = "voter_history_pruned"
+TAG_HISTORY_PRUNED = "tag_history_pruned"
+
+# Bumped when users or their county grants change (see principal_cache).
+USERS = "users"
+
+# Bumped when the branding (app name, logo) changes.
+BRANDING = "branding"
+
+COUNTERS = (
+    VOTERS,
+    VOTER_FILE,
+    VOTER_CHANGES,
+    TAG_CHANGES,
+    VOTERS_EPOCH,
+    VOTER_HISTORY_PRUNED,
+    TAG_HISTORY_PRUNED,
+    USERS,
+    BRANDING,
+)
+
+
+def bump_data_version(db: Session, name: str = VOTERS) -> None:
+    """
+    Increment a data version inside the caller's transaction, so readers in
+    any process see the new version exactly when the change commits.
+    """
+    updated = (
+        db.query(DataVersion)
+        .filter(DataVersion.name == name)
+        .update({DataVersion.version: DataVersion.version + 1}, synchronize_session=False)
+    )
+    if not updated:
+        db.add(DataVersion(name=name, version=1))
+        db.flush()
+
+
+def next_change_seq(db: Session, name: str) -> int:
+    """
+    Take the next number of a change sequence for the rows this transaction
+    writes. The UPDATE locks the counter row until the transaction ends, so
+    transactions numbered from one counter commit in number order: a reader
+    that sees the counter at n can rely on every change numbered up to n
+    being visible.
+    """
+    seq = db.execute(
+        update(DataVersion)
+        .where(DataVersion.name == name)
+        .values(version=DataVersion.version + 1)
+        .returning(DataVersion.version)
+    ).scalar()
+    if seq is None:
+        db.add(DataVersion(name=name, version=1))
+        db.flush()
+        seq = 1
+    return seq
+
+
+def get_data_version(db: Session, name: str = VOTERS) -> int:
+    version = db.query(DataVersion.version).filter(DataVersion.name == name).scalar()
+    return version or 0
+
+
+def get_data_versions(db: Session, names) -> Dict[str, int]:
+    """Several counters in one query; missing ones read as 0."""
+    versions = dict(db.query(DataVersion.name, DataVersion.version).filter(DataVersion.name.in_(list(names))))
+    return {name: versions.get(name) or 0 for name in names}
+
+
+def ensure_data_versions():
+    """Create the counter rows, so bumps are plain UPDATEs."""
+    db = SessionLocal()
+    try:
+        present = {row[0] for row in db.query(DataVersion.name).filter(DataVersion.name.in_(COUNTERS))}
+        for name in COUNTERS:
+            if name not in present:
+                db.add(DataVersion(name=name, version=0))
+        db.commit()
+    finally:
+        db.close()
+
+
+def ensure_change_seqs():
+    """
+    Number the voters and tags written before change sequences existed as 0,
+    so a first /sync/changes call returns them. A no-op once done (the
+    change-order indexes find the NULLs).
+    """
+    db = SessionLocal()
+    try:
+        for model in (Voter, UserVoterTag):
+            db.query(model).filter(model.change_seq.is_(None)).update(
+                {model.change_seq: 0}, synchronize_session=False
+            )
+        db.commit()
+    finally:
+        db.close()
@@ -1,43 +1,104 @@
-from fastapi import Depends, HTTPException, status
+import hashlib
+import os
+import secrets
+import time
+
+from fastapi import Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 
-from .database import get_db
-from .models import User
-from .auth import verify_password, create_access_token, decode_access_token
+from .database import SessionLocal, get_db
+from .models import StreamTicket, User
+from .auth import verify_password_async, create_access_token, decode_access_token
 from .schemas import Token, LoginRequest
+from .principal_cache import Principal, principal_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# How long a stream ticket can wait to be used.
+STREAM_TICKET_SECONDS = int(os.getenv("STREAM_TICKET_SECONDS", "30"))
+
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = db.query(User).filter(User.email == email).first()
+async def authenticate_user(db: Session, email: str, password: str):
+    # The lookup runs in the threadpool and the hash check in the hashing
+    # pool, so a burst of logins never blocks the event loop.
+    user = await run_in_threadpool(lambda: db.query(User).filter(User.email == email).first())
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
     return user
 
 
-def login(login_data: LoginRequest, db: Session) -> Token:
-    user = authenticate_user(db, login_data.email, login_data.password)
+async def login(login_data: LoginRequest, db: Session) -> Token:
+    user = await authenticate_user(db, login_data.email, login_data.password)
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     access_token = create_access_token(data={"sub": user.email})
     return Token(access_token=access_token, token_type="bearer")
 
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+def _principal_for_token(db: Session, token: str) -> Principal:
     token_data = decode_access_token(token)
     if token_data is None or token_data.email is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    user = db.query(User).filter(User.email == token_data.email).first()
+    # Cached with the user's county grants; see principal_cache
+    user = principal_cache.get(db, token_data.email)
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     return user
 
 
-def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> Principal:
+    return _principal_for_token(db, token)
+
+
+def _ticket_id(ticket: str) -> str:
+    return hashlib.sha256(ticket.encode("utf-8")).hexdigest()
+
+
+def issue_stream_ticket(db: Session, user: Principal) -> str:
+    """
+    A ticket that opens one event stream within STREAM_TICKET_SECONDS.
+    EventSource cannot send headers, and a ticket in the URL (and so in
+    access logs) is harmless once used or expired, unlike the access token.
+    """
+    now = time.time()
+    db.execute(delete(StreamTicket).where(StreamTicket.expires_at < now))
+    ticket = secrets.token_urlsafe(32)
+    db.add(StreamTicket(id=_ticket_id(ticket), email=user.email, expires_at=now + STREAM_TICKET_SECONDS))
+    db.commit()
+    return ticket
+
+
+def get_stream_user(ticket: str = Query(..., description="From POST /tags/live/ticket; single use")) -> Principal:
+    """
+    Authenticate a long-lived event stream by redeeming its ticket. Uses a
+    short session of its own so an open stream does not hold a database
+    connection.
+    """
+    db = SessionLocal()
+    try:
+        # Deleting the ticket is what makes it single use, on any worker
+        redeemed = db.execute(
+            delete(StreamTicket)
+            .where(StreamTicket.id == _ticket_id(ticket))
+            .returning(StreamTicket.email, StreamTicket.expires_at)
+        ).first()
+        db.commit()
+        if redeemed is None or redeemed.expires_at < time.time():
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired ticket")
+        user = principal_cache.get(db, redeemed.email)
+        if user is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        return user
+    finally:
+        db.close()
+
+
+def get_current_admin(current_user: Principal = Depends(get_current_user)) -> Principal:
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Admin privileges required")
     return current_user
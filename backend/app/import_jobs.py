@@ -0,0 +1,340 @@
+# backend/app/import_jobs.py
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal, engine
+from .models import ImportJobRecord
+
+logger = logging.getLogger(__name__)
+
+# One worker by default: two imports writing the voters table at the same
+# time only fight over the same rows.
+IMPORT_JOB_WORKERS = int(os.getenv("IMPORT_JOB_WORKERS", "1"))
+
+# Finished jobs are forgotten once more than this many are kept.
+MAX_TRACKED_JOBS = 100
+
+# How often (in rows) a running job refreshes its progress counters, and
+# how often (in seconds) at most it saves them.
+PROGRESS_EVERY_ROWS = 1000
+PROGRESS_SAVE_SECONDS = 1.0
+
+# The process running a job touches it this often. An unfinished job left
+# untouched for JOB_STALE_SECONDS belonged to a process that stopped
+# (restart, crash), which took the uploaded file with it: it is failed.
+JOB_HEARTBEAT_SECONDS = 15
+JOB_STALE_SECONDS = 120
+
+UNFINISHED = ("queued", "running")
+
+# SQLite has one writer at a time and the import holds it until it commits,
+# so there a job is only saved when its status changes; this process's
+# in-memory copy has the live progress (SQLite means a single worker).
+_SAVE_PROGRESS = engine.dialect.name != "sqlite"
+
+_executor = ThreadPoolExecutor(max_workers=IMPORT_JOB_WORKERS, thread_name_prefix="import-job")
+_local: Dict[str, "ImportJob"] = {}  # this process's unfinished jobs
+_jobs_lock = threading.Lock()
+_heartbeat_started = False
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.utcfromtimestamp(ts).isoformat() + "Z" if ts else None
+
+
+def _job_dict(job) -> dict:
+    """The status payload of an ImportJob or an ImportJobRecord."""
+    now = time.time()
+    elapsed = ((job.finished_at or now) - job.started_at) if job.started_at else 0.0
+    rows_per_sec = job.rows_processed / elapsed if elapsed > 0 else 0.0
+
+    eta_seconds = None
+    if job.status == "running" and job.bytes_read and elapsed > 0:
+        bytes_per_sec = job.bytes_read / elapsed
+        eta_seconds = round(max(job.total_bytes - job.bytes_read, 0) / bytes_per_sec, 1)
+    elif job.status in ("done", "failed"):
+        eta_seconds = 0.0
+
+    errors = job.errors
+    result = job.result
+    if isinstance(job, ImportJobRecord):
+        errors = json.loads(errors) if errors else []
+        result = json.loads(result) if result else None
+
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "filename": job.filename,
+        "status": job.status,
+        "rows_processed": job.rows_processed,
+        "rows_per_sec": round(rows_per_sec, 1),
+        "bytes_read": job.bytes_read,
+        "total_bytes": job.total_bytes,
+        "eta_seconds": eta_seconds,
+        "errors": list(errors),
+        "result": result,
+        "created_at": _iso(job.created_at),
+        "started_at": _iso(job.started_at),
+        "finished_at": _iso(job.finished_at),
+    }
+
+
+class ImportJob:
+    """
+    Progress and outcome of one background CSV import, run by this process.
+    Counters are written by the worker thread under a lock and saved to the
+    import_jobs table, where the status endpoints of every process read them.
+    """
+
+    def __init__(self, kind: str, filename: str, path: str, total_bytes: int):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.filename = filename
+        self.path = path
+        self.total_bytes = total_bytes
+
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+        self.rows_processed = 0
+        self.bytes_read = 0
+        self.errors: List[str] = []
+        self.result: Optional[dict] = None
+
+        self._lock = threading.Lock()
+        self._saved_at = 0.0
+
+    def track(self, rows: Iterable, raw: BinaryIO) -> Iterator:
+        """
+        Pass rows through unchanged while counting them. Byte progress comes
+        from the row source's position() when it has one (parallel parsing),
+        otherwise from the position of the upload file being read.
+        """
+        position = getattr(rows, "position", raw.tell)
+        count = 0
+        for row in rows:
+            yield row
+            count += 1
+            if count % PROGRESS_EVERY_ROWS == 0:
+                self._progress(count, position())
+        # The whole file has been consumed (and the reader may have closed it).
+        self._progress(count, self.total_bytes)
+
+    def _progress(self, rows: int, bytes_read: int):
+        with self._lock:
+            self.rows_processed = rows
+            self.bytes_read = bytes_read
+        if _SAVE_PROGRESS and time.time() - self._saved_at >= PROGRESS_SAVE_SECONDS:
+            try:
+                self.save()
+            except Exception:
+                # Progress is informational; never fail the import over it
+                logger.warning("Could not save progress of import job %s", self.id, exc_info=True)
+
+    def _set(self, **fields):
+        with self._lock:
+            for name, value in fields.items():
+                setattr(self, name, value)
+        try:
+            self.save()
+        except Exception:
+            logger.exception("Could not save import job %s", self.id)
+
+    def save(self, insert: bool = False):
+        with self._lock:
+            fields = {
+                "kind": self.kind,
+                "filename": self.filename,
+                "status": self.status,
+                "total_bytes": self.total_bytes,
+                "bytes_read": self.bytes_read,
+                "rows_processed": self.rows_processed,
+                "errors": json.dumps(self.errors),
+                "result": json.dumps(self.result, default=str) if self.result is not None else None,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "heartbeat_at": time.time(),
+            }
+        db = SessionLocal()
+        try:
+            if insert:
+                db.add(ImportJobRecord(id=self.id, **fields))
+            else:
+                db.query(ImportJobRecord).filter(ImportJobRecord.id == self.id).update(
+                    fields, synchronize_session=False
+                )
+            db.commit()
+        finally:
+            db.close()
+        self._saved_at = fields["heartbeat_at"]
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return _job_dict(self)
+
+
+def _heartbeat():
+    while True:
+        time.sleep(JOB_HEARTBEAT_SECONDS)
+        with _jobs_lock:
+            job_ids = list(_local)
+        if not job_ids or not _SAVE_PROGRESS:
+            continue
+        db = SessionLocal()
+        try:
+            db.query(ImportJobRecord).filter(
+                ImportJobRecord.id.in_(job_ids), ImportJobRecord.status.in_(UNFINISHED)
+            ).update({ImportJobRecord.heartbeat_at: time.time()}, synchronize_session=False)
+            db.commit()
+        except Exception:
+            logger.warning("Could not refresh import job heartbeats", exc_info=True)
+        finally:
+            db.close()
+
+
+def _register(job: ImportJob):
+    global _heartbeat_started
+    job.save(insert=True)
+    with _jobs_lock:
+        _local[job.id] = job
+        if not _heartbeat_started:
+            _heartbeat_started = True
+            threading.Thread(target=_heartbeat, name="import-job-heartbeat", daemon=True).start()
+
+    # Forget the oldest finished jobs
+    db = SessionLocal()
+    try:
+        old_ids = [
+            row[0]
+            for row in db.query(ImportJobRecord.id)
+            .filter(ImportJobRecord.status.notin_(UNFINISHED))
+            .order_by(ImportJobRecord.created_at.desc())
+            .offset(MAX_TRACKED_JOBS)
+        ]
+        if old_ids:
+            db.query(ImportJobRecord).filter(ImportJobRecord.id.in_(old_ids)).delete(synchronize_session=False)
+            db.commit()
+    finally:
+        db.close()
+
+
+def _fail_stale(db: Session):
+    """Fail unfinished jobs whose process stopped touching them (see JOB_STALE_SECONDS)."""
+    with _jobs_lock:
+        local_ids = set(_local)
+    cutoff = time.time() - JOB_STALE_SECONDS
+    stale = [
+        job_id
+        for job_id, in db.query(ImportJobRecord.id).filter(
+            ImportJobRecord.status.in_(UNFINISHED), ImportJobRecord.heartbeat_at < cutoff
+        )
+        if job_id not in local_ids
+    ]
+    if not stale:
+        return
+    db.query(ImportJobRecord).filter(
+        ImportJobRecord.id.in_(stale), ImportJobRecord.status.in_(UNFINISHED)
+    ).update(
+        {
+            ImportJobRecord.status: "failed",
+            ImportJobRecord.errors: json.dumps(["Interrupted: the server running this import stopped"]),
+            ImportJobRecord.finished_at: ImportJobRecord.heartbeat_at,
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+
+
+def get_job(db: Session, job_id: str) -> Optional[dict]:
+    with _jobs_lock:
+        job = _local.get(job_id)
+    if job is not None:
+        return job.to_dict()
+    _fail_stale(db)
+    record = db.query(ImportJobRecord).filter(ImportJobRecord.id == job_id).first()
+    return _job_dict(record) if record else None
+
+
+def list_jobs(db: Session) -> List[dict]:
+    """Newest first; jobs run by this process report their live progress."""
+    _fail_stale(db)
+    with _jobs_lock:
+        local = dict(_local)
+    records = db.query(ImportJobRecord).order_by(ImportJobRecord.created_at.desc()).limit(MAX_TRACKED_JOBS)
+    return [local[r.id].to_dict() if r.id in local else _job_dict(r) for r in records]
+
+
+def _run(
+    job: ImportJob,
+    parse: Callable[[BinaryIO, str], Iterable],
+    apply: Callable[[Session, Iterable], dict],
+    after_commit: Optional[Callable[[Session], None]],
+):
+    job._set(status="running", started_at=time.time())
+    db = SessionLocal()
+    try:
+        with open(job.path, "rb") as raw:
+            result = apply(db, job.track(parse(raw, job.path), raw))
+        db.commit()
+        if after_commit is not None:
+            after_commit(db)
+        outcome = {"status": "done", "result": result}
+    except Exception as exc:
+        db.rollback()
+        logger.exception("Import job %s (%s) failed", job.id, job.kind)
+        outcome = {"status": "failed", "errors": job.errors + [str(exc)]}
+    finally:
+        db.close()
+    job._set(finished_at=time.time(), **outcome)
+    with _jobs_lock:
+        _local.pop(job.id, None)
+    try:
+        os.remove(job.path)
+    except OSError:
+        pass
+
+
+def start_import_job(
+    kind: str,
+    filename: str,
+    fileobj: BinaryIO,
+    parse: Callable[[BinaryIO, str], Iterable],
+    apply: Callable[[Session, Iterable], dict],
+    after_commit: Optional[Callable[[Session], None]] = None,
+) -> ImportJob:
+    """
+    Copy the upload (as-is, possibly gzip-compressed) to a private temp file
+    and queue it for a worker thread. `parse` turns the open file (and its
+    path) into rows; `apply` writes them with its own session and the job commits when it
+    returns, then calls `after_commit` (if given) with the same session.
+
+    The temp file deliberately lives outside UPLOADS_DIR, which is served
+    publicly under /uploads.
+    """
+    fd, path = tempfile.mkstemp(prefix=f"import_{kind}_")
+    with os.fdopen(fd, "wb") as out:
+        shutil.copyfileobj(fileobj, out)
+
+    job = ImportJob(kind, filename, path, os.path.getsize(path))
+    try:
+        _register(job)
+    except Exception:
+        os.remove(path)
+        raise
+    _executor.submit(_run, job, parse, apply, after_commit)
+    return job
@@ -0,0 +1,182 @@
+# backend/app/live_updates.py
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from .models import UserVoterTag, Voter
+
+logger = logging.getLogger(__name__)
+
+# Events a slow subscriber may have waiting before its queue is dropped and
+# it is told to reload instead.
+LIVE_QUEUE_SIZE = int(os.getenv("LIVE_QUEUE_SIZE", "1000"))
+
+# /tags/dashboard rows and pushed voter events share these columns, so a
+# client can merge one into the other.
+DASHBOARD_COLUMNS = (
+    Voter.id,
+    Voter.voter_id,
+    Voter.first_name,
+    Voter.last_name,
+    Voter.address,
+    Voter.city,
+    Voter.state,
+    Voter.zip_code,
+    Voter.county,
+    Voter.precinct,
+    Voter.registered_party,
+    Voter.phone,
+    Voter.email,
+    Voter.has_voted,
+    Voter.note,
+)
+
+# What a change to a tagged voter means for a dashboard
+_WATCHED_COLUMNS = (Voter.has_voted, Voter.phone, Voter.email, Voter.note)
+
+
+def format_event(event: str, data) -> str:
+    """One Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str, separators=(',', ':'))}\n\n"
+
+
+class Subscription:
+    """One open event stream: a queue owned by the event loop serving it."""
+
+    def __init__(self, user_id: int, allowed_counties: Optional[FrozenSet[str]], loop: asyncio.AbstractEventLoop):
+        self.user_id = user_id
+        self.allowed_counties = allowed_counties  # None: admin, every county
+        self.loop = loop
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=LIVE_QUEUE_SIZE)
+
+    def sees(self, county: Optional[str]) -> bool:
+        return self.allowed_counties is None or county in self.allowed_counties
+
+    def _offer(self, message: str):
+        # Runs on the subscription's event loop
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(format_event("resync", {}))
+
+
+class LiveUpdateHub:
+    """
+    In-process fan-out of voter changes to the dashboards of the users who
+    tagged them. Writers (request threads, import jobs) publish from any
+    thread; each subscriber's stream is fed through its own event loop.
+
+    Like search_index, the hub only sees changes made through this process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+
+    def subscribe(self, user) -> Subscription:
+        subscription = Subscription(
+            user.id,
+            None if user.is_admin else user.allowed_counties,
+            asyncio.get_running_loop(),
+        )
+        with self._lock:
+            self._subscribers.setdefault(user.id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscribers[subscription.user_id]
+
+    def subscriber_ids(self) -> List[int]:
+        with self._lock:
+            return list(self._subscribers)
+
+    def _deliver(self, user_id: int, rows: List[dict]):
+        with self._lock:
+            subscriptions = list(self._subscribers.get(user_id, ()))
+        for subscription in subscriptions:
+            for row in rows:
+                if subscription.sees(row["county"]):
+                    try:
+                        subscription.loop.call_soon_threadsafe(subscription._offer, format_event("voter", row))
+                    except RuntimeError:
+                        pass  # the stream's loop has shut down; it unsubscribes itself
+
+    # -------------------------------------------------
+    # Publishing changes
+    # -------------------------------------------------
+    def _tag_pairs(self, db: Session, user_ids: List[int], voter_ids: Optional[Iterable[int]] = None):
+        query = db.query(UserVoterTag.user_id, UserVoterTag.voter_id).filter(UserVoterTag.user_id.in_(user_ids))
+        if voter_ids is not None:
+            query = query.filter(UserVoterTag.voter_id.in_(list(voter_ids)))
+        return query.all()
+
+    def tagged_state(self, db: Session) -> Dict[int, Tuple]:
+        """
+        The watched columns of every voter tagged by a subscriber, taken
+        before a bulk change so push_changed() can tell what moved. Empty
+        (and free) when nobody is subscribed.
+        """
+        user_ids = self.subscriber_ids()
+        if not user_ids:
+            return {}
+        try:
+            rows = (
+                db.query(Voter.id, *_WATCHED_COLUMNS)
+                .join(UserVoterTag, UserVoterTag.voter_id == Voter.id)
+                .filter(UserVoterTag.user_id.in_(user_ids))
+                .distinct()
+                .all()
+            )
+        except Exception:
+            logger.exception("Could not read tagged voters for live updates")
+            return {}
+        return {row[0]: tuple(row[1:]) for row in rows}
+
+    def push_changed(self, db: Session, before: Dict[int, Tuple]):
+        """Push the voters from a tagged_state() snapshot whose watched columns have since changed."""
+        if not before:
+            return
+        after = self.tagged_state(db)
+        self.push_voters(db, [voter_id for voter_id, state in after.items() if before.get(voter_id, state) != state])
+
+    def push_voters(self, db: Session, voter_ids: Iterable[int]):
+        """Send the current dashboard row of each voter to every subscriber who tagged it."""
+        voter_ids = list(voter_ids)
+        user_ids = self.subscriber_ids()
+        if not voter_ids or not user_ids:
+            return
+        try:
+            pairs = self._tag_pairs(db, user_ids, voter_ids)
+            if not pairs:
+                return
+            rows = {
+                row.id: dict(row._mapping)
+                for row in db.query(*DASHBOARD_COLUMNS).filter(Voter.id.in_({v for _, v in pairs}))
+            }
+        except Exception:
+            # Never fail the write that triggered the push
+            logger.exception("Could not publish live voter updates")
+            return
+
+        by_user: Dict[int, List[dict]] = {}
+        for user_id, voter_id in pairs:
+            if voter_id in rows:
+                by_user.setdefault(user_id, []).append(rows[voter_id])
+        for user_id, user_rows in by_user.items():
+            self._deliver(user_id, user_rows)
+
+
+live_updates = LiveUpdateHub()
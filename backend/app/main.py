@@ -6,7 +6,17 @@ from fastapi.staticfiles import StaticFiles
 
 from .database import Base, engine
 from . import models
-from .routers import auth_routes, voter_routes, admin_routes, tag_routes, branding_routes
+from .schema_sync import add_missing_columns
+from .county_counts import ensure_county_counts
+from .county_snapshots import county_snapshots
+from .data_version import ensure_change_seqs, ensure_data_versions
+from .search_backend import configure_search_backend
+from .search_index import start_search_index
+from .suggest_index import suggest_index
+from .sync_history import start_sync_history_pruning
+from .voter_import import start_phonetic_backfill
+from .trigram import ensure_trigram_indexes
+from .routers import auth_routes, voter_routes, admin_routes, tag_routes, branding_routes, sync_routes
 from .paths import UPLOADS_DIR  # shared uploads directory
 
 app = FastAPI(title="BOOTS ON THE GROUND")
@@ -17,6 +27,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Serve static files (if you use /static for anything)
@@ -27,9 +38,21 @@ app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 app.mount("/uploads", StaticFiles(directory=UPLOADS_DIR), name="uploads")
 
 Base.metadata.create_all(bind=engine)
+add_missing_columns(engine)
+ensure_trigram_indexes(engine)
+configure_search_backend(engine)
+ensure_county_counts()
+ensure_data_versions()
+ensure_change_seqs()
+start_search_index()
+suggest_index.start_rebuild()
+start_phonetic_backfill()
+county_snapshots.start_rebuild()
+start_sync_history_pruning()
 
 app.include_router(auth_routes.router)
 app.include_router(voter_routes.router)
 app.include_router(admin_routes.router)
 app.include_router(tag_routes.router)
 app.include_router(branding_routes.router)
+app.include_router(sync_routes.router)
@@ -1,6 +1,6 @@
 # backend/app/models.py
 
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import BigInteger, Column, Float, Integer, String, Boolean, ForeignKey, UniqueConstraint, Index, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import TSVECTOR
 
@@ -46,24 +46,141 @@ class Voter(Base):
     has_voted = Column(Boolean, default=False)
     note = Column(String, nullable=True)
 
+    # md5 of the CSV fields this row was last imported from (see voter_import.row_fingerprint).
+    # Lets re-imports skip rows that did not change; cleared when contact info is edited.
+    row_fingerprint = Column(String(32), nullable=True)
+
+    # Metaphone keys of the names (see phonetic.metaphone), for fuzzy search.
+    # Set by the voter imports; rows that predate them are backfilled at startup.
+    first_name_key = Column(String(12), index=True, nullable=True)
+    last_name_key = Column(String(12), index=True, nullable=True)
+
+    # VOTER_CHANGES number of the last write to this row (see data_version.next_change_seq),
+    # for /sync/changes. Rows from before the column existed are set to 0 at startup.
+    change_seq = Column(Integer, nullable=True)
+
     # Optional: only used if you created it in Postgres as a generated column
     # If the DB column exists, defining it here allows SQLAlchemy to query it.
-    search_tsv = Column(TSVECTOR, nullable=True)
+    # SQLite has no tsvector type (and searches through FTS5 instead, see search_backend).
+    search_tsv = Column(TSVECTOR().with_variant(Text(), "sqlite"), nullable=True)
 
     tags = relationship("UserVoterTag", back_populates="voter", cascade="all, delete-orphan")
 
+    # Match the (last_name, first_name, id) keyset order used by search_voters,
+    # with and without the county filter applied to non-admin users.
+    __table_args__ = (
+        Index("ix_voters_name_order", "last_name", "first_name", "id"),
+        Index("ix_voters_county_name_order", "county", "last_name", "first_name", "id"),
+        Index("ix_voters_change_order", "change_seq", "id"),
+    )
+
+
+class CountyVoterCount(Base):
+    """Voters per county, so browse totals do not need a count(*) over voters (see county_counts)."""
+
+    __tablename__ = "county_voter_counts"
+
+    # "" stands for voters without a county
+    county = Column(String, primary_key=True)
+    voters = Column(Integer, nullable=False, default=0)
+
+
+class DataVersion(Base):
+    """Counters bumped whenever a kind of data changes, for caches to compare against (see data_version)."""
+
+    __tablename__ = "data_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class ImportJobRecord(Base):
+    """A background CSV import (see import_jobs), readable from every worker process."""
+
+    __tablename__ = "import_jobs"
+
+    id = Column(String(32), primary_key=True)
+    kind = Column(String, nullable=False)
+    filename = Column(String, nullable=True)
+    status = Column(String, nullable=False)
+
+    total_bytes = Column(BigInteger, nullable=False, default=0)
+    bytes_read = Column(BigInteger, nullable=False, default=0)
+    rows_processed = Column(BigInteger, nullable=False, default=0)
+    errors = Column(Text, nullable=True)  # JSON list
+    result = Column(Text, nullable=True)  # JSON object
+
+    # Unix timestamps; heartbeat_at is refreshed by the process running the job
+    created_at = Column(Float, nullable=False)
+    started_at = Column(Float, nullable=True)
+    finished_at = Column(Float, nullable=True)
+    heartbeat_at = Column(Float, nullable=True)
+
+    __table_args__ = (Index("ix_import_jobs_created", "created_at"),)
+
+
+class StreamTicket(Base):
+    """A single-use ticket that opens one live event stream (see deps.get_stream_user)."""
+
+    __tablename__ = "stream_tickets"
+
+    # sha256 of the ticket, so the table never holds a usable one
+    id = Column(String(64), primary_key=True)
+    email = Column(String, nullable=False)
+    expires_at = Column(Float, nullable=False)  # Unix timestamp
+
 
 class UserVoterTag(Base):
     __tablename__ = "user_voter_tags"
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    voter_id = Column(Integer, ForeignKey("voters.id"), nullable=False)
+    # user_id lookups use uq_user_voter_tag (user_id leads); voter_id needs its own
+    voter_id = Column(Integer, ForeignKey("voters.id"), nullable=False, index=True)
+    # TAG_CHANGES number of the tagging, for /sync/changes (0 for older tags)
+    change_seq = Column(Integer, nullable=True)
 
     user = relationship("User", back_populates="tags")
     voter = relationship("Voter", back_populates="tags")
 
-    __table_args__ = (UniqueConstraint("user_id", "voter_id", name="uq_user_voter_tag"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "voter_id", name="uq_user_voter_tag"),
+        Index("ix_user_voter_tags_user_changes", "user_id", "change_seq"),
+    )
+
+
+class TagDeletion(Base):
+    """An untagging, kept so /sync/changes can tell clients to drop the tag."""
+
+    __tablename__ = "tag_deletions"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    voter_id = Column(Integer, nullable=False)
+    change_seq = Column(Integer, nullable=False)
+    created_at = Column(Float)  # pruned after a while, see sync_history
+
+    __table_args__ = (
+        Index("ix_tag_deletions_user_changes", "user_id", "change_seq"),
+        Index("ix_tag_deletions_created", "created_at"),
+    )
+
+
+class VoterMove(Base):
+    """A voter an import moved out of a county, kept so /sync/changes can tell that county's clients to drop it."""
+
+    __tablename__ = "voter_moves"
+
+    id = Column(Integer, primary_key=True)
+    voter_id = Column(Integer, nullable=False)
+    county = Column(String, nullable=False)  # the county left ("" for none)
+    change_seq = Column(Integer, nullable=False)
+    created_at = Column(Float)  # pruned after a while, see sync_history
+
+    __table_args__ = (
+        Index("ix_voter_moves_changes", "change_seq", "voter_id"),
+        Index("ix_voter_moves_created", "created_at"),
+    )
 
 
 class UserCountyAccess(Base):
@@ -0,0 +1,191 @@
+# backend/app/parallel_parse.py
+
+import csv
+import io
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .voter_import import VoterRow, iter_voter_rows, open_csv_stream, parse_records
+
+# Worker processes used to parse large uploads; 1 disables parallel parsing.
+IMPORT_PARSE_WORKERS = int(os.getenv("IMPORT_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Files smaller than this are parsed inline; process start-up would dominate.
+PARALLEL_PARSE_MIN_BYTES = int(os.getenv("PARALLEL_PARSE_MIN_BYTES", str(32 * 1024 * 1024)))
+
+# Size of the byte ranges handed to each worker.
+PARSE_RANGE_BYTES = 4 * 1024 * 1024
+
+
+def ends_inside_quotes(text: str) -> bool:
+    """
+    Whether csv.reader (default dialect), starting `text` at the start of a
+    record, is still inside a quoted field at its end. As in csv, a quote
+    only opens a field at the start of one (after a comma, a line break or
+    at the start); elsewhere it is literal, like the one in 5'10".
+    """
+    i = 0
+    while True:
+        # Outside quotes: find the next quote that opens a field
+        j = text.find('"', i)
+        while j > 0 and text[j - 1] not in ",\r\n":
+            j = text.find('"', j + 1)
+        if j == -1:
+            return False
+        # Inside quotes: "" is an escaped quote, any other quote closes the field
+        k = text.find('"', j + 1)
+        while k != -1 and text.startswith('"', k + 1):
+            k = text.find('"', k + 2)
+        if k == -1:
+            return True
+        i = k + 1
+
+
+def _parse_range(path: str, start: int, end: int, header: List[str]) -> Tuple[List[VoterRow], bool]:
+    """
+    Worker: parse bytes [start, end) of the file, which must begin at the
+    start of a record. Also returns whether the range ends inside a quoted
+    (multi-line) field, in which case the next range does not begin at a
+    record and these rows are not what the sequential parser would read.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    # Ranges end on b"\n", so no UTF-8 sequence is ever split between workers.
+    text = data.decode("utf-8", errors="ignore")
+    rows = list(parse_records(csv.reader(io.StringIO(text, newline="")), header))
+    return rows, b'"' in data and ends_inside_quotes(text)
+
+
+def _line_ranges(path: str, start: int, size: int) -> List[Tuple[int, int]]:
+    ranges = []
+    with open(path, "rb") as f:
+        pos = start
+        while pos < size:
+            f.seek(min(pos + PARSE_RANGE_BYTES, size))
+            f.readline()
+            end = f.tell()
+            ranges.append((pos, end))
+            pos = end
+    return ranges
+
+
+class ParallelVoterRows:
+    """
+    Iterate the VoterRows of an uncompressed CSV on disk, parsed by a process
+    pool in byte ranges that end on line boundaries.
+
+    Ranges are submitted in file order through a bounded queue, so parsing runs
+    ahead of the consumer (the DB writer) by at most `depth` ranges and rows
+    come out in exactly the order the single-threaded parser would produce.
+    Each range after the first begins where the one before it ended, so it
+    begins at a record as long as every range before it ended outside a
+    quoted field. From the first range that ends inside one (see
+    ends_inside_quotes), everything is re-parsed sequentially instead.
+    """
+
+    def __init__(self, path: str, workers: int = IMPORT_PARSE_WORKERS, depth: Optional[int] = None):
+        self.path = path
+        self.workers = workers
+        self.depth = depth or workers * 2
+        self._position = 0
+
+    def position(self) -> int:
+        """Byte offset of the file consumed so far (for progress reporting)."""
+        return self._position
+
+    def __iter__(self) -> Iterator[VoterRow]:
+        with open(self.path, "rb") as f:
+            first_line = f.readline()
+        header_end = len(first_line)
+        size = os.path.getsize(self.path)
+
+        first_text = first_line.decode("utf-8", errors="ignore")
+        header = next(csv.reader(io.StringIO(first_text, newline="")), None)
+        if header is None or ends_inside_quotes(first_text):
+            yield from self._sequential_from(0)
+            return
+
+        self._position = header_end
+        ranges = _line_ranges(self.path, header_end, size)
+        pending: "queue.Queue[Optional[Tuple[int, int, Future]]]" = queue.Queue(maxsize=self.depth)
+        stop = threading.Event()
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+        def feed():
+            try:
+                for start, end in ranges:
+                    future = pool.submit(_parse_range, self.path, start, end, header)
+                    while not stop.is_set():
+                        try:
+                            pending.put((start, end, future), timeout=0.5)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop.is_set():
+                        future.cancel()
+                        return
+            finally:
+                pending.put(None)
+
+        feeder = threading.Thread(target=feed, name="csv-parse-feeder", daemon=True)
+        feeder.start()
+
+        try:
+            while True:
+                item = pending.get()
+                if item is None:
+                    break
+                start, end, future = item
+                rows, cut_inside_quotes = future.result()
+                if cut_inside_quotes:
+                    # This range was cut inside a quoted field: its tail (and
+                    # everything after it) has to be read as one stream.
+                    stop.set()
+                    yield from self._sequential_from(start, header)
+                    return
+                yield from rows
+                self._position = end
+        finally:
+            stop.set()
+            while feeder.is_alive():
+                try:
+                    item = pending.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is not None:
+                    item[2].cancel()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _sequential_from(self, start: int, header: Optional[Sequence[str]] = None) -> Iterator[VoterRow]:
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            text_stream = io.TextIOWrapper(f, encoding="utf-8", errors="ignore", newline="")
+            if header is None:
+                rows = iter_voter_rows(text_stream)
+            else:
+                rows = parse_records(csv.reader(text_stream), header)
+            for row in rows:
+                yield row
+                self._position = f.tell()
+
+
+def read_voter_rows(raw: BinaryIO, path: Optional[str] = None) -> Iterable[VoterRow]:
+    """
+    VoterRows of an uploaded CSV. Large uncompressed files on disk are parsed
+    in parallel (ParallelVoterRows); anything else streams through the
+    single-threaded parser. Both produce identical rows.
+    """
+    if path is not None and IMPORT_PARSE_WORKERS > 1 and os.path.getsize(path) >= PARALLEL_PARSE_MIN_BYTES:
+        magic = raw.read(2)
+        raw.seek(0)
+        if magic != b"\x1f\x8b":
+            return ParallelVoterRows(path)
+    return iter_voter_rows(open_csv_stream(raw))
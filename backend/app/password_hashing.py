@@ -0,0 +1,143 @@
+# backend/app/password_hashing.py
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Optional, Tuple
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+# Use pbkdf2_sha256 instead of bcrypt to avoid backend issues / 72-byte limit
+pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+
+# Worker processes for hashing; 0 hashes inline in the calling thread.
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 1)))
+
+# Hashes allowed to wait for a worker before new ones are turned away with a
+# 503, so a login storm cannot queue unbounded work.
+HASH_MAX_PENDING = int(os.getenv("HASH_MAX_PENDING", str(max(HASH_WORKERS, 1) * 64)))
+
+# Per-hash timings kept for the metrics.
+TIMING_WINDOW = 1000
+
+
+def _verify(plain_password: str, hashed_password: str) -> Tuple[bool, float]:
+    start = time.perf_counter()
+    ok = pwd_context.verify(plain_password, hashed_password)
+    return ok, time.perf_counter() - start
+
+
+def _hash(password: str) -> Tuple[str, float]:
+    start = time.perf_counter()
+    hashed = pwd_context.hash(password)
+    return hashed, time.perf_counter() - start
+
+
+def _percentile(ordered, fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class HashingPool:
+    """
+    Runs pbkdf2 hashing and verification in a process pool so it uses every
+    core and never holds the event loop or a request thread's GIL.
+
+    Tracks the queue depth (hashes submitted and not finished) and, per
+    hash, the compute time in the worker and the total time including the
+    wait for a worker.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._compute = deque(maxlen=TIMING_WINDOW)
+        self._total = deque(maxlen=TIMING_WINDOW)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(status_code=503, detail="Too many sign-ins in progress, please retry")
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+            executor = self._executor()
+        submitted = time.perf_counter()
+        future = executor.submit(fn, *args)
+        future.add_done_callback(lambda f: self._finished(f, submitted))
+        return future
+
+    def _finished(self, future: Future, submitted: float):
+        total = time.perf_counter() - submitted
+        with self._lock:
+            self.pending -= 1
+            # exception() raises CancelledError on a cancelled future (shutdown)
+            if not future.cancelled() and future.exception() is None:
+                self.completed += 1
+                self._compute.append(future.result()[1])
+                self._total.append(total)
+
+    def _run(self, fn: Callable, *args):
+        if self.workers <= 0:
+            result = fn(*args)
+            with self._lock:
+                self.completed += 1
+                self._compute.append(result[1])
+                self._total.append(result[1])
+            return result[0]
+        return self._submit(fn, *args).result()[0]
+
+    async def _run_async(self, fn: Callable, *args):
+        if self.workers <= 0:
+            return self._run(fn, *args)
+        return (await asyncio.wrap_future(self._submit(fn, *args)))[0]
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self._run(_verify, plain_password, hashed_password)
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password)
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run_async(_verify, plain_password, hashed_password)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            compute = sorted(self._compute)
+            total = sorted(self._total)
+            out = {
+                "workers": self.workers,
+                "queue_depth": self.pending,
+                "peak_queue_depth": self.peak_pending,
+                "max_pending": self.max_pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+        for name, samples in (("hash_ms", compute), ("hash_with_wait_ms", total)):
+            if samples:
+                out[name] = {
+                    "p50": round(_percentile(samples, 0.5) * 1000, 2),
+                    "p95": round(_percentile(samples, 0.95) * 1000, 2),
+                    "max": round(samples[-1] * 1000, 2),
+                }
+        return out
+
+
+hashing_pool = HashingPool(HASH_WORKERS, HASH_MAX_PENDING)
@@ -17,18 +17,25 @@ elif _disk_mount:
 else:
     _candidate_uploads = os.path.join(BACKEND_ROOT, "uploads")
 
-# ✅ Fail-safe: if the disk path is wrong/unwritable, fall back to /tmp/uploads
-def _ensure_dir(path: str) -> str:
+# ✅ Fail-safe: if the disk path is wrong/unwritable, fall back to /tmp/<name>
+def _ensure_dir(path: str, fallback_name: str = "uploads") -> str:
     try:
         os.makedirs(path, exist_ok=True)
         return path
     except Exception:
-        fallback = os.path.join("/tmp", "uploads")
+        fallback = os.path.join("/tmp", fallback_name)
         os.makedirs(fallback, exist_ok=True)
         return fallback
 
 UPLOADS_DIR = _ensure_dir(_candidate_uploads)
 
+# County snapshots (see county_snapshots) hold voter data, so they live next
+# to UPLOADS_DIR on the same disk, never inside it: UPLOADS_DIR is public.
+SNAPSHOTS_DIR = _ensure_dir(
+    os.getenv("SNAPSHOTS_DIR") or os.path.join(os.path.dirname(os.path.abspath(UPLOADS_DIR)), "snapshots"),
+    "snapshots",
+)
+
 STATIC_DIR = os.path.join(APP_DIR, "static")
 os.makedirs(STATIC_DIR, exist_ok=True)
 
@@ -0,0 +1,117 @@
+# backend/app/phonetic.py
+
+# Phonetic keys and edit distance for fuzzy name search.
+#
+# metaphone() is Lawrence Philips' original Metaphone: "Jonson" and "Johnson"
+# both become JNSN, "Katherine" and "Catherine" both K0RN.
+
+from typing import Optional
+
+# Stored keys are capped (see Voter.first_name_key / last_name_key).
+MAX_KEY_LENGTH = 12
+
+_VOWELS = frozenset("AEIOU")
+_FRONT_VOWELS = frozenset("EIY")
+_SILENT_INITIAL = ("AE", "GN", "KN", "PN", "WR")
+
+
+def metaphone(name: Optional[str]) -> str:
+    """Metaphone key of a name ('' when it has no letters)."""
+    word = "".join(ch for ch in (name or "").upper() if "A" <= ch <= "Z")
+    if not word:
+        return ""
+
+    if word[:2] in _SILENT_INITIAL:
+        word = word[1:]
+    elif word[0] == "X":
+        word = "S" + word[1:]
+    elif word.startswith("WH"):
+        word = "W" + word[2:]
+
+    def at(i: int) -> str:
+        return word[i] if 0 <= i < len(word) else ""
+
+    key = []
+    for i, ch in enumerate(word):
+        if ch == at(i - 1) and ch != "C":
+            continue
+        nxt = at(i + 1)
+
+        if ch in _VOWELS:
+            if i == 0:
+                key.append(ch)
+        elif ch == "B":
+            if not (at(i - 1) == "M" and i == len(word) - 1):
+                key.append("B")
+        elif ch == "C":
+            if nxt == "I" and at(i + 2) == "A":
+                key.append("X")
+            elif nxt == "H":
+                key.append("K" if at(i - 1) == "S" else "X")
+            elif nxt in _FRONT_VOWELS:
+                if at(i - 1) != "S":
+                    key.append("S")
+            else:
+                key.append("K")
+        elif ch == "D":
+            key.append("J" if nxt == "G" and at(i + 2) in _FRONT_VOWELS else "T")
+        elif ch == "G":
+            if nxt == "H" and i + 2 < len(word) and at(i + 2) not in _VOWELS:
+                continue
+            if nxt == "N" and (i + 2 == len(word) or word[i + 1 :] == "NED"):
+                continue
+            if at(i - 1) == "D" and nxt in _FRONT_VOWELS:
+                continue
+            key.append("J" if nxt in _FRONT_VOWELS and at(i - 1) != "G" else "K")
+        elif ch == "H":
+            if at(i - 1) in "CSPTG" and i > 0:
+                continue
+            if at(i - 1) in _VOWELS and nxt not in _VOWELS:
+                continue
+            key.append("H")
+        elif ch == "K":
+            if at(i - 1) != "C":
+                key.append("K")
+        elif ch == "P":
+            key.append("F" if nxt == "H" else "P")
+        elif ch == "Q":
+            key.append("K")
+        elif ch == "S":
+            if nxt == "H" or (nxt == "I" and at(i + 2) in ("O", "A")):
+                key.append("X")
+            else:
+                key.append("S")
+        elif ch == "T":
+            if nxt == "I" and at(i + 2) in ("O", "A"):
+                key.append("X")
+            elif nxt == "H":
+                key.append("0")
+            elif not (nxt == "C" and at(i + 2) == "H"):
+                key.append("T")
+        elif ch == "V":
+            key.append("F")
+        elif ch in "WY":
+            if nxt in _VOWELS:
+                key.append(ch)
+        elif ch == "X":
+            key.append("KS")
+        elif ch == "Z":
+            key.append("S")
+        else:  # F J L M N R
+            key.append(ch)
+
+    return "".join(key)[:MAX_KEY_LENGTH]
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance, case-insensitive."""
+    a, b = a.lower(), b.lower()
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
@@ -0,0 +1,96 @@
+# backend/app/principal_cache.py
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import FrozenSet, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from .data_version import USERS, get_data_version
+from .models import User, UserCountyAccess
+
+# How long a cached user stays valid, and how many are kept. Every hit is
+# also checked against the USERS data version, which grant changes bump, so
+# no worker process serves a revoked grant; the TTL is a backstop.
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "30"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "1000"))
+
+
+class Principal:
+    """
+    The authenticated user as the routes see it: the User columns they read
+    plus the user's county grants, loaded once. Read-only.
+    """
+
+    __slots__ = ("id", "email", "full_name", "is_admin", "allowed_counties")
+
+    def __init__(
+        self,
+        id: int,
+        email: str,
+        full_name: Optional[str],
+        is_admin: bool,
+        allowed_counties: FrozenSet[str],
+    ):
+        self.id = id
+        self.email = email
+        self.full_name = full_name
+        self.is_admin = bool(is_admin)
+        self.allowed_counties = allowed_counties
+
+
+def load_principal(db: Session, email: str) -> Optional[Principal]:
+    user = db.query(User.id, User.email, User.full_name, User.is_admin).filter(User.email == email).first()
+    if user is None:
+        return None
+    counties = frozenset(
+        r[0]
+        for r in db.query(UserCountyAccess.county).filter(UserCountyAccess.user_id == user.id).all()
+        if r[0] is not None
+    )
+    return Principal(user.id, user.email, user.full_name, user.is_admin, counties)
+
+
+class PrincipalCache:
+    """TTL'd LRU map from token subject (email) to Principal, tagged with the USERS data version it was loaded at."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, int, Principal]]" = OrderedDict()
+
+    def get(self, db: Session, email: str) -> Optional[Principal]:
+        now = time.monotonic()
+        # Read before loading: a grant committed meanwhile only makes the entry stale-on-arrival
+        version = get_data_version(db, USERS)
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is not None and entry[0] > now and entry[1] == version:
+                self._entries.move_to_end(email)
+                return entry[2]
+
+        principal = load_principal(db, email)
+        if principal is None or self.max_entries <= 0:
+            return principal
+        with self._lock:
+            self._entries[email] = (now + self.ttl, version, principal)
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return principal
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            for email, (_, _, principal) in list(self._entries.items()):
+                if principal.id == user_id:
+                    del self._entries[email]
+
+    def invalidate_email(self, email: str):
+        with self._lock:
+            self._entries.pop(email, None)
+
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_TTL, PRINCIPAL_CACHE_SIZE)
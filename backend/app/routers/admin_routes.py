@@ -1,19 +1,39 @@
 # backend/app/routers/admin_routes.py
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 import os
 import uuid
-import csv
-import io
 import shutil
 from typing import Optional, List
 
 from app.database import get_db
-from app.models import User, Voter, UserVoterTag, Branding, UserCountyAccess
+from app.models import User, Voter, UserVoterTag, Branding, UserCountyAccess, TagDeletion, VoterMove
 from app.schemas import BrandingOut, InviteUserRequest, UserOut, CountyAccessUpdate, TagOverviewItem
 from app.deps import get_current_admin
+from app.principal_cache import principal_cache
+from app.password_hashing import hashing_pool
+from app.voter_import import (
+    VOTER_FIELDS,
+    apply_voted_ids,
+    apply_voter_import,
+    is_csv_upload,
+    iter_voted_ids,
+    iter_voter_rows,
+    open_csv_stream,
+)
+from app.conditional import conditional_get
+from app.county_counts import clear_county_counts
+from app.county_snapshots import county_snapshots
+from app.csv_export import csv_response
+from app.data_version import BRANDING, TAG_CHANGES, USERS, VOTER_FILE, VOTERS, VOTERS_EPOCH, bump_data_version
+from app.import_jobs import get_job, list_jobs, start_import_job
+from app.live_updates import live_updates
+from app.parallel_parse import read_voter_rows
+from app.search_cache import search_cache
+from app.search_index import search_index
 from ..paths import UPLOADS_DIR
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
@@ -61,74 +81,69 @@ def create_user(
         is_admin=payload.is_admin,
     )
     db.add(new_user)
+    bump_data_version(db, USERS)
     db.commit()
     db.refresh(new_user)
+    principal_cache.invalidate_email(new_user.email)
     return new_user
 
 
+# -----------------------------------------------------
+# Helpers: follow-up work once an import has committed
+# -----------------------------------------------------
+def _after_voter_import(db: Session):
+    search_index.refresh_changed(db)
+    county_snapshots.start_rebuild()
+
+
+def _after_voted_import(db: Session, before: dict):
+    live_updates.push_changed(db, before)
+    county_snapshots.start_rebuild()
+
+
 # -----------------------------------------------------
 # Admin: Import voters CSV
 # -----------------------------------------------------
 @router.post("/import/voters")
 def import_voters(
     file: UploadFile = File(...),
+    mode: str = Query(
+        "upsert",
+        description=(
+            "upsert: chunked INSERT ... ON CONFLICT (works everywhere). "
+            "copy: COPY into a staging table, then one merge (Postgres only; "
+            "falls back to upsert on SQLite)."
+        ),
+    ),
+    background: bool = Query(
+        False,
+        description="Queue the import and return a job id instead of waiting for it.",
+    ),
     db: Session = Depends(get_db),
     current_admin=Depends(get_current_admin),
 ):
-    if not file.filename.lower().endswith(".csv"):
-        raise HTTPException(status_code=400, detail="Only CSV files are supported")
-
-    content = file.file.read().decode("utf-8", errors="ignore")
-    reader = csv.DictReader(io.StringIO(content))
-
-    imported = 0
-    updated = 0
-
-    for row in reader:
-        voter_id = row.get("voter_id") or row.get("VoterID") or row.get("VOTER_ID")
-        if not voter_id:
-            # Skip any rows without a voter_id
-            continue
-
-        voter = db.query(Voter).filter(Voter.voter_id == voter_id).first()
-        if voter:
-            # Update some fields if they exist in the CSV
-            voter.first_name = row.get("first_name") or voter.first_name
-            voter.last_name = row.get("last_name") or voter.last_name
-            voter.address = row.get("address") or voter.address
-            voter.city = row.get("city") or voter.city
-            voter.state = row.get("state") or voter.state
-            voter.zip_code = row.get("zip_code") or voter.zip_code
-            voter.county = row.get("county") or voter.county
-            voter.precinct = row.get("precinct") or voter.precinct
-            voter.registered_party = row.get("registered_party") or voter.registered_party
-            voter.phone = row.get("phone") or voter.phone
-            voter.email = row.get("email") or voter.email
-            updated += 1
-        else:
-            voter = Voter(
-                voter_id=voter_id,
-                first_name=row.get("first_name") or "",
-                last_name=row.get("last_name") or "",
-                address=row.get("address"),
-                city=row.get("city"),
-                state=row.get("state"),
-                zip_code=row.get("zip_code"),
-                county=row.get("county"),
-                precinct=row.get("precinct"),
-                registered_party=row.get("registered_party"),
-                phone=row.get("phone"),
-                email=row.get("email"),
-            )
-            db.add(voter)
-            imported += 1
+    if not is_csv_upload(file.filename):
+        raise HTTPException(status_code=400, detail="Only CSV files (.csv or .csv.gz) are supported")
+
+    if mode not in ("upsert", "copy"):
+        raise HTTPException(status_code=400, detail="mode must be 'upsert' or 'copy'")
+
+    if background:
+        job = start_import_job(
+            "voters",
+            file.filename,
+            file.file,
+            read_voter_rows,
+            lambda job_db, rows: apply_voter_import(job_db, rows, mode),
+            _after_voter_import,
+        )
+        return JSONResponse(status_code=202, content=job.to_dict())
 
+    result = apply_voter_import(db, iter_voter_rows(open_csv_stream(file.file)), mode)
     db.commit()
+    _after_voter_import(db)
 
-    return {
-        "imported": imported,
-        "updated": updated,
-    }
+    return result
 
 
 # -----------------------------------------------------
@@ -137,36 +152,105 @@ def import_voters(
 @router.post("/import/voted")
 def import_voted(
     file: UploadFile = File(...),
+    background: bool = Query(
+        False,
+        description="Queue the import and return a job id instead of waiting for it.",
+    ),
     db: Session = Depends(get_db),
     current_admin=Depends(get_current_admin),
 ):
-    if not file.filename.lower().endswith(".csv"):
-        raise HTTPException(status_code=400, detail="Only CSV files are supported")
+    if not is_csv_upload(file.filename):
+        raise HTTPException(status_code=400, detail="Only CSV files (.csv or .csv.gz) are supported")
+
+    # Tagged voters as subscribed dashboards see them now; whatever the
+    # import changes is pushed to them after the commit (see live_updates)
+    if background:
+        before = {}
+
+        def apply(job_db, rows):
+            before.update(live_updates.tagged_state(job_db))
+            return apply_voted_ids(job_db, (row[0] for row in rows))
+
+        job = start_import_job(
+            "voted",
+            file.filename,
+            file.file,
+            read_voter_rows,
+            apply,
+            lambda job_db: _after_voted_import(job_db, before),
+        )
+        return JSONResponse(status_code=202, content=job.to_dict())
 
-    content = file.file.read().decode("utf-8", errors="ignore")
-    reader = csv.DictReader(io.StringIO(content))
+    before = live_updates.tagged_state(db)
+    result = apply_voted_ids(db, iter_voted_ids(open_csv_stream(file.file)))
+    db.commit()
+    _after_voted_import(db, before)
 
-    updated = 0
-    not_found = 0
+    return result
 
-    for row in reader:
-        voter_id = row.get("voter_id") or row.get("VoterID") or row.get("VOTER_ID")
-        if not voter_id:
-            continue
 
-        voter = db.query(Voter).filter(Voter.voter_id == voter_id).first()
-        if voter:
-            voter.has_voted = True
-            updated += 1
-        else:
-            not_found += 1
+# -----------------------------------------------------
+# Admin: Background import jobs
+# -----------------------------------------------------
+@router.get("/import/jobs")
+def list_import_jobs(
+    db: Session = Depends(get_db),
+    current_admin=Depends(get_current_admin),
+):
+    return list_jobs(db)
+
+
+@router.get("/import/jobs/{job_id}")
+def get_import_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_admin=Depends(get_current_admin),
+):
+    job = get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+
+# -----------------------------------------------------
+# Admin: Search result cache
+# -----------------------------------------------------
+@router.get("/search-cache")
+def get_search_cache_stats(current_admin=Depends(get_current_admin)):
+    return search_cache.stats()
 
-    db.commit()
 
-    return {
-        "updated_voted": updated,
-        "not_found": not_found,
-    }
+# -----------------------------------------------------
+# Admin: Password hashing pool metrics
+# -----------------------------------------------------
+@router.get("/hashing")
+def get_hashing_metrics(current_admin=Depends(get_current_admin)):
+    return hashing_pool.metrics()
+
+
+# -----------------------------------------------------
+# Admin: Export voters as CSV (streamed, see csv_export)
+# Columns match the voter import, so an export can be re-imported.
+# -----------------------------------------------------
+VOTER_EXPORT_COLUMNS = ("voter_id",) + VOTER_FIELDS + ("has_voted", "note")
+
+
+@router.get("/export/voters")
+def export_voters(
+    county: Optional[List[str]] = Query(None),
+    precinct: Optional[str] = None,
+    has_voted: Optional[bool] = None,
+    gzip: bool = Query(False, description="Send voters.csv.gz instead of plain CSV"),
+    current_admin=Depends(get_current_admin),
+):
+    statement = select(*[getattr(Voter, name) for name in VOTER_EXPORT_COLUMNS]).order_by(Voter.id)
+    if county:
+        statement = statement.where(Voter.county.in_(county))
+    if precinct:
+        statement = statement.where(Voter.precinct == precinct)
+    if has_voted is not None:
+        statement = statement.where(func.coalesce(Voter.has_voted, False) == has_voted)
+    return csv_response("voters.csv", VOTER_EXPORT_COLUMNS, statement, compress=gzip)
 
 
 # -----------------------------------------------------
@@ -179,9 +263,18 @@ def delete_all_voters(
 ):
     # Delete tags first
     db.query(UserVoterTag).delete()
+    db.query(TagDeletion).delete()
+    db.query(VoterMove).delete()
     # Then voters
     db.query(Voter).delete()
+    clear_county_counts(db)
+    bump_data_version(db)
+    bump_data_version(db, VOTER_FILE)
+    # Synced clients start over (see /sync/changes)
+    bump_data_version(db, VOTERS_EPOCH)
     db.commit()
+    search_index.clear()
+    county_snapshots.start_rebuild()
     return {"status": "ok", "message": "All voters deleted."}
 
 
@@ -222,6 +315,7 @@ def upload_logo(
     else:
         branding.logo_url = logo_url
 
+    bump_data_version(db, BRANDING)
     db.commit()
     db.refresh(branding)
     return branding
@@ -230,7 +324,11 @@ def upload_logo(
 # -----------------------------------------------------
 # Admin: Tags overview
 # -----------------------------------------------------
-@router.get("/tags/overview", response_model=list[dict])
+@router.get(
+    "/tags/overview",
+    response_model=list[dict],
+    dependencies=[conditional_get(VOTERS, TAG_CHANGES, principal=get_current_admin)],
+)
 def tag_overview(
     user_id: Optional[int] = None,
     db: Session = Depends(get_db),
@@ -277,7 +375,11 @@ def tag_overview(
 # -----------------------------------------------------
 # Admin: List distinct counties from voter file
 # -----------------------------------------------------
-@router.get("/counties", response_model=List[str])
+@router.get(
+    "/counties",
+    response_model=List[str],
+    dependencies=[conditional_get(VOTERS, principal=get_current_admin)],
+)
 def list_counties(
     db: Session = Depends(get_db),
     current_admin=Depends(get_current_admin),
@@ -346,14 +448,20 @@ def update_user_county_access(
     for c in allowed:
         db.add(UserCountyAccess(user_id=user_id, county=c))
 
+    bump_data_version(db, USERS)
     db.commit()
+    principal_cache.invalidate_user(user_id)
     return allowed
 
 
 # -----------------------------------------------------
 # Admin: Get Branding
 # -----------------------------------------------------
-@router.get("/branding", response_model=BrandingOut)
+@router.get(
+    "/branding",
+    response_model=BrandingOut,
+    dependencies=[conditional_get(BRANDING, principal=get_current_admin)],
+)
 def get_branding(
     db: Session = Depends(get_db),
     current_admin=Depends(get_current_admin),
@@ -364,7 +472,11 @@ def get_branding(
 
     return branding
 
-@router.get("/tags/overview", response_model=list[TagOverviewItem])
+@router.get(
+    "/tags/overview",
+    response_model=list[TagOverviewItem],
+    dependencies=[conditional_get(VOTERS, TAG_CHANGES, principal=get_current_admin)],
+)
 def admin_tag_overview(
     user_id: Optional[int] = Query(default=None),
     db: Session = Depends(get_db),
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
+from ..conditional import conditional_get
 from ..deps import login, get_current_user
 from ..schemas import LoginRequest, Token, UserCreate, UserOut
 from ..database import get_db
@@ -11,8 +12,8 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/login", response_model=Token)
-def login_user(credentials: LoginRequest, db: Session = Depends(get_db)):
-    return login(credentials, db)
+async def login_user(credentials: LoginRequest, db: Session = Depends(get_db)):
+    return await login(credentials, db)
 
 
 # Optional: one-time endpoint to create the first admin; you can call it then disable it.
@@ -32,6 +33,6 @@ def create_initial_admin(user_in: UserCreate, db: Session = Depends(get_db)):
     db.refresh(user)
     return user
 
-@router.get("/me", response_model=UserOut)
+@router.get("/me", response_model=UserOut, dependencies=[conditional_get(principal=get_current_user)])
 def read_me(current_user=Depends(get_current_user)):
     return current_user
\ No newline at end of file
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
+from ..conditional import conditional_get
+from ..data_version import BRANDING
 from ..database import get_db
 from ..models import Branding
 from ..schemas import BrandingOut
@@ -8,7 +10,7 @@ from ..schemas import BrandingOut
 router = APIRouter(prefix="/branding", tags=["branding"])
 
 
-@router.get("/", response_model=BrandingOut)
+@router.get("/", response_model=BrandingOut, dependencies=[conditional_get(BRANDING)])
 def get_branding(db: Session = Depends(get_db)):
     branding = db.query(Branding).first()
     if not branding:
@@ -0,0 +1,149 @@
+# backend/app/routers/sync_routes.py
+
+from typing import Dict, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Session
+
+from ..cursors import counties_digest, decode_cursor, encode_cursor
+from ..data_version import TAG_CHANGES, VOTER_CHANGES, VOTERS_EPOCH, get_data_version
+from ..database import get_db
+from ..deps import get_current_user
+from ..live_updates import DASHBOARD_COLUMNS
+from ..models import TagDeletion, UserVoterTag, Voter, VoterMove
+from ..sync_history import history_pruned_past
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+def _decode_since(since: str) -> Tuple[int, str, int, Optional[int], int, bool]:
+    """
+    (voters epoch, counties digest, voter change_seq, voter id or None, tag
+    change_seq, whether a full sync is still being paged) of a `next` cursor.
+    """
+    key = decode_cursor(since, "sync", 6)
+    if (
+        not all(isinstance(v, int) for v in (key[0], key[2], key[4]))
+        or not isinstance(key[1], str)
+        or not isinstance(key[3], (int, type(None)))
+        or not isinstance(key[5], bool)
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key[0], key[1], key[2], key[3], key[4], key[5]
+
+
+# --------------------------------------------------------------------
+# Voters and tags changed since a cursor
+# GET /sync/changes?since=
+# --------------------------------------------------------------------
+@router.get("/changes")
+def get_changes(
+    since: Optional[str] = Query(None, description="`next` from the previous response; omit for a full sync"),
+    limit: int = Query(1000, ge=1, le=5000, description="Most voters per response"),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Voters in the caller's counties written after the cursor (imports, voted
+    imports, contact edits), in change order (a page may hold fewer than
+    `limit` of them), and the caller's own tag
+    changes. Keep calling with `next` while has_more is true; later calls
+    with the last `next` return only what changed meanwhile.
+
+    reset=true means the client must drop what it has synced (first sync,
+    every voter was deleted, the caller's counties changed, or the cursor
+    is older than the kept untaggings, see sync_history) before
+    applying the response. The cursor records which counties it was
+    synced for: voters of a newly granted county were written before it,
+    and a revoked county's voters are never sent as deletions. `removed`
+    lists voters an import moved out of the caller's counties since the
+    cursor (see VoterMove); drop them.
+    """
+    # Counters first: every change numbered up to them is committed (see next_change_seq)
+    epoch = get_data_version(db, VOTERS_EPOCH)
+    voter_high = get_data_version(db, VOTER_CHANGES)
+    tag_high = get_data_version(db, TAG_CHANGES)
+
+    counties = counties_digest(user)
+
+    reset = full = True
+    after_seq, after_id, tags_after = -1, None, -1
+    if since:
+        since_epoch, since_counties, seq, voter_pk, tag_seq, full = _decode_since(since)
+        if since_epoch == epoch and since_counties == counties and not history_pruned_past(db, seq, tag_seq):
+            reset = False
+            after_seq, after_id, tags_after = seq, voter_pk, tag_seq
+        else:
+            full = True
+
+    # -------------------------------------------------
+    # Voters, paged by (change_seq, id)
+    # -------------------------------------------------
+    rows = []
+    allowed_counties = None if user.is_admin else sorted(user.allowed_counties)
+    if allowed_counties is None or allowed_counties:
+        query = db.query(*DASHBOARD_COLUMNS, Voter.change_seq).filter(Voter.change_seq <= voter_high)
+        if after_id is None:
+            query = query.filter(Voter.change_seq > after_seq)
+        else:
+            query = query.filter(tuple_(Voter.change_seq, Voter.id) > tuple_(after_seq, after_id))
+        if allowed_counties is not None:
+            query = query.filter(Voter.county.in_(allowed_counties))
+        rows = query.order_by(Voter.change_seq, Voter.id).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if has_more:
+        next_key = [epoch, counties, rows[-1].change_seq, rows[-1].id, tag_high, full]
+    else:
+        next_key = [epoch, counties, voter_high, None, tag_high, False]
+
+    # -------------------------------------------------
+    # Voters moved out of the caller's counties, over the same span of
+    # (change_seq, id) as this page (a full sync has nothing to drop)
+    # -------------------------------------------------
+    removed = []
+    if allowed_counties and not full:
+        key = tuple_(VoterMove.change_seq, VoterMove.voter_id)
+        query = (
+            db.query(VoterMove.voter_id)
+            .join(Voter, Voter.id == VoterMove.voter_id)
+            .filter(
+                VoterMove.county.in_(allowed_counties),
+                # not if a later import moved the voter back
+                func.coalesce(Voter.county, "").notin_(allowed_counties),
+            )
+        )
+        if after_id is None:
+            query = query.filter(VoterMove.change_seq > after_seq)
+        else:
+            query = query.filter(key > tuple_(after_seq, after_id))
+        if has_more:
+            query = query.filter(key <= tuple_(rows[-1].change_seq, rows[-1].id))
+        else:
+            query = query.filter(VoterMove.change_seq <= voter_high)
+        removed = sorted({voter_id for (voter_id,) in query})
+
+    # -------------------------------------------------
+    # The caller's tag changes (all of them: a user's tags are few)
+    # -------------------------------------------------
+    latest: Dict[int, Tuple[int, bool]] = {}
+    for model, tagged in ((UserVoterTag, True), (TagDeletion, False)):
+        changed = db.query(model.voter_id, model.change_seq).filter(
+            model.user_id == user.id,
+            model.change_seq > tags_after,
+            model.change_seq <= tag_high,
+        )
+        for voter_id, seq in changed:
+            if voter_id not in latest or latest[voter_id][0] < seq:
+                latest[voter_id] = (seq, tagged)
+
+    return {
+        "reset": reset,
+        "voters": [dict(row._mapping) for row in rows],
+        "removed": removed,
+        "tags": [{"voter_id": voter_id, "tagged": tagged} for voter_id, (_, tagged) in sorted(latest.items())],
+        "has_more": has_more,
+        "next": encode_cursor("sync", next_key),
+    }
@@ -1,17 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, false, func, select, tuple_
 from sqlalchemy.orm import Session
-from typing import List, Optional
-import csv
-import io
+from typing import Dict, List, Optional, Sequence
+import asyncio
+import time
 
 from pydantic import BaseModel
 
 from ..database import get_db
-from ..deps import get_current_user
-from ..models import Voter, UserVoterTag, UserCountyAccess
+from ..deps import get_current_user, get_stream_user, issue_stream_ticket
+from ..models import TagDeletion, Voter, UserVoterTag
+from ..conditional import conditional_get
+from ..csv_export import csv_response
+from ..cursors import decode_cursor, encode_cursor
+from ..data_version import TAG_CHANGES, VOTER_CHANGES, VOTERS, bump_data_version, next_change_seq
+from ..live_updates import DASHBOARD_COLUMNS, format_event, live_updates
+from ..search_index import search_index
+from ..trigram import substring_filter
+from ..voter_import import dialect_insert
 
 router = APIRouter(prefix="/tags", tags=["tags"])
 
+# Most voters one /tags/bulk call may tag or untag.
+BULK_TAG_MAX_VOTERS = 5000
+
+# An idle live stream sends a comment this often, so proxies keep it open
+# and a closed client is noticed.
+LIVE_KEEPALIVE_SECONDS = 15
+
 
 # --------------------------------------------------------------------
 # Request model for contact + note updates
@@ -22,6 +39,149 @@ class VoterContactUpdate(BaseModel):
     note: Optional[str] = None
 
 
+class BulkTagFilter(BaseModel):
+    """Voters to tag by attribute; every given field must match."""
+
+    county: Optional[str] = None
+    precinct: Optional[str] = None
+    city: Optional[str] = None
+    zip_code: Optional[str] = None
+    street: Optional[str] = None  # substring of the address, e.g. "main st"
+
+
+class BulkTagRequest(BaseModel):
+    voter_ids: Optional[List[int]] = None
+    filter: Optional[BulkTagFilter] = None
+    untag: bool = False
+
+
+# --------------------------------------------------------------------
+# Shared write path for single and bulk tagging
+# --------------------------------------------------------------------
+def _tag_voters(db: Session, user, voter_ids: Sequence[int]) -> Dict[int, str]:
+    """
+    Tag voters for the user. Returns an outcome per id: tagged,
+    already_tagged, not_found or forbidden (outside the user's counties).
+
+    One query reads the voters' counties (the user's grants are already on
+    the principal) and one INSERT ... ON CONFLICT DO NOTHING writes every
+    tag; the ids it returns are the tags that did not exist yet.
+    """
+    outcomes: Dict[int, str] = {voter_id: "not_found" for voter_id in voter_ids}
+    if not outcomes:
+        return outcomes
+
+    allowed = []
+    for voter_id, county in db.query(Voter.id, Voter.county).filter(Voter.id.in_(list(outcomes))):
+        if user.is_admin or county in user.allowed_counties:
+            allowed.append(voter_id)
+        else:
+            outcomes[voter_id] = "forbidden"
+
+    if allowed:
+        insert = dialect_insert(db)
+        change_seq = next_change_seq(db, TAG_CHANGES)
+        stmt = (
+            insert(UserVoterTag)
+            .values([{"user_id": user.id, "voter_id": voter_id, "change_seq": change_seq} for voter_id in allowed])
+            .on_conflict_do_nothing(index_elements=["user_id", "voter_id"])
+            .returning(UserVoterTag.voter_id)
+        )
+        inserted = {row[0] for row in db.execute(stmt)}
+        db.commit()
+        for voter_id in allowed:
+            outcomes[voter_id] = "tagged" if voter_id in inserted else "already_tagged"
+    return outcomes
+
+
+def _untag_voters(db: Session, user, voter_ids: Sequence[int]) -> Dict[int, str]:
+    """
+    Remove the user's tags on the voters, in one DELETE: untagged or
+    not_tagged per id. Each removal leaves a TagDeletion for /sync/changes.
+    """
+    outcomes: Dict[int, str] = {voter_id: "not_tagged" for voter_id in voter_ids}
+    if not outcomes:
+        return outcomes
+
+    stmt = (
+        delete(UserVoterTag)
+        .where(UserVoterTag.user_id == user.id, UserVoterTag.voter_id.in_(list(outcomes)))
+        .returning(UserVoterTag.voter_id)
+    )
+    removed = [voter_id for (voter_id,) in db.execute(stmt)]
+    if removed:
+        change_seq = next_change_seq(db, TAG_CHANGES)
+        now = time.time()
+        db.add_all(
+            [
+                TagDeletion(user_id=user.id, voter_id=voter_id, change_seq=change_seq, created_at=now)
+                for voter_id in removed
+            ]
+        )
+        for voter_id in removed:
+            outcomes[voter_id] = "untagged"
+    db.commit()
+    return outcomes
+
+
+def _filter_voter_ids(db: Session, user, criteria: BulkTagFilter) -> List[int]:
+    """Ids of the voters matching the filter, within the user's counties."""
+    query = db.query(Voter.id)
+    if not user.is_admin:
+        query = query.filter(Voter.county.in_(sorted(user.allowed_counties)))
+    for name in ("county", "precinct", "city", "zip_code"):
+        value = (getattr(criteria, name) or "").strip()
+        if value:
+            query = query.filter(func.lower(getattr(Voter, name)) == value.lower())
+    street = (criteria.street or "").split()
+    if street:
+        query = query.filter(*substring_filter(db.get_bind().dialect.name, Voter.address, street))
+
+    ids = [row[0] for row in query.order_by(Voter.id).limit(BULK_TAG_MAX_VOTERS + 1)]
+    if len(ids) > BULK_TAG_MAX_VOTERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"The filter matches more than {BULK_TAG_MAX_VOTERS} voters; narrow it down.",
+        )
+    return ids
+
+
+# --------------------------------------------------------------------
+# Tag or untag many voters for the current user
+# POST /tags/bulk  {"voter_ids": [...]} or {"filter": {...}}, "untag": bool
+# (declared before /{voter_id} so "bulk" is not read as an id)
+# --------------------------------------------------------------------
+@router.post("/bulk")
+def bulk_tag_voters(
+    payload: BulkTagRequest,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    if (payload.voter_ids is None) == (payload.filter is None):
+        raise HTTPException(status_code=400, detail="Send either voter_ids or filter")
+
+    if payload.filter is not None:
+        if not any((getattr(payload.filter, name) or "").strip() for name in BulkTagFilter.model_fields):
+            raise HTTPException(status_code=400, detail="The filter needs at least one field")
+        voter_ids = _filter_voter_ids(db, user, payload.filter)
+    else:
+        voter_ids = list(dict.fromkeys(payload.voter_ids))
+        if len(voter_ids) > BULK_TAG_MAX_VOTERS:
+            raise HTTPException(
+                status_code=400, detail=f"At most {BULK_TAG_MAX_VOTERS} voters per request"
+            )
+
+    outcomes = _untag_voters(db, user, voter_ids) if payload.untag else _tag_voters(db, user, voter_ids)
+
+    counts: Dict[str, int] = {}
+    for status in outcomes.values():
+        counts[status] = counts.get(status, 0) + 1
+    return {
+        "results": [{"voter_id": voter_id, "status": status} for voter_id, status in outcomes.items()],
+        "counts": counts,
+    }
+
+
 # --------------------------------------------------------------------
 # Tag a voter for the current user
 # POST /tags/{voter_id}
@@ -32,44 +192,23 @@ def tag_voter(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    voter = db.query(Voter).filter(Voter.id == voter_id).first()
-    if not voter:
+    status = _tag_voters(db, user, [voter_id])[voter_id]
+    if status == "not_found":
         raise HTTPException(status_code=404, detail="Voter not found")
 
     # Non-admin users cannot tag voters outside their allowed counties
-    if not user.is_admin:
-        allowed_rows = (
-            db.query(UserCountyAccess.county)
-            .filter(UserCountyAccess.user_id == user.id)
-            .all()
-        )
-        allowed_counties = [r[0] for r in allowed_rows if r[0] is not None]
-
-        if allowed_counties:
-            if voter.county not in allowed_counties:
-                raise HTTPException(
-                    status_code=403,
-                    detail="You are not allowed to tag voters in this county.",
-                )
-        else:
+    if status == "forbidden":
+        if user.allowed_counties:
             raise HTTPException(
                 status_code=403,
-                detail="You have not been granted access to any counties.",
+                detail="You are not allowed to tag voters in this county.",
             )
+        raise HTTPException(
+            status_code=403,
+            detail="You have not been granted access to any counties.",
+        )
 
-    # Check if already tagged by this user
-    existing = (
-        db.query(UserVoterTag)
-        .filter(UserVoterTag.user_id == user.id, UserVoterTag.voter_id == voter_id)
-        .first()
-    )
-    if existing:
-        return {"status": "already_tagged"}
-
-    tag = UserVoterTag(user_id=user.id, voter_id=voter_id)
-    db.add(tag)
-    db.commit()
-    return {"status": "tagged"}
+    return {"status": status}
 
 
 # --------------------------------------------------------------------
@@ -82,172 +221,156 @@ def untag_voter(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    tag = (
-        db.query(UserVoterTag)
-        .filter(UserVoterTag.user_id == user.id, UserVoterTag.voter_id == voter_id)
-        .first()
-    )
-    if not tag:
+    if _untag_voters(db, user, [voter_id])[voter_id] == "not_tagged":
         raise HTTPException(status_code=404, detail="Tag not found")
-
-    db.delete(tag)
-    db.commit()
     return {"status": "untagged"}
 
 
 # --------------------------------------------------------------------
 # Get the current user's tagged voters (dashboard)
-# GET /tags/dashboard
+# GET /tags/dashboard?sort=name|precinct|voted&limit=&cursor=
 # --------------------------------------------------------------------
-@router.get("/dashboard")
+# Sort keys: the leading column, then name and id so the order is total and
+# a cursor can seek past the last row. Nullable columns are coalesced so the
+# tuple comparison never meets a NULL.
+DASHBOARD_SORTS = {
+    "name": (),
+    "precinct": (func.coalesce(Voter.precinct, ""),),
+    "voted": (func.coalesce(Voter.has_voted, false()),),  # not voted first: the call list
+}
+
+
+@router.get("/dashboard", dependencies=[conditional_get(VOTERS, TAG_CHANGES, principal=get_current_user)])
 def get_dashboard(
+    response: Response,
+    sort: str = Query("name", description="name, precinct or voted (not voted first)"),
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=1000,
+        description="Page size; omit for every tagged voter. The next page's cursor is in X-Next-Cursor.",
+    ),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    tags = (
-        db.query(UserVoterTag)
+    if sort not in DASHBOARD_SORTS:
+        raise HTTPException(status_code=400, detail="sort must be 'name', 'precinct' or 'voted'")
+
+    # One join from the user's tags to their voters (user_voter_tags is
+    # indexed by user_id through uq_user_voter_tag)
+    query = (
+        db.query(*DASHBOARD_COLUMNS)
+        .join(UserVoterTag, UserVoterTag.voter_id == Voter.id)
         .filter(UserVoterTag.user_id == user.id)
-        .all()
     )
-    voter_ids = [t.voter_id for t in tags]
-    if not voter_ids:
-        return []
 
-    if user.is_admin:
-        # Admins see all tagged voters
-        voters = db.query(Voter).filter(Voter.id.in_(voter_ids)).all()
-    else:
+    if not user.is_admin:
         # Restrict tagged voters to allowed counties
-        allowed_rows = (
-            db.query(UserCountyAccess.county)
-            .filter(UserCountyAccess.user_id == user.id)
-            .all()
-        )
-        allowed_counties = [r[0] for r in allowed_rows if r[0] is not None]
-
+        allowed_counties = sorted(user.allowed_counties)
         if not allowed_counties:
             return []
+        query = query.filter(Voter.county.in_(allowed_counties))
 
-        voters = (
-            db.query(Voter)
-            .filter(
-                Voter.id.in_(voter_ids),
-                Voter.county.in_(allowed_counties),
-            )
-            .all()
+    sort_key = DASHBOARD_SORTS[sort] + (Voter.last_name, Voter.first_name, Voter.id)
+    if cursor:
+        last = decode_cursor(cursor, f"dashboard-{sort}", len(sort_key))
+        query = query.filter(tuple_(*sort_key) > tuple_(*last))
+    query = query.order_by(*sort_key)
+
+    if limit is not None:
+        query = query.limit(limit + 1)
+    rows = query.all()
+
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        leading = {"name": [], "precinct": [last.precinct or ""], "voted": [bool(last.has_voted)]}[sort]
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            f"dashboard-{sort}", leading + [last.last_name, last.first_name, last.id]
         )
 
     # Return explicit dicts so we can include note without touching schemas.py
-    out = []
-    for v in voters:
-        out.append(
-            {
-                "id": v.id,
-                "voter_id": v.voter_id,
-                "first_name": v.first_name,
-                "last_name": v.last_name,
-                "address": v.address,
-                "city": v.city,
-                "state": v.state,
-                "zip_code": v.zip_code,
-                "county": v.county,
-                "precinct": v.precinct,
-                "registered_party": v.registered_party,
-                "phone": v.phone,
-                "email": v.email,
-                "has_voted": v.has_voted,
-                "note": v.note,
-            }
-        )
-    return out
+    return [dict(row._mapping) for row in rows]
 
 
 # --------------------------------------------------------------------
-# Export tagged voters as CSV
-# GET /tags/export
+# Ticket for opening the live stream below
+# POST /tags/live/ticket
 # --------------------------------------------------------------------
-@router.get("/export")
-def export_tags(
+@router.post("/live/ticket")
+def live_stream_ticket(
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    tags = (
-        db.query(UserVoterTag)
-        .filter(UserVoterTag.user_id == user.id)
-        .all()
-    )
-    voter_ids = [t.voter_id for t in tags]
-    if not voter_ids:
-        # Return an empty CSV
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(
-            [
-                "voter_id",
-                "first_name",
-                "last_name",
-                "address",
-                "city",
-                "state",
-                "zip_code",
-                "precinct",
-                "registered_party",
-                "phone",
-                "email",
-                "note",
-            ]
-        )
-        resp = Response(
-            content=output.getvalue(),
-            media_type="text/csv",
-            headers={"Content-Disposition": 'attachment; filename="call_list.csv"'},
-        )
-        return resp
-
-    voters = db.query(Voter).filter(Voter.id.in_(voter_ids)).all()
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(
-        [
-            "voter_id",
-            "first_name",
-            "last_name",
-            "address",
-            "city",
-            "state",
-            "zip_code",
-            "precinct",
-            "registered_party",
-            "phone",
-            "email",
-            "note",
-        ]
+    return {"ticket": issue_stream_ticket(db, user)}
+
+
+# --------------------------------------------------------------------
+# Live updates to the current user's tagged voters (Server-Sent Events)
+# GET /tags/live?ticket=
+# Each "voter" event is a dashboard row that changed (voted import,
+# contact edit); "resync" means events were dropped and the dashboard
+# should be reloaded.
+# --------------------------------------------------------------------
+@router.get("/live")
+async def live_tag_updates(request: Request, user=Depends(get_stream_user)):
+    subscription = live_updates.subscribe(user)
+
+    async def events():
+        try:
+            yield "retry: 5000\n\n" + format_event("ready", {})
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.queue.get(), LIVE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                yield message
+        finally:
+            live_updates.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    for v in voters:
-        writer.writerow(
-            [
-                v.voter_id,
-                v.first_name,
-                v.last_name,
-                v.address or "",
-                v.city or "",
-                v.state or "",
-                v.zip_code or "",
-                v.precinct or "",
-                v.registered_party or "",
-                v.phone or "",
-                v.email or "",
-                v.note or "",
-            ]
-        )
 
-    resp = Response(
-        content=output.getvalue(),
-        media_type="text/csv",
-        headers={"Content-Disposition": 'attachment; filename="call_list.csv"'},
+
+# --------------------------------------------------------------------
+# Export tagged voters as CSV (streamed, see csv_export)
+# GET /tags/export?gzip=
+# --------------------------------------------------------------------
+EXPORT_COLUMNS = (
+    "voter_id",
+    "first_name",
+    "last_name",
+    "address",
+    "city",
+    "state",
+    "zip_code",
+    "precinct",
+    "registered_party",
+    "phone",
+    "email",
+    "note",
+)
+
+
+@router.get("/export")
+def export_tags(
+    gzip: bool = Query(False, description="Send call_list.csv.gz instead of plain CSV"),
+    user=Depends(get_current_user),
+):
+    statement = (
+        select(*[getattr(Voter, name) for name in EXPORT_COLUMNS])
+        .join(UserVoterTag, UserVoterTag.voter_id == Voter.id)
+        .where(UserVoterTag.user_id == user.id)
+        .order_by(Voter.last_name, Voter.first_name, Voter.id)
     )
-    return resp
+    return csv_response("call_list.csv", EXPORT_COLUMNS, statement, compress=gzip)
 
 
 # --------------------------------------------------------------------
@@ -278,8 +401,16 @@ def update_tagged_voter_contact(
         voter.phone = payload.phone
     if payload.email is not None:
         voter.email = payload.email
+    if payload.phone is not None or payload.email is not None:
+        # The next voter-file import must be allowed to rewrite this row
+        voter.row_fingerprint = None
     if payload.note is not None:
         voter.note = payload.note
 
+    voter.change_seq = next_change_seq(db, VOTER_CHANGES)
+    bump_data_version(db)
     db.commit()
+    if payload.phone is not None or payload.email is not None:
+        search_index.refresh(db, [voter_id])
+    live_updates.push_voters(db, [voter_id])
     return {"status": "updated"}
@@ -1,42 +1,122 @@
 # backend/app/routers/voter_routes.py
 
-from typing import Optional
-import re
+from typing import List, Optional
+import os
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
+from sqlalchemy import or_, and_, case, false, func, tuple_, cast, REAL
 
 from app.database import get_db
 from app.deps import get_current_user
-from app.models import Voter, UserCountyAccess
-from app.schemas import VoterSearchResponse
+from app.models import Voter
+from app.phonetic import edit_distance, metaphone
+from app.schemas import CountySnapshotInfo, VoterOut, VoterSearchResponse, VoterSuggestion
+from app.county_counts import county_total
+from app.county_snapshots import county_snapshots
+from app.cursors import counties_digest, decode_cursor, encode_cursor
+from app.conditional import etag_matches
+from app.data_version import VOTER_FILE, get_data_version
+from app.search_backend import get_search_backend
+from app.search_cache import search_cache
+from app.search_index import SEARCH_INDEX_IN_MEMORY, search_index
+from app.suggest_index import suggest_index
+from app.trigram import similarity, substring_filter
 
 router = APIRouter(prefix="/voters", tags=["Voters"])
 
+# Fuzzy search re-ranks at most this many phonetic matches, the closest
+# first (see _fuzzy_closeness).
+FUZZY_MAX_CANDIDATES = 1000
 
-def _sanitize_term(term: str) -> str:
+
+def _decode_cursor(cursor: str, order: str) -> list:
+    # name keys are (last_name, first_name, id), rank keys (rank, id)
+    return decode_cursor(cursor, order, 3 if order == "name" else 2)
+
+
+def _key_is(col, key: str):
+    # A term without letters has no key and matches nothing (not IS NULL)
+    return col == key if key else false()
+
+
+def _fuzzy_filter(field: str, terms: List[str]):
     """
-    Keep only alphanumeric characters. This avoids tsquery syntax issues
-    and prevents user input from breaking the query.
+    Voters whose name keys match the terms' Metaphone keys. Only equality on
+    the indexed first_name_key / last_name_key columns, never a wildcard scan.
     """
-    return re.sub(r"[^a-z0-9]+", "", term.lower())
+    if field in ("first_name", "last_name"):
+        col = Voter.first_name_key if field == "first_name" else Voter.last_name_key
+        return _key_is(col, metaphone("".join(terms)))
 
+    keys = [metaphone(t) for t in terms]
+    if len(keys) == 2:
+        k1, k2 = keys
+        return or_(
+            and_(_key_is(Voter.first_name_key, k1), _key_is(Voter.last_name_key, k2)),
+            and_(_key_is(Voter.first_name_key, k2), _key_is(Voter.last_name_key, k1)),
+            # two-word last name
+            _key_is(Voter.last_name_key, metaphone("".join(terms))),
+        )
+    return and_(*[or_(_key_is(Voter.first_name_key, k), _key_is(Voter.last_name_key, k)) for k in keys])
 
-def _build_prefix_tsquery(terms: list[str]) -> str:
-    """
-    Build a to_tsquery string that uses prefix matching for each term, e.g.
-    ["don", "purdy", "atlantic"] -> "don:* & purdy:* & atlantic:*"
 
-    We only apply :* for terms length >= 3 to avoid extremely broad matches on short tokens.
-    Short tokens (1-2 chars) are ignored in the tsquery.
+def _fuzzy_distance(field: str, terms: List[str], voter: Voter) -> int:
+    """How far the typed terms are from the voter's names (lower is closer)."""
+    first, last = voter.first_name or "", voter.last_name or ""
+    if field == "first_name":
+        return edit_distance(" ".join(terms), first)
+    if field == "last_name":
+        return edit_distance(" ".join(terms), last)
+    if len(terms) == 2:
+        t1, t2 = terms
+        return min(
+            edit_distance(t1, first) + edit_distance(t2, last),
+            edit_distance(t2, first) + edit_distance(t1, last),
+            edit_distance(f"{t1} {t2}", last),
+        )
+    return sum(min(edit_distance(t, first), edit_distance(t, last)) for t in terms)
+
+
+def _fuzzy_closeness(field: str, terms: List[str]):
+    """
+    SQL stand-in for _fuzzy_distance (lower is closer), cheap enough to order
+    every key match by before the FUZZY_MAX_CANDIDATES cut, so common keys
+    (JNSN: Jansen, Jensen, Johnson...) cannot push the best matches out. Per
+    term: 0 for an exact name, 1 or 2 for a name sharing its first three or
+    two letters, 3 otherwise.
     """
-    cleaned = []
-    for t in terms:
-        s = _sanitize_term(t)
-        if len(s) >= 3:
-            cleaned.append(f"{s}:*")
-    return " & ".join(cleaned)
+    if field in ("first_name", "last_name"):
+        cols = [getattr(Voter, field)]
+        terms = [" ".join(terms)]
+    else:
+        cols = [Voter.first_name, Voter.last_name]
+
+    tiers = []
+    for term in terms:
+        term = term.lower()
+        tiers.append(
+            case(
+                (or_(*[func.lower(col) == term for col in cols]), 0),
+                (or_(*[func.lower(col).startswith(term[:3], autoescape=True) for col in cols]), 1),
+                (or_(*[func.lower(col).startswith(term[:2], autoescape=True) for col in cols]), 2),
+                else_=3,
+            )
+        )
+    return sum(tiers[1:], tiers[0])
+
+
+def _allowed_counties(user) -> Optional[List[str]]:
+    """Counties a volunteer may see; None for admins (every county)."""
+    if getattr(user, "is_admin", False):
+        return None
+    return sorted(user.allowed_counties)
+
+
+def _voter_out(voter: Voter) -> dict:
+    # Plain dicts, so cached responses hold no ORM state
+    return {name: getattr(voter, name) for name in VoterOut.model_fields}
 
 
 @router.get("/", response_model=VoterSearchResponse)
@@ -50,8 +130,31 @@ def search_voters(
             "zip_code, registered_party, phone, email, voter_id, county, precinct."
         ),
     ),
+    sort: str = Query(
+        "name",
+        description=(
+            "name, or similarity to rank field-specific searches by how closely "
+            "the column matches the query."
+        ),
+    ),
+    fuzzy: bool = Query(
+        False,
+        description=(
+            "Match names by sound (Metaphone key) instead of spelling, ranked by "
+            "edit distance. Applies to field=all, first_name and last_name; pages "
+            "by page number only."
+        ),
+    ),
     page: int = Query(1, ge=1),
     page_size: int = Query(25, ge=1, le=50),
+    cursor: Optional[str] = Query(
+        None,
+        description=(
+            "Opaque next_cursor from a previous response. Seeks past the last row "
+            "returned instead of using OFFSET, so deep pages cost the same as page 1. "
+            "When given, page is ignored."
+        ),
+    ),
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
@@ -64,20 +167,17 @@ def search_voters(
         else:
             page_size = 50
 
+    if sort not in ("name", "similarity"):
+        raise HTTPException(status_code=400, detail="sort must be 'name' or 'similarity'")
+
+    dialect = db.get_bind().dialect.name
     base_query = db.query(Voter)
 
     # -------------------------------------------------
     # County permissions
     # -------------------------------------------------
-    allowed_counties = None
-    if not getattr(user, "is_admin", False):
-        allowed_counties = [
-            r[0]
-            for r in db.query(UserCountyAccess.county)
-            .filter(UserCountyAccess.user_id == user.id)
-            .all()
-        ]
-
+    allowed_counties = _allowed_counties(user)
+    if allowed_counties is not None:
         if not allowed_counties:
             return {
                 "voters": [],
@@ -85,6 +185,7 @@ def search_voters(
                 "has_more": False,
                 "page": page,
                 "page_size": page_size,
+                "next_cursor": None,
             }
 
         base_query = base_query.filter(Voter.county.in_(allowed_counties))
@@ -111,14 +212,47 @@ def search_voters(
         "precinct": Voter.precinct,
     }
 
-    if terms:
+    fuzzy = fuzzy and bool(terms) and normalized_field in ("all", "first_name", "last_name")
+
+    # -------------------------------------------------
+    # Result cache (see search_cache); the version is read before searching
+    # so a change committed meanwhile can only make this entry stale-on-arrival.
+    # -------------------------------------------------
+    version = get_data_version(db)
+    cache_key = (
+        " ".join(t.lower() for t in terms),
+        normalized_field if normalized_field in field_map else "all",
+        sort,
+        fuzzy,
+        # Fuzzy search pages by number only; the others ignore page given a cursor
+        page if fuzzy or not cursor else None,
+        page_size,
+        None if fuzzy else cursor,
+        tuple(sorted(allowed_counties)) if allowed_counties is not None else None,
+    )
+    cached = search_cache.get(version, cache_key)
+    if cached is not None:
+        return cached
+
+    rank = None  # FTS / trigram relevance, when results are ranked instead of name-ordered
+    use_index = False  # answer from the in-memory search index instead of SQL
+    name_collation = None  # compare names in code point order, as the in-memory index does
+
+    if fuzzy:
+        # ---------------------------------------------
+        # Phonetic lookup (indexed key equality), re-ranked below
+        # ---------------------------------------------
+        base_query = base_query.filter(_fuzzy_filter(normalized_field, terms))
+
+    elif terms:
         # ---------------------------------------------
         # Specific column search
         # ---------------------------------------------
         if normalized_field != "all" and normalized_field in field_map:
             col = field_map[normalized_field]
-            base_query = base_query.filter(and_(*[col.ilike(f"%{t}%") for t in terms]))
-            base_query = base_query.order_by(Voter.last_name.asc(), Voter.first_name.asc())
+            base_query = base_query.filter(*substring_filter(dialect, col, terms))
+            if sort == "similarity":
+                rank = similarity(dialect, col, terms)
 
         # ---------------------------------------------
         # ALL FIELDS SEARCH (smart)
@@ -150,51 +284,171 @@ def search_voters(
                     )
                 )
 
-                base_query = base_query.order_by(Voter.last_name.asc(), Voter.first_name.asc())
-
             # -----------------------------
-            # EVERYTHING ELSE → FTS (PREFIX)
+            # EVERYTHING ELSE → FTS (PREFIX), see search_backend
             # -----------------------------
-            else:
-                # Build prefix tsquery so "don" matches "donald", etc.
-                tsquery_str = _build_prefix_tsquery(terms)
-
-                # If everything was too short and got filtered out, fallback to plainto_tsquery
-                if not tsquery_str:
-                    tsq = func.plainto_tsquery("simple", func.lower(" ".join(terms)))
+            elif SEARCH_INDEX_IN_MEMORY:
+                # Same matching, answered in memory when the index is current
+                # (see search_index). The index is name-ordered, so its SQL
+                # fallback is too: which of the two answers never changes the
+                # order or the cursor type.
+                if search_index.is_current(version):
+                    use_index = True
                 else:
-                    tsq = func.to_tsquery("simple", tsquery_str)
-
-                base_query = base_query.filter(Voter.search_tsv.op("@@")(tsq))
-                base_query = base_query.order_by(func.ts_rank(Voter.search_tsv, tsq).desc())
+                    base_query, _ = get_search_backend().fulltext(base_query, terms)
+                    name_collation = "C" if dialect == "postgresql" else None
+            else:
+                base_query, rank = get_search_backend().fulltext(base_query, terms)
 
     # -------------------------------------------------
-    # No search → browsing
+    # Ordering + pagination (NO COUNT(*) on search)
+    #   name order: (last_name, first_name, id)
+    #   ranked (FTS, or sort=similarity): (rank DESC, id)
+    # id makes the order total, so a cursor can seek from the last row.
     # -------------------------------------------------
+    if fuzzy:
+        candidates = (
+            base_query.order_by(
+                _fuzzy_closeness(normalized_field, terms),
+                Voter.last_name.asc(),
+                Voter.first_name.asc(),
+                Voter.id.asc(),
+            )
+            .limit(FUZZY_MAX_CANDIDATES)
+            .all()
+        )
+        candidates.sort(key=lambda v: (_fuzzy_distance(normalized_field, terms, v), v.last_name, v.first_name, v.id))
+        offset = (page - 1) * page_size
+        rows = candidates[offset : offset + page_size + 1]
+    elif use_index:
+        after = tuple(_decode_cursor(cursor, "name")) if cursor else None
+        offset = 0 if cursor else (page - 1) * page_size
+        ids = search_index.search(terms, allowed_counties, page_size + 1, offset=offset, after=after)
+        by_id = {v.id: v for v in db.query(Voter).filter(Voter.id.in_(ids))} if ids else {}
+        rows = [by_id[i] for i in ids if i in by_id]
     else:
-        base_query = base_query.order_by(Voter.last_name.asc(), Voter.first_name.asc())
+        if rank is not None:
+            base_query = base_query.add_columns(rank)
+            if cursor:
+                last_rank, last_id = _decode_cursor(cursor, "rank")
+                # ts_rank / similarity are float4; compare in float4 so the last row's rank matches exactly
+                last_rank = cast(last_rank, REAL)
+                base_query = base_query.filter(
+                    or_(rank < last_rank, and_(rank == last_rank, Voter.id > last_id))
+                )
+            base_query = base_query.order_by(rank.desc(), Voter.id.asc())
+        else:
+            last_col, first_col = Voter.last_name, Voter.first_name
+            if name_collation:
+                last_col, first_col = last_col.collate(name_collation), first_col.collate(name_collation)
+            if cursor:
+                last_name, first_name, last_id = _decode_cursor(cursor, "name")
+                base_query = base_query.filter(
+                    tuple_(last_col, first_col, Voter.id) > tuple_(last_name, first_name, last_id)
+                )
+            base_query = base_query.order_by(last_col.asc(), first_col.asc(), Voter.id.asc())
 
-    # -------------------------------------------------
-    # Pagination (NO COUNT(*) on search)
-    # -------------------------------------------------
-    offset = (page - 1) * page_size
-    rows = base_query.offset(offset).limit(page_size + 1).all()
+        if not cursor:
+            base_query = base_query.offset((page - 1) * page_size)
+        rows = base_query.limit(page_size + 1).all()
 
     has_more = len(rows) > page_size
-    voters = rows[:page_size]
+    rows = rows[:page_size]
+
+    next_cursor = None
+    if rank is not None:
+        voters = [r[0] for r in rows]
+        if has_more:
+            next_cursor = encode_cursor("rank", [float(rows[-1][1]), rows[-1][0].id])
+    else:
+        voters = rows
+        if has_more and not fuzzy:
+            last = rows[-1]
+            next_cursor = encode_cursor("name", [last.last_name, last.first_name, last.id])
 
     # Only count totals when browsing
     total = None
     if not terms:
-        count_query = db.query(func.count(Voter.id))
-        if not getattr(user, "is_admin", False) and allowed_counties:
-            count_query = count_query.filter(Voter.county.in_(allowed_counties))
-        total = count_query.scalar()
+        # Maintained per county by the imports, see county_counts
+        total = county_total(db, allowed_counties)
 
-    return {
-        "voters": voters,
+    response = {
+        "voters": [_voter_out(v) for v in voters],
         "total": total,
         "has_more": has_more,
         "page": page,
         "page_size": page_size,
+        "next_cursor": next_cursor,
     }
+    search_cache.put(version, cache_key, response)
+    return response
+
+
+@router.get("/suggest", response_model=List[VoterSuggestion])
+def suggest_voters(
+    q: str = Query(..., min_length=1, description="What has been typed so far"),
+    limit: int = Query(10, ge=1, le=25),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    As-you-type completions: first names, last names and street names that
+    start with q within the caller's counties, most common first. Served from
+    the in-memory suggest_index, not the voters table.
+    """
+    allowed_counties = _allowed_counties(user)
+    suggest_index.start_rebuild(stale_unless=get_data_version(db, VOTER_FILE))
+    return suggest_index.suggest(q, allowed_counties, limit)
+
+
+# -----------------------------------------------------
+# Offline snapshots of whole counties (see county_snapshots)
+# -----------------------------------------------------
+@router.get("/snapshots", response_model=List[CountySnapshotInfo])
+def list_county_snapshots(user=Depends(get_current_user)):
+    """
+    The snapshots of the caller's counties, with content hashes to compare
+    against. `next` is the /sync/changes cursor that continues from a
+    snapshot; a client holding several counties continues from the `next`
+    of the one with the smallest change_seq (changes to the others since
+    then are sent again, which is harmless).
+    """
+    allowed_counties = _allowed_counties(user)
+    manifest = county_snapshots.manifest()
+    counties = manifest.keys() if allowed_counties is None else [c for c in allowed_counties if c in manifest]
+    digest = counties_digest(user)
+    snapshots = []
+    for county in sorted(counties):
+        entry = manifest[county]
+        # Same shape as sync_routes' cursors; tag_seq -1 fetches all of the caller's tags
+        key = [entry["epoch"], digest, entry["change_seq"], None, -1, False]
+        snapshots.append({"county": county, **entry, "next": encode_cursor("sync", key)})
+    return snapshots
+
+
+@router.get("/snapshots/{county}")
+def get_county_snapshot(
+    county: str,
+    if_none_match: Optional[str] = Header(None),
+    user=Depends(get_current_user),
+):
+    """
+    One county's voters as gzip-compressed columnar JSON (sent with
+    Content-Encoding: gzip). The ETag is the file's sha256; send it back in
+    If-None-Match to get a 304 when the snapshot has not changed.
+    """
+    allowed_counties = _allowed_counties(user)
+    if allowed_counties is not None and county not in allowed_counties:
+        raise HTTPException(status_code=403, detail="You do not have access to this county")
+
+    entry = county_snapshots.manifest().get(county)
+    path = county_snapshots.path_of(entry) if entry else None
+    if path is None or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="No snapshot for this county yet")
+
+    etag = f'"{entry["sha256"]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    headers["Content-Encoding"] = "gzip"
+    return FileResponse(path, media_type="application/json", headers=headers)
@@ -0,0 +1,33 @@
+# backend/app/schema_sync.py
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from .database import Base
+
+
+def add_missing_columns(engine: Engine):
+    """
+    create_all() only creates tables that do not exist yet. Columns (and their
+    indexes) added to an existing model later are created here, so databases
+    from older deployments keep working without a manual migration.
+
+    Only suitable for nullable columns without server defaults.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            present = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in present:
+                    continue
+                col_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"))
+
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
@@ -103,6 +103,23 @@ class VoterSearchResponse(BaseModel):
     has_more: bool
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
+
+
+class VoterSuggestion(BaseModel):
+    text: str
+    kind: str  # first_name, last_name or street
+    count: int
+
+
+class CountySnapshotInfo(BaseModel):
+    county: str
+    voters: int
+    bytes: int
+    sha256: str
+    change_seq: int
+    built_at: str
+    next: str  # /sync/changes cursor continuing from this snapshot
 
 
 class BrandingOut(BaseModel):
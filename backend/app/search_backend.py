@@ -0,0 +1,215 @@
+# backend/app/search_backend.py
+
+import logging
+import re
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import column, false, func, literal_column, or_, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Query
+
+from .models import Voter
+
+logger = logging.getLogger(__name__)
+
+# Columns covered by the "all fields" full-text search.
+FULLTEXT_COLUMNS = (
+    "first_name",
+    "last_name",
+    "address",
+    "city",
+    "zip_code",
+    "county",
+    "precinct",
+    "voter_id",
+    "phone",
+    "email",
+)
+
+SQLITE_FULLTEXT_TABLE = "voters_fts"
+
+
+def _sanitize_term(term: str) -> str:
+    """
+    Keep only alphanumeric characters. This avoids tsquery syntax issues
+    and prevents user input from breaking the query.
+    """
+    return re.sub(r"[^a-z0-9]+", "", term.lower())
+
+
+def prefix_terms(terms: List[str]) -> List[str]:
+    """
+    Sanitized terms that get prefix matching. Only terms of length >= 3 are
+    kept, to avoid extremely broad matches on short tokens.
+    """
+    cleaned = [_sanitize_term(t) for t in terms]
+    return [s for s in cleaned if len(s) >= 3]
+
+
+def _build_prefix_tsquery(terms: List[str]) -> str:
+    """
+    Build a to_tsquery string that uses prefix matching for each term, e.g.
+    ["don", "purdy", "atlantic"] -> "don:* & purdy:* & atlantic:*"
+
+    We only apply :* for terms length >= 3 to avoid extremely broad matches on short tokens.
+    Short tokens (1-2 chars) are ignored in the tsquery.
+    """
+    return " & ".join(f"{s}:*" for s in prefix_terms(terms))
+
+
+def _build_fts5_query(terms: List[str]) -> str:
+    """
+    The FTS5 equivalent of _build_prefix_tsquery:
+    ["don", "purdy"] -> '"don"* "purdy"*' (terms are ANDed).
+
+    When every term is too short for prefix matching, fall back to matching
+    the words exactly, like plainto_tsquery does.
+    """
+    prefixed = prefix_terms(terms)
+    if prefixed:
+        return " ".join(f'"{s}"*' for s in prefixed)
+    words = [w for w in re.split(r"[^a-z0-9]+", " ".join(terms).lower()) if w]
+    return " ".join(f'"{w}"' for w in words)
+
+
+def create_fts5_mirror(conn, name: str, columns: Sequence[str], options: str = "") -> bool:
+    """
+    Create an external-content FTS5 table `name` over the given voters
+    columns, with triggers that keep it in sync on insert, delete and updates
+    of those columns. A newly created table is rebuilt from the existing
+    voters. Returns True if the table was created.
+    """
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": name},
+    ).first()
+
+    cols = ", ".join(columns)
+    new_cols = ", ".join(f"new.{c}" for c in columns)
+    old_cols = ", ".join(f"old.{c}" for c in columns)
+    extra = f", {options}" if options else ""
+
+    conn.execute(
+        text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5("
+            f"{cols}, content='voters', content_rowid='id'{extra})"
+        )
+    )
+    conn.execute(
+        text(
+            f"CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON voters BEGIN "
+            f"INSERT INTO {name}(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+        )
+    )
+    conn.execute(
+        text(
+            f"CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON voters BEGIN "
+            f"INSERT INTO {name}({name}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END"
+        )
+    )
+    # Only edits to indexed columns re-index the row (not has_voted / note).
+    conn.execute(
+        text(
+            f"CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE OF {cols} ON voters BEGIN "
+            f"INSERT INTO {name}({name}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+            f"INSERT INTO {name}(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+        )
+    )
+    if exists:
+        return False
+    # Voters imported before the table existed.
+    conn.execute(text(f"INSERT INTO {name}({name}) VALUES ('rebuild')"))
+    return True
+
+
+# -----------------------------------------------------
+# Backends
+# -----------------------------------------------------
+class SearchBackend:
+    """
+    Full-text matching for the "all fields" branch of search_voters.
+
+    fulltext() narrows `query` (a Voter query) to voters matching every term
+    and returns it with a relevance expression (higher is better), or None
+    when the backend cannot rank and results should be name-ordered.
+    """
+
+    name = "like"
+
+    def setup(self, conn):
+        pass
+
+    def fulltext(self, query: Query, terms: List[str]) -> Tuple[Query, Optional[object]]:
+        # No index: every term must appear in one of the full-text columns.
+        cols = [getattr(Voter, c) for c in FULLTEXT_COLUMNS]
+        for t in terms:
+            query = query.filter(or_(*[col.ilike(f"%{t}%") for col in cols]))
+        return query, None
+
+
+class PostgresFullText(SearchBackend):
+    """to_tsquery prefix matching against the search_tsv column, ranked by ts_rank."""
+
+    name = "postgres"
+
+    def fulltext(self, query, terms):
+        # Build prefix tsquery so "don" matches "donald", etc.
+        tsquery_str = _build_prefix_tsquery(terms)
+
+        # If everything was too short and got filtered out, fallback to plainto_tsquery
+        if not tsquery_str:
+            tsq = func.plainto_tsquery("simple", func.lower(" ".join(terms)))
+        else:
+            tsq = func.to_tsquery("simple", tsquery_str)
+
+        query = query.filter(Voter.search_tsv.op("@@")(tsq))
+        return query, func.ts_rank(Voter.search_tsv, tsq)
+
+
+class SQLiteFullText(SearchBackend):
+    """FTS5 table kept in sync with voters by triggers, ranked by bm25."""
+
+    name = "sqlite_fts5"
+
+    def setup(self, conn):
+        # prefix='3' indexes 3-character prefixes, the shortest prefix we query
+        create_fts5_mirror(conn, SQLITE_FULLTEXT_TABLE, FULLTEXT_COLUMNS, "prefix='3'")
+
+    def fulltext(self, query, terms):
+        match = _build_fts5_query(terms)
+        if not match:
+            return query.filter(false()), None
+
+        fts = table(SQLITE_FULLTEXT_TABLE, column("rowid"))
+        query = query.join(fts, fts.c.rowid == Voter.id).filter(
+            literal_column(SQLITE_FULLTEXT_TABLE).op("MATCH")(match)
+        )
+        # bm25() is lower-is-better
+        return query, -func.bm25(literal_column(SQLITE_FULLTEXT_TABLE))
+
+
+_BACKENDS = {"postgresql": PostgresFullText, "sqlite": SQLiteFullText}
+
+_backend: SearchBackend = SearchBackend()
+
+
+def get_search_backend() -> SearchBackend:
+    return _backend
+
+
+def configure_search_backend(engine: Engine):
+    """
+    Pick the full-text backend for this database and create whatever it
+    needs. If that fails (e.g. SQLite built without FTS5), search falls
+    back to unindexed ILIKE matching.
+    """
+    global _backend
+
+    backend = _BACKENDS.get(engine.dialect.name, SearchBackend)()
+    try:
+        with engine.begin() as conn:
+            backend.setup(conn)
+    except Exception:
+        logger.warning("Full-text search backend %s unavailable; using ILIKE", backend.name, exc_info=True)
+        backend = SearchBackend()
+    _backend = backend
@@ -0,0 +1,87 @@
+# backend/app/search_cache.py
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+# Most responses kept, and most voter rows held across all of them.
+# SEARCH_CACHE_ENTRIES=0 turns the cache off.
+SEARCH_CACHE_ENTRIES = int(os.getenv("SEARCH_CACHE_ENTRIES", "2000"))
+SEARCH_CACHE_MAX_VOTERS = int(os.getenv("SEARCH_CACHE_MAX_VOTERS", "50000"))
+
+
+class SearchCache:
+    """
+    LRU cache of search_voters responses.
+
+    Entries belong to one data version (see data_version): the first lookup
+    that sees a newer version empties the cache, so imports, deletes and
+    contact edits made by any process invalidate it.
+    """
+
+    def __init__(self, max_entries: int, max_voters: int):
+        self.max_entries = max_entries
+        self.max_voters = max_voters
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, dict]" = OrderedDict()
+        self._voters = 0
+        self._version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _sync_version(self, version: int):
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._voters = 0
+            self._version = version
+
+    def get(self, version: int, key: Hashable) -> Optional[dict]:
+        if self.max_entries <= 0:
+            return None
+        with self._lock:
+            self._sync_version(version)
+            response = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, version: int, key: Hashable, response: dict):
+        size = len(response["voters"])
+        if self.max_entries <= 0 or size > self.max_voters:
+            return
+        with self._lock:
+            self._sync_version(version)
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._voters -= len(old["voters"])
+            self._entries[key] = response
+            self._voters += size
+            while len(self._entries) > self.max_entries or self._voters > self.max_voters:
+                _, evicted = self._entries.popitem(last=False)
+                self._voters -= len(evicted["voters"])
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.max_entries > 0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "cached_voters": self._voters,
+                "max_voters": self.max_voters,
+                "data_version": self._version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "invalidations": self.invalidations,
+            }
+
+
+search_cache = SearchCache(SEARCH_CACHE_ENTRIES, SEARCH_CACHE_MAX_VOTERS)
@@ -0,0 +1,305 @@
+# backend/app/search_index.py
+
+import heapq
+import logging
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from .data_version import VOTER_CHANGES, VOTERS, VOTERS_EPOCH, get_data_versions
+from .database import SessionLocal
+from .models import Voter
+from .search_backend import FULLTEXT_COLUMNS, prefix_terms
+
+logger = logging.getLogger(__name__)
+
+# Opt-in: every worker process holds its own copy of the index, and catches
+# up with changes made through other processes when the voters data version
+# moves (see VoterSearchIndex.is_current). With it, "all fields" searches are
+# name-ordered instead of ranked, whether the index or SQL answers them.
+SEARCH_INDEX_IN_MEMORY = os.getenv("SEARCH_INDEX_IN_MEMORY", "").lower() in ("1", "true", "yes")
+
+# Rows fetched per round trip while loading.
+LOAD_BATCH_SIZE = 5000
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# (last_name, first_name, id): the name order search_voters pages in
+SortKey = Tuple[str, str, int]
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    """Lower-cased alphanumeric runs, like the 'simple' text search configuration."""
+    return _TOKEN_RE.findall(value.lower()) if value else []
+
+
+class _Partition:
+    """
+    Inverted index over the voters of one county: a sorted vocabulary (for
+    prefix lookups with bisect) and, per token, a sorted array of voter ids.
+    """
+
+    __slots__ = ("vocab", "postings")
+
+    def __init__(self):
+        self.vocab: List[str] = []
+        self.postings: Dict[str, array] = {}
+
+    def add(self, voter_id: int, tokens: Iterable[str]):
+        for token in tokens:
+            ids = self.postings.get(token)
+            if ids is None:
+                self.postings[token] = array("i", [voter_id])
+                insort(self.vocab, token)
+            else:
+                if ids and ids[-1] < voter_id:
+                    ids.append(voter_id)  # the common case while loading in id order
+                else:
+                    ids.insert(bisect_left(ids, voter_id), voter_id)
+
+    def remove(self, voter_id: int, tokens: Iterable[str]):
+        for token in tokens:
+            ids = self.postings.get(token)
+            if ids is None:
+                continue
+            i = bisect_left(ids, voter_id)
+            if i < len(ids) and ids[i] == voter_id:
+                del ids[i]
+            if not ids:
+                del self.postings[token]
+                del self.vocab[bisect_left(self.vocab, token)]
+
+    def matching(self, term: str, prefix: bool) -> Set[int]:
+        if not prefix:
+            return set(self.postings.get(term, ()))
+        found: Set[int] = set()
+        i = bisect_left(self.vocab, term)
+        while i < len(self.vocab) and self.vocab[i].startswith(term):
+            found.update(self.postings[self.vocab[i]])
+            i += 1
+        return found
+
+
+class VoterSearchIndex:
+    """
+    In-process, county-partitioned replacement for the "all fields" full-text
+    query: the same terms as _build_prefix_tsquery (prefix matches for terms
+    of 3+ characters, exact words when every term is shorter), ANDed together.
+
+    Partitioning by county makes the UserCountyAccess filter free: only the
+    partitions a volunteer may see are searched.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.version: Optional[int] = None  # voters data version the index reflects
+        self.seq = 0  # VOTER_CHANGES number every indexed row is current to
+        self.epoch: Optional[int] = None  # VOTERS_EPOCH it was loaded at
+        self._refreshing = False
+        self._lock = threading.RLock()
+        self._partitions: Dict[str, _Partition] = {}
+        # voter id -> (county, sort key, tokens)
+        self._docs: Dict[int, Tuple[str, SortKey, Tuple[str, ...]]] = {}
+
+    # -------------------------------------------------
+    # Building and refreshing
+    # -------------------------------------------------
+    _columns = (Voter.id, Voter.county, Voter.last_name, Voter.first_name) + tuple(
+        getattr(Voter, c) for c in FULLTEXT_COLUMNS
+    )
+
+    def _put(self, row):
+        voter_id, county, last_name, first_name = row[:4]
+        tokens = tuple(sorted({t for value in row[4:] for t in tokenize(value)}))
+        county = county or ""
+        self._drop(voter_id)
+        self._partitions.setdefault(county, _Partition()).add(voter_id, tokens)
+        self._docs[voter_id] = (county, (last_name or "", first_name or "", voter_id), tokens)
+
+    def _drop(self, voter_id: int):
+        doc = self._docs.pop(voter_id, None)
+        if doc is not None:
+            self._partitions[doc[0]].remove(voter_id, doc[2])
+
+    @staticmethod
+    def _versions(db: Session) -> Dict[str, int]:
+        # Read before the rows: a change committed meanwhile leaves the index behind, never ahead
+        return get_data_versions(db, (VOTERS, VOTER_CHANGES, VOTERS_EPOCH))
+
+    def load(self, db: Session):
+        """(Re)build the whole index from the voters table."""
+        versions = self._versions(db)
+        fresh = VoterSearchIndex()
+        last_id = 0
+        while True:
+            rows = (
+                db.query(*self._columns)
+                .filter(Voter.id > last_id)
+                .order_by(Voter.id)
+                .limit(LOAD_BATCH_SIZE)
+                .all()
+            )
+            if not rows:
+                break
+            for row in rows:
+                fresh._put(row)
+            last_id = rows[-1][0]
+
+        with self._lock:
+            self._partitions, self._docs = fresh._partitions, fresh._docs
+            self.version = versions[VOTERS]
+            self.seq = versions[VOTER_CHANGES]
+            self.epoch = versions[VOTERS_EPOCH]
+            self.ready = True
+
+    def refresh(self, db: Session, voter_ids: Sequence[int]):
+        """Re-read the given voters (dropping any that no longer exist)."""
+        if not self.ready or not voter_ids:
+            return
+        rows = db.query(*self._columns).filter(Voter.id.in_(list(voter_ids))).all()
+        with self._lock:
+            for voter_id in set(voter_ids) - {row[0] for row in rows}:
+                self._drop(voter_id)
+            for row in rows:
+                self._put(row)
+
+    def refresh_changed(self, db: Session):
+        """
+        Catch up with changes made by any process: voters written since the
+        index's VOTER_CHANGES number (imports, voted imports, contact edits
+        all number the rows they write) are re-read, through the change
+        order index. Deleting every voter moves the epoch instead, which
+        reloads the index.
+        """
+        if not self.ready:
+            return
+        versions = self._versions(db)
+        if versions[VOTERS_EPOCH] != self.epoch:
+            self.load(db)
+            return
+
+        high = versions[VOTER_CHANGES]
+        after = None
+        while True:
+            query = db.query(*self._columns, Voter.change_seq).filter(
+                Voter.change_seq > self.seq, Voter.change_seq <= high
+            )
+            if after is not None:
+                query = query.filter(tuple_(Voter.change_seq, Voter.id) > tuple_(*after))
+            rows = query.order_by(Voter.change_seq, Voter.id).limit(LOAD_BATCH_SIZE).all()
+            if not rows:
+                break
+            with self._lock:
+                for row in rows:
+                    self._put(row[:-1])
+            after = (rows[-1][-1], rows[-1][0])
+
+        with self._lock:
+            self.seq = max(self.seq, high)
+            self.version = versions[VOTERS]
+
+    def _refresh_in_background(self):
+        db = SessionLocal()
+        try:
+            self.refresh_changed(db)
+        except Exception:
+            logger.exception("Could not refresh the in-memory voter search index")
+        finally:
+            db.close()
+            with self._lock:
+                self._refreshing = False
+
+    def is_current(self, version: int) -> bool:
+        """
+        Whether the index reflects voters data version `version`. When it
+        does not (another process imported or edited voters) a background
+        refresh_changed() is started and the caller should search in SQL
+        meanwhile.
+        """
+        if not self.ready:
+            return False
+        with self._lock:
+            if self.version == version:
+                return True
+            if self._refreshing:
+                return False
+            self._refreshing = True
+        threading.Thread(target=self._refresh_in_background, name="search-index-refresh", daemon=True).start()
+        return False
+
+    def clear(self):
+        with self._lock:
+            self._partitions, self._docs = {}, {}
+
+    # -------------------------------------------------
+    # Searching
+    # -------------------------------------------------
+    def search(
+        self,
+        terms: List[str],
+        counties: Optional[Sequence[str]],
+        limit: int,
+        offset: int = 0,
+        after: Optional[SortKey] = None,
+    ) -> List[int]:
+        """
+        Ids of matching voters in (last_name, first_name, id) order, starting
+        after the `after` key (or skipping `offset` matches). `counties=None`
+        searches every county.
+        """
+        prefixed = prefix_terms(terms)
+        if prefixed:
+            wanted = [(t, True) for t in prefixed]
+        else:
+            # plainto_tsquery semantics: exact words
+            wanted = [(t, False) for t in tokenize(" ".join(terms))]
+        if not wanted:
+            return []
+
+        with self._lock:
+            names = self._partitions.keys() if counties is None else [c for c in counties if c in self._partitions]
+            hits: List[SortKey] = []
+            for name in names:
+                partition = self._partitions[name]
+                matched: Optional[Set[int]] = None
+                for term, prefix in wanted:
+                    ids = partition.matching(term, prefix)
+                    matched = ids if matched is None else matched & ids
+                    if not matched:
+                        break
+                if matched:
+                    hits.extend(self._docs[i][1] for i in matched)
+
+        if after is not None:
+            hits = [key for key in hits if key > after]
+        return [key[2] for key in heapq.nsmallest(offset + limit, hits)[offset:]]
+
+
+search_index = VoterSearchIndex()
+
+
+def _load_in_background():
+    db = SessionLocal()
+    try:
+        search_index.load(db)
+        logger.info("In-memory voter search index loaded (%d voters)", len(search_index._docs))
+    except Exception:
+        logger.exception("Could not load the in-memory voter search index; using SQL search")
+    finally:
+        db.close()
+
+
+def start_search_index():
+    """
+    Load the in-memory index at startup when SEARCH_INDEX_IN_MEMORY is set.
+    Loading happens in a background thread; search_voters keeps using SQL
+    until the index is ready.
+    """
+    if SEARCH_INDEX_IN_MEMORY:
+        threading.Thread(target=_load_in_background, name="search-index-load", daemon=True).start()
@@ -0,0 +1,153 @@
+# backend/app/suggest_index.py
+
+import heapq
+import logging
+import re
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .data_version import VOTER_FILE, get_data_version
+from .database import SessionLocal
+from .models import Voter
+
+logger = logging.getLogger(__name__)
+
+SUGGEST_KINDS = ("first_name", "last_name", "street")
+
+_HOUSE_NUMBER_RE = re.compile(r"^(?:\S*\d\S*\s+)+")
+
+
+def normalize(value: Optional[str]) -> str:
+    return " ".join(value.lower().split()) if value else ""
+
+
+def street_of(address: Optional[str]) -> str:
+    """'123 Main St' -> 'main st': the address without its leading house number."""
+    return _HOUSE_NUMBER_RE.sub("", normalize(address))
+
+
+class _Completions:
+    """
+    Sorted arrays for one county and kind: normalized keys (searched with
+    bisect), and the display text and voter count for each key.
+    """
+
+    __slots__ = ("keys", "texts", "counts")
+
+    def __init__(self, entries: Dict[str, Tuple[str, int]]):
+        self.keys = sorted(entries)
+        self.texts = [entries[k][0] for k in self.keys]
+        self.counts = [entries[k][1] for k in self.keys]
+
+    def prefixed(self, prefix: str):
+        i = bisect_left(self.keys, prefix)
+        while i < len(self.keys) and self.keys[i].startswith(prefix):
+            yield self.keys[i], self.texts[i], self.counts[i]
+            i += 1
+
+
+class SuggestIndex:
+    """
+    Per-county prefix index of first names, last names and street names for
+    as-you-type suggestions. Built from a few grouped queries and swapped in
+    whole; it rebuilds in the background when the voter file data version moves.
+    """
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self._counties: Dict[str, Dict[str, _Completions]] = {}
+        self._lock = threading.Lock()
+        self._building = False
+
+    def _grouped(self, db: Session, kind: str):
+        if kind == "street":
+            counts: Dict[Tuple[str, str], Tuple[str, int]] = {}
+            rows = db.query(Voter.county, Voter.address, func.count(Voter.id)).group_by(Voter.county, Voter.address)
+            for county, address, n in rows:
+                key = street_of(address)
+                if key:
+                    text, total = counts.get((county or "", key), (address, 0))
+                    counts[(county or "", key)] = (text, total + n)
+            # Display the street as typed in the file, minus the house number
+            return {k: (_HOUSE_NUMBER_RE.sub("", " ".join(v[0].split())), v[1]) for k, v in counts.items()}
+
+        col = getattr(Voter, kind)
+        key = func.lower(col)
+        rows = db.query(Voter.county, key, func.max(col), func.count(Voter.id)).group_by(Voter.county, key)
+        out: Dict[Tuple[str, str], Tuple[str, int]] = {}
+        for county, lowered, text, n in rows:
+            norm = normalize(lowered)
+            if norm:
+                old = out.get((county or "", norm), (text, 0))
+                out[(county or "", norm)] = (old[0], old[1] + n)
+        return out
+
+    def build(self, db: Session):
+        version = get_data_version(db, VOTER_FILE)
+        counties: Dict[str, Dict[str, Dict[str, Tuple[str, int]]]] = {}
+        for kind in SUGGEST_KINDS:
+            for (county, key), entry in self._grouped(db, kind).items():
+                counties.setdefault(county, {}).setdefault(kind, {})[key] = entry
+
+        built = {
+            county: {kind: _Completions(entries) for kind, entries in kinds.items()}
+            for county, kinds in counties.items()
+        }
+        with self._lock:
+            self._counties = built
+            self.version = version
+
+    def _rebuild(self):
+        db = SessionLocal()
+        try:
+            self.build(db)
+        except Exception:
+            logger.exception("Could not build the voter suggestion index")
+        finally:
+            db.close()
+            with self._lock:
+                self._building = False
+
+    def start_rebuild(self, stale_unless: Optional[int] = None):
+        """
+        Rebuild in a background thread, unless one is already running or the
+        index was built from data version `stale_unless`.
+        """
+        with self._lock:
+            if self._building or (stale_unless is not None and self.version == stale_unless):
+                return
+            self._building = True
+        threading.Thread(target=self._rebuild, name="suggest-index-build", daemon=True).start()
+
+    def suggest(self, prefix: str, counties: Optional[Sequence[str]], limit: int) -> List[dict]:
+        """
+        The `limit` most common completions of `prefix` across the given
+        counties (all counties when None), most voters first.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        with self._lock:
+            index = self._counties
+        names = index.keys() if counties is None else [c for c in counties if c in index]
+
+        merged: Dict[Tuple[str, str], List] = {}
+        for county in names:
+            for kind, completions in index[county].items():
+                for key, text, count in completions.prefixed(prefix):
+                    entry = merged.get((kind, key))
+                    if entry is None:
+                        merged[(kind, key)] = [text, count]
+                    else:
+                        entry[1] += count
+
+        best = heapq.nsmallest(limit, merged.items(), key=lambda item: (-item[1][1], item[0][1], item[0][0]))
+        return [{"text": text, "kind": kind, "count": count} for (kind, _), (text, count) in best]
+
+
+suggest_index = SuggestIndex()
@@ -0,0 +1,86 @@
+# backend/app/sync_history.py
+
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from .data_version import TAG_HISTORY_PRUNED, VOTER_HISTORY_PRUNED, get_data_versions
+from .database import SessionLocal
+from .models import DataVersion, TagDeletion, VoterMove
+
+logger = logging.getLogger(__name__)
+
+# County moves and untaggings are kept this long for /sync/changes. A client
+# that has not synced for longer gets a reset instead of what it missed.
+SYNC_HISTORY_DAYS = float(os.getenv("SYNC_HISTORY_DAYS", "30"))
+
+# How often each worker process prunes older history.
+SYNC_HISTORY_PRUNE_SECONDS = 3600
+
+
+def _raise_horizon(db: Session, name: str, seq: int):
+    # Only ever moves forward, so concurrent prunes in several processes agree
+    raised = db.execute(
+        update(DataVersion)
+        .where(DataVersion.name == name, DataVersion.version < seq)
+        .values(version=seq)
+    ).rowcount
+    if not raised and db.query(DataVersion.name).filter(DataVersion.name == name).first() is None:
+        db.add(DataVersion(name=name, version=seq))
+        db.flush()
+
+
+def prune_sync_history(db: Session, now: Optional[float] = None) -> int:
+    """
+    Delete VoterMove and TagDeletion rows older than SYNC_HISTORY_DAYS and
+    record the highest change_seq deleted under VOTER_HISTORY_PRUNED /
+    TAG_HISTORY_PRUNED: a sync cursor from before it may have missed one,
+    so /sync/changes resets it. Returns how many rows were deleted. The
+    caller owns the transaction.
+    """
+    cutoff = (now or time.time()) - SYNC_HISTORY_DAYS * 86400
+    deleted = 0
+    for model, counter in ((VoterMove, VOTER_HISTORY_PRUNED), (TagDeletion, TAG_HISTORY_PRUNED)):
+        # Rows from before created_at existed count as old
+        horizon = (
+            db.query(func.max(model.change_seq))
+            .filter((model.created_at < cutoff) | model.created_at.is_(None))
+            .scalar()
+        )
+        if horizon is None:
+            continue
+        _raise_horizon(db, counter, horizon)
+        deleted += db.query(model).filter(model.change_seq <= horizon).delete(synchronize_session=False)
+    return deleted
+
+
+def _prune_loop():
+    while True:
+        db = SessionLocal()
+        try:
+            deleted = prune_sync_history(db)
+            db.commit()
+            if deleted:
+                logger.info("Pruned %d sync history rows", deleted)
+        except Exception:
+            db.rollback()
+            logger.warning("Could not prune sync history", exc_info=True)
+        finally:
+            db.close()
+        time.sleep(SYNC_HISTORY_PRUNE_SECONDS)
+
+
+def start_sync_history_pruning():
+    """Prune now and then every SYNC_HISTORY_PRUNE_SECONDS, in a background thread."""
+    threading.Thread(target=_prune_loop, name="sync-history-prune", daemon=True).start()
+
+
+def history_pruned_past(db: Session, voters_after: int, tags_after: int) -> bool:
+    """Whether moves or untaggings after these cursor positions may have been pruned."""
+    pruned = get_data_versions(db, (VOTER_HISTORY_PRUNED, TAG_HISTORY_PRUNED))
+    return 0 <= voters_after < pruned[VOTER_HISTORY_PRUNED] or 0 <= tags_after < pruned[TAG_HISTORY_PRUNED]
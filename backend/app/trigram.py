@@ -0,0 +1,163 @@
+# backend/app/trigram.py
+
+import logging
+from typing import List
+
+from sqlalchemy import Float, cast, func, literal_column, select, table, column, text
+from sqlalchemy.engine import Engine
+
+from .models import Voter
+from .search_backend import create_fts5_mirror
+
+logger = logging.getLogger(__name__)
+
+# Columns searchable through the field-specific branch of search_voters.
+TRIGRAM_COLUMNS = (
+    "first_name",
+    "last_name",
+    "address",
+    "city",
+    "state",
+    "zip_code",
+    "registered_party",
+    "phone",
+    "email",
+    "voter_id",
+    "county",
+    "precinct",
+)
+
+# SQLite side table: an FTS5 index with the trigram tokenizer over the voters
+# columns above (see search_backend.create_fts5_mirror).
+SQLITE_TRIGRAM_TABLE = "voters_trgm"
+
+# Trigram indexes cannot help with terms shorter than one trigram.
+MIN_TRIGRAM_TERM = 3
+
+_enabled = False
+
+
+def _index_name(column_name: str) -> str:
+    return f"ix_voters_{column_name}_trgm"
+
+
+def _missing_postgres_indexes(conn) -> List[str]:
+    """TRIGRAM_COLUMNS without a valid trigram index (a failed concurrent build leaves an invalid one)."""
+    valid = {
+        row[0]
+        for row in conn.execute(
+            text(
+                "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE i.indrelid = 'voters'::regclass AND i.indisvalid"
+            )
+        )
+    }
+    return [name for name in TRIGRAM_COLUMNS if _index_name(name) not in valid]
+
+
+def _ensure_postgres(conn):
+    # The indexes themselves are built by build_postgres_indexes(), outside
+    # the app: building them here would block writes to voters at startup
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    missing = _missing_postgres_indexes(conn)
+    if missing:
+        logger.warning(
+            "%d trigram indexes missing (%s); substring search scans voters until "
+            "`python -m app.trigram` has built them",
+            len(missing),
+            ", ".join(missing),
+        )
+
+
+def build_postgres_indexes(engine: Engine):
+    """
+    Build the missing pg_trgm GIN indexes with CREATE INDEX CONCURRENTLY, so
+    voters stays writable while they build. Run once per database (and again
+    after adding a column to TRIGRAM_COLUMNS), not from the app:
+
+        cd backend && python -m app.trigram
+
+    An index left invalid by an interrupted build is dropped and rebuilt.
+    """
+    # CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for name in _missing_postgres_indexes(conn):
+            index = _index_name(name)
+            logger.info("Building %s", index)
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index}"))
+            # gin_trgm_ops serves LIKE/ILIKE '%term%' as well as the % similarity operator
+            conn.execute(text(f"CREATE INDEX CONCURRENTLY {index} ON voters USING gin ({name} gin_trgm_ops)"))
+
+
+def _ensure_sqlite(conn):
+    create_fts5_mirror(conn, SQLITE_TRIGRAM_TABLE, TRIGRAM_COLUMNS, "tokenize='trigram'")
+
+
+def ensure_trigram_indexes(engine: Engine):
+    """
+    Set up substring search on the voter columns: the pg_trgm extension on
+    Postgres (whose GIN indexes come from build_postgres_indexes), an FTS5
+    trigram side table on SQLite.
+
+    If the database cannot provide them (no permission to create the pg_trgm
+    extension, SQLite built without FTS5), search keeps using plain ILIKE.
+    """
+    global _enabled
+
+    setup = {"postgresql": _ensure_postgres, "sqlite": _ensure_sqlite}.get(engine.dialect.name)
+    if setup is None:
+        return
+
+    try:
+        with engine.begin() as conn:
+            setup(conn)
+    except Exception:
+        logger.warning("Trigram indexes unavailable; substring search will scan voters", exc_info=True)
+        return
+    _enabled = True
+
+
+def _fts5_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def substring_filter(dialect: str, col, terms: List[str]):
+    """
+    Every term must occur somewhere in `col` (case-insensitive).
+
+    On Postgres the ILIKE itself is served by the column's trigram index. On
+    SQLite the candidate rows come from the FTS5 trigram table and the ILIKE
+    re-checks them (and covers terms too short to have a trigram).
+    """
+    clause = [col.ilike(f"%{t}%") for t in terms]
+
+    long_terms = [t for t in terms if len(t) >= MIN_TRIGRAM_TERM]
+    if _enabled and dialect == "sqlite" and long_terms:
+        match = " AND ".join(f"{col.key} : {_fts5_phrase(t)}" for t in long_terms)
+        trgm = table(SQLITE_TRIGRAM_TABLE, column("rowid"))
+        candidates = select(trgm.c.rowid).where(literal_column(SQLITE_TRIGRAM_TABLE).op("MATCH")(match))
+        clause.insert(0, Voter.id.in_(candidates))
+
+    return clause
+
+
+def similarity(dialect: str, col, terms: List[str]):
+    """
+    Relevance of a substring match, higher is better: pg_trgm similarity() on
+    Postgres, otherwise the share of the value covered by the search terms
+    (an exact match scores 1, a short term inside a long address close to 0).
+    """
+    if dialect == "postgresql":
+        return func.similarity(col, " ".join(terms))
+    matched = sum(len(t) for t in terms)
+    return cast(matched, Float) / func.max(func.length(col), 1)
+
+
+if __name__ == "__main__":
+    from .database import engine
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("Trigram indexes are only built on Postgres (SQLite sets up its side table at startup)")
+    build_postgres_indexes(engine)
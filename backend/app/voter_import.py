@@ -0,0 +1,668 @@
+# backend/app/voter_import.py
+
+import csv
+import gzip
+import hashlib
+import io
+import logging
+import os
+import secrets
+import threading
+import time
+import uuid
+from collections import Counter
+from itertools import islice
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Column, MetaData, String, Table, bindparam, case, exists, func, insert, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from .data_version import VOTER_CHANGES, VOTER_FILE, bump_data_version, next_change_seq
+from .database import SessionLocal
+from .models import Voter, VoterMove
+from .phonetic import metaphone
+
+logger = logging.getLogger(__name__)
+
+# How many CSV rows are merged into a single INSERT ... ON CONFLICT batch.
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))
+
+# Header spellings we accept for the voter id column, in priority order.
+VOTER_ID_ALIASES = ("voter_id", "VoterID", "VOTER_ID")
+
+# Voter columns that are filled from the CSV (besides voter_id).
+VOTER_FIELDS = (
+    "first_name",
+    "last_name",
+    "address",
+    "city",
+    "state",
+    "zip_code",
+    "county",
+    "precinct",
+    "registered_party",
+    "phone",
+    "email",
+)
+
+# A parsed row is a plain tuple: (voter_id, *VOTER_FIELDS)
+VoterRow = Tuple[Optional[str], ...]
+
+_COUNTY = 1 + VOTER_FIELDS.index("county")
+
+
+def make_row_parser(header: Sequence[str]) -> Callable[[List[str]], Optional[VoterRow]]:
+    """
+    Build a function that turns a raw csv.reader row into a VoterRow.
+
+    Behaves like reading the row through csv.DictReader and calling
+    row.get(...) for each column: missing columns give None, and when a header
+    name is repeated the last column wins. Rows without a voter_id give None.
+    """
+    positions: Dict[str, int] = {}
+    for idx, name in enumerate(header):
+        positions[name] = idx
+
+    id_positions = [positions[a] for a in VOTER_ID_ALIASES if a in positions]
+    field_positions = [positions.get(f) for f in VOTER_FIELDS]
+
+    def parse(values: List[str]) -> Optional[VoterRow]:
+        n = len(values)
+        voter_id = None
+        for idx in id_positions:
+            if idx < n and values[idx]:
+                voter_id = values[idx]
+                break
+        if not voter_id:
+            return None
+        return (voter_id,) + tuple(
+            values[idx] if idx is not None and idx < n else None for idx in field_positions
+        )
+
+    return parse
+
+
+def is_csv_upload(filename: Optional[str]) -> bool:
+    return (filename or "").lower().endswith((".csv", ".csv.gz"))
+
+
+def open_csv_stream(fileobj: BinaryIO) -> io.TextIOWrapper:
+    """
+    Wrap a binary upload (spooled upload or file on disk) in an incremental
+    UTF-8 decoder so it can be parsed line by line without reading it into
+    memory. Gzip-compressed uploads are detected by their magic bytes and
+    decompressed on the fly.
+    """
+    magic = fileobj.read(2)
+    fileobj.seek(0)
+    if magic == b"\x1f\x8b":
+        fileobj = gzip.GzipFile(fileobj=fileobj, mode="rb")
+    return io.TextIOWrapper(fileobj, encoding="utf-8", errors="ignore", newline="")
+
+
+def iter_voter_rows(text_stream) -> Iterator[VoterRow]:
+    """
+    Parse a voter CSV (any file-like object yielding text lines) into VoterRows,
+    skipping blank lines and rows without a voter_id.
+    """
+    reader = csv.reader(text_stream)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    yield from parse_records(reader, header)
+
+
+def parse_records(records: Iterable[List[str]], header: Sequence[str]) -> Iterator[VoterRow]:
+    """Turn csv.reader records (header already consumed) into VoterRows."""
+    parse = make_row_parser(header)
+    for values in records:
+        if not values:
+            continue
+        row = parse(values)
+        if row is not None:
+            yield row
+
+
+def chunked(rows: Iterable, size: int) -> Iterator[list]:
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def dialect_insert(db: Session):
+    """
+    Return the dialect-specific insert() construct, which supports
+    ON CONFLICT clauses on both Postgres and SQLite.
+    """
+    name = db.get_bind().dialect.name
+    if name == "postgresql":
+        return pg_insert
+    if name == "sqlite":
+        return sqlite_insert
+    raise RuntimeError(f"Bulk voter import is not supported on the '{name}' database")
+
+
+def row_fingerprint(row: Sequence[Optional[str]]) -> str:
+    """
+    Content fingerprint of a VoterRow's CSV fields (voter_id excluded).
+    Empty and missing values hash the same, since neither overwrites anything.
+    Must stay in sync with _SQL_FINGERPRINT used by the COPY path.
+    """
+    payload = "\x1f".join(v or "" for v in row[1:])
+    return hashlib.md5(payload.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def _merge_duplicates(rows: Iterable[VoterRow]) -> Tuple[Dict[str, list], Dict[str, int]]:
+    """
+    Collapse rows sharing a voter_id into one, as if they had been applied one
+    after another: a later non-empty value overwrites an earlier one.
+    Returns the merged rows (in first-seen order) and how many CSV rows each
+    voter_id had.
+    """
+    merged: Dict[str, list] = {}
+    occurrences: Dict[str, int] = {}
+    for row in rows:
+        current = merged.get(row[0])
+        if current is None:
+            merged[row[0]] = list(row)
+            occurrences[row[0]] = 1
+            continue
+        occurrences[row[0]] += 1
+        for i in range(1, len(row)):
+            if row[i]:
+                current[i] = row[i]
+    return merged, occurrences
+
+
+def upsert_voter_chunk(
+    db: Session, rows: Iterable[VoterRow], change_seq: Optional[int] = None
+) -> Tuple[int, int, int, Counter]:
+    """
+    Insert or update a chunk of voters with a single INSERT ... ON CONFLICT
+    (voter_id) DO UPDATE statement. Written rows get `change_seq`.
+
+    Existing voters only have a column overwritten when the CSV value is
+    non-empty, and voters whose stored row_fingerprint matches the incoming
+    row are not written at all. Voters moved to another county get a
+    VoterMove with the same `change_seq`. Returns (imported, updated,
+    unchanged) counted per CSV row: the first row for an unknown voter_id is
+    an import; and the change in voters per county ("" for none) from new
+    voters and moves, for apply_county_deltas.
+    """
+    county_deltas: Counter = Counter()
+    merged, occurrences = _merge_duplicates(rows)
+    if not merged:
+        return 0, 0, 0, county_deltas
+
+    existing = {
+        voter_id: (fingerprint, county, pk)
+        for voter_id, fingerprint, county, pk in db.query(
+            Voter.voter_id, Voter.row_fingerprint, Voter.county, Voter.id
+        )
+        .filter(Voter.voter_id.in_(list(merged.keys())))
+        .all()
+    }
+
+    imported = 0
+    updated = 0
+    unchanged = 0
+    values = []
+    moves = []
+    for voter_id, row in merged.items():
+        fingerprint = row_fingerprint(row)
+        if voter_id not in existing:
+            imported += 1
+            updated += occurrences[voter_id] - 1
+            county_deltas[row[_COUNTY] or ""] += 1
+        elif existing[voter_id][0] == fingerprint:
+            unchanged += occurrences[voter_id]
+            continue
+        else:
+            updated += occurrences[voter_id]
+            old_county = existing[voter_id][1] or ""
+            new_county = row[_COUNTY] or old_county
+            if new_county != old_county:
+                county_deltas[old_county] -= 1
+                county_deltas[new_county] += 1
+                moves.append({"voter_id": existing[voter_id][2], "county": old_county})
+
+        item = {"voter_id": voter_id, "row_fingerprint": fingerprint}
+        for i, name in enumerate(VOTER_FIELDS, start=1):
+            item[name] = row[i]
+        item["first_name"] = item["first_name"] or ""
+        item["last_name"] = item["last_name"] or ""
+        item["first_name_key"] = metaphone(item["first_name"])
+        item["last_name_key"] = metaphone(item["last_name"])
+        item["change_seq"] = change_seq
+        values.append(item)
+
+    if not values:
+        return imported, updated, unchanged, county_deltas
+
+    # Executed as one executemany: the statement compiles once (and is cached),
+    # and psycopg2 sends the whole chunk as a batched multi-row VALUES insert.
+    table = Voter.__table__
+    stmt = dialect_insert(db)(table)
+    set_ = {
+        name: func.coalesce(func.nullif(stmt.excluded[name], ""), table.c[name])
+        for name in VOTER_FIELDS
+    }
+    for name in ("first_name", "last_name"):
+        # the key follows the name: kept when the CSV name is empty (and so is the name)
+        set_[f"{name}_key"] = case(
+            (func.nullif(stmt.excluded[name], "").is_(None), table.c[f"{name}_key"]),
+            else_=stmt.excluded[f"{name}_key"],
+        )
+    set_["row_fingerprint"] = stmt.excluded.row_fingerprint
+    set_["change_seq"] = stmt.excluded.change_seq
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.voter_id],
+        set_=set_,
+        where=table.c.row_fingerprint.is_distinct_from(stmt.excluded.row_fingerprint),
+    )
+    db.execute(stmt, values)
+    if moves:
+        now = time.time()
+        for move in moves:
+            move.update(change_seq=change_seq, created_at=now)
+        db.execute(insert(VoterMove.__table__), moves)
+
+    return imported, updated, unchanged, county_deltas
+
+
+def pending_change_seq() -> int:
+    """
+    Placeholder change_seq for the rows one import writes, replaced by
+    stamp_change_seq() just before the commit. Negative, so it is never
+    taken for a real change, and random, so concurrent imports do not mix.
+    """
+    return -1 - secrets.randbelow(2**31 - 1)
+
+
+def stamp_change_seq(db: Session, pending: int):
+    """
+    Give the voters and moves written with the `pending` placeholder one
+    real VOTER_CHANGES number. Taking it locks the counter row until the
+    commit (see next_change_seq), blocking contact edits, so call this last.
+    """
+    seq = next_change_seq(db, VOTER_CHANGES)
+    for model in (Voter, VoterMove):
+        db.query(model).filter(model.change_seq == pending).update(
+            {model.change_seq: seq}, synchronize_session=False
+        )
+
+
+def import_voter_rows(
+    db: Session,
+    rows: Iterable[VoterRow],
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    change_seq: Optional[int] = None,
+) -> Tuple[dict, Counter]:
+    """
+    Apply parsed voter rows chunk by chunk; written rows get `change_seq`.
+    Returns the counts and the per-county deltas (see upsert_voter_chunk).
+    The caller owns the transaction.
+    """
+    imported = 0
+    updated = 0
+    unchanged = 0
+    county_deltas: Counter = Counter()
+
+    for chunk in chunked(rows, chunk_size):
+        chunk_imported, chunk_updated, chunk_unchanged, chunk_deltas = upsert_voter_chunk(db, chunk, change_seq)
+        imported += chunk_imported
+        updated += chunk_updated
+        unchanged += chunk_unchanged
+        county_deltas.update(chunk_deltas)
+
+    result = {
+        "imported": imported,
+        "updated": updated,
+        "unchanged": unchanged,
+    }
+    return result, county_deltas
+
+
+# -----------------------------------------------------
+# Postgres COPY fast path
+# -----------------------------------------------------
+def supports_copy(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _copy_text(value: Optional[str]) -> str:
+    """Escape a value for COPY ... FROM STDIN text format (NULL is \\N)."""
+    if value is None:
+        return "\\N"
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class _CopyFeed:
+    """
+    Minimal file-like object for cursor.copy_expert(): renders VoterRows as
+    COPY text-format lines on demand instead of building the whole payload.
+    """
+
+    def __init__(self, rows: Iterable[VoterRow]):
+        self._lines = (
+            f"{line_no}\t" + "\t".join(_copy_text(v) for v in row) + "\n"
+            for line_no, row in enumerate(rows, start=1)
+        )
+        self._pending = ""
+
+    def read(self, size: int = -1) -> str:
+        parts = [self._pending]
+        length = len(self._pending)
+        for line in self._lines:
+            parts.append(line)
+            length += len(line)
+            if 0 <= size <= length:
+                break
+        data = "".join(parts)
+        if size < 0:
+            self._pending = ""
+            return data
+        self._pending = data[size:]
+        return data[:size]
+
+
+def _last_non_empty(col: str) -> str:
+    # Same merge rule as _merge_duplicates: the last non-empty value wins,
+    # otherwise keep whatever the first row had ('' or NULL).
+    return (
+        f"COALESCE((array_agg({col} ORDER BY line_no DESC) FILTER (WHERE {col} <> ''))[1], "
+        f"(array_agg({col} ORDER BY line_no))[1]) AS {col}"
+    )
+
+
+# SQL twin of row_fingerprint(): md5 over the UTF-8 text of the fields joined by \x1f.
+_SQL_FINGERPRINT = (
+    "md5(concat_ws(chr(31), " + ", ".join(f"COALESCE({c}, '')" for c in VOTER_FIELDS) + "))"
+)
+
+
+def copy_import_voter_rows(
+    db: Session, rows: Iterable[VoterRow], change_seq: Optional[int] = None
+) -> Tuple[dict, Counter]:
+    """
+    Full-refresh import for Postgres: stream rows into an UNLOGGED staging table
+    with COPY FROM STDIN, collapse duplicate voter_ids into a second unlogged
+    table, then merge into voters with one INSERT ... SELECT ... ON CONFLICT
+    statement that skips rows whose fingerprint is unchanged. Same column
+    semantics, counts and county deltas as import_voter_rows. Both tables
+    live inside the caller's transaction.
+    """
+    staging = f"voter_import_staging_{uuid.uuid4().hex[:12]}"
+    merged = f"{staging}_merged"
+    columns = ("voter_id",) + VOTER_FIELDS
+
+    db.execute(
+        text(
+            f"CREATE UNLOGGED TABLE {staging} (line_no bigint NOT NULL, "
+            + ", ".join(f"{c} text" for c in columns)
+            + ")"
+        )
+    )
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {staging} (line_no, {', '.join(columns)}) FROM STDIN",
+            _CopyFeed(rows),
+        )
+        row_count = cursor.rowcount
+    finally:
+        cursor.close()
+
+    db.execute(
+        text(
+            f"CREATE UNLOGGED TABLE {merged} AS "
+            f"SELECT voter_id, n_rows, {_SQL_FINGERPRINT} AS row_fingerprint, "
+            f"{', '.join(VOTER_FIELDS)} FROM ("
+            f"SELECT voter_id, count(*) AS n_rows, "
+            f"{', '.join(_last_non_empty(c) for c in VOTER_FIELDS)} "
+            f"FROM {staging} GROUP BY voter_id"
+            ") grouped"
+        )
+    )
+    db.execute(text(f"DROP TABLE {staging}"))
+    db.execute(text(f"ANALYZE {merged}"))
+
+    counts = db.execute(
+        text(
+            "SELECT "
+            "COALESCE(sum(CASE WHEN v.id IS NULL THEN 1 ELSE 0 END), 0), "
+            "COALESCE(sum(CASE WHEN v.row_fingerprint = m.row_fingerprint THEN m.n_rows ELSE 0 END), 0) "
+            f"FROM {merged} m LEFT JOIN voters v ON v.voter_id = m.voter_id"
+        )
+    ).one()
+    imported, unchanged = int(counts[0]), int(counts[1])
+
+    # New voters and county moves, read before the merge below changes the rows
+    county_deltas: Counter = Counter()
+    groups = db.execute(
+        text(
+            "SELECT v.id IS NULL, COALESCE(v.county, ''), COALESCE(NULLIF(m.county, ''), v.county, ''), count(*) "
+            f"FROM {merged} m LEFT JOIN voters v ON v.voter_id = m.voter_id "
+            "WHERE v.id IS NULL OR (v.row_fingerprint IS DISTINCT FROM m.row_fingerprint "
+            "AND NULLIF(m.county, '') IS NOT NULL AND m.county <> COALESCE(v.county, '')) "
+            "GROUP BY 1, 2, 3"
+        )
+    ).all()
+    moved = False
+    for is_new, old_county, new_county, n in groups:
+        if not is_new:
+            county_deltas[old_county] -= n
+            moved = True
+        county_deltas[new_county] += n
+    if moved:
+        # One VoterMove per voter leaving a county, as in upsert_voter_chunk
+        db.execute(
+            text(
+                "INSERT INTO voter_moves (voter_id, county, change_seq, created_at) "
+                "SELECT v.id, COALESCE(v.county, ''), :change_seq, :now "
+                f"FROM {merged} m JOIN voters v ON v.voter_id = m.voter_id "
+                "WHERE v.row_fingerprint IS DISTINCT FROM m.row_fingerprint "
+                "AND NULLIF(m.county, '') IS NOT NULL AND m.county <> COALESCE(v.county, '')"
+            ),
+            {"change_seq": change_seq, "now": time.time()},
+        )
+
+    insert_values = ", ".join(
+        f"COALESCE({c}, '')" if c in ("first_name", "last_name") else c for c in VOTER_FIELDS
+    )
+    db.execute(
+        text(
+            f"INSERT INTO voters (voter_id, {', '.join(VOTER_FIELDS)}, row_fingerprint, has_voted, change_seq) "
+            f"SELECT voter_id, {insert_values}, row_fingerprint, false, :change_seq FROM {merged} "
+            "ON CONFLICT (voter_id) DO UPDATE SET "
+            + ", ".join(
+                f"{c} = COALESCE(NULLIF(EXCLUDED.{c}, ''), voters.{c})" for c in VOTER_FIELDS
+            )
+            + ", row_fingerprint = EXCLUDED.row_fingerprint"
+            + ", change_seq = EXCLUDED.change_seq"
+            # Phonetic keys are computed in Python: clear them when a name changes
+            # and let backfill_phonetic_keys() below fill them in.
+            + "".join(
+                f", {c}_key = CASE WHEN NULLIF(EXCLUDED.{c}, '') IS NULL THEN voters.{c}_key END"
+                for c in ("first_name", "last_name")
+            )
+            + " WHERE voters.row_fingerprint IS DISTINCT FROM EXCLUDED.row_fingerprint"
+        ),
+        {"change_seq": change_seq},
+    )
+    db.execute(text(f"DROP TABLE {merged}"))
+    backfill_phonetic_keys(db)
+
+    result = {
+        "imported": imported,
+        "updated": row_count - imported - unchanged,
+        "unchanged": unchanged,
+    }
+    return result, county_deltas
+
+
+def backfill_phonetic_keys(
+    db: Session,
+    batch_size: int = IMPORT_CHUNK_SIZE,
+    max_rows: Optional[int] = None,
+) -> int:
+    """
+    Fill first_name_key / last_name_key on voters that have none yet (rows
+    from before the keys existed, or whose names the COPY import changed).
+    Stops after about max_rows when given. The caller owns the transaction.
+    Returns the number of voters updated.
+    """
+    table = Voter.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("voter_pk"))
+        .values(first_name_key=bindparam("fkey"), last_name_key=bindparam("lkey"))
+    )
+    missing = or_(Voter.first_name_key.is_(None), Voter.last_name_key.is_(None))
+
+    done = 0
+    last_id = 0
+    while True:
+        batch = (
+            db.query(Voter.id, Voter.first_name, Voter.last_name)
+            .filter(missing, Voter.id > last_id)
+            .order_by(Voter.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch or (max_rows is not None and done >= max_rows):
+            return done
+        db.execute(
+            stmt,
+            [{"voter_pk": i, "fkey": metaphone(first), "lkey": metaphone(last)} for i, first, last in batch],
+        )
+        done += len(batch)
+        last_id = batch[-1][0]
+
+
+def _backfill_phonetic_keys_job():
+    db = SessionLocal()
+    try:
+        total = 0
+        while True:
+            done = backfill_phonetic_keys(db, max_rows=50 * IMPORT_CHUNK_SIZE)
+            db.commit()
+            total += done
+            if not done:
+                break
+        if total:
+            logger.info("Backfilled phonetic keys for %d voters", total)
+    except Exception:
+        db.rollback()
+        logger.exception("Phonetic key backfill failed")
+    finally:
+        db.close()
+
+
+def start_phonetic_backfill():
+    """
+    Compute missing phonetic keys in a background thread, committing as it
+    goes, so a large voter table does not hold up startup.
+    """
+    threading.Thread(target=_backfill_phonetic_keys_job, name="phonetic-backfill", daemon=True).start()
+
+
+def apply_voter_import(db: Session, rows: Iterable[VoterRow], mode: str = "upsert") -> dict:
+    """
+    Run a voter import in the requested mode ("upsert" or "copy"). Rows are
+    written with a placeholder change_seq and numbered at the end, so the
+    VOTER_CHANGES counter is only locked from then until the commit.
+    """
+    pending = pending_change_seq()
+    if mode == "copy" and supports_copy(db):
+        result, county_deltas = copy_import_voter_rows(db, rows, pending)
+    else:
+        result, county_deltas = import_voter_rows(db, rows, change_seq=pending)
+    if result["imported"] or result["updated"]:
+        # imported here to avoid a circular import (county_counts uses dialect_insert)
+        from .county_counts import apply_county_deltas
+
+        apply_county_deltas(db, county_deltas)
+        bump_data_version(db)
+        bump_data_version(db, VOTER_FILE)
+        stamp_change_seq(db, pending)
+    return result
+
+
+# -----------------------------------------------------
+# Voted files
+# -----------------------------------------------------
+def iter_voted_ids(text_stream) -> Iterator[str]:
+    """Yield the voter_id of every row in a voted CSV."""
+    for row in iter_voter_rows(text_stream):
+        yield row[0]
+
+
+# Per-connection scratch table the voted ids are loaded into. It is kept out
+# of Base.metadata so create_all() never creates it as a real table.
+_voted_ids = Table(
+    "voted_import_ids",
+    MetaData(),
+    Column("voter_id", String, primary_key=True),
+    prefixes=["TEMPORARY"],
+)
+
+
+def apply_voted_ids(db: Session, voter_ids: Iterable[str]) -> dict:
+    """
+    Mark the given voters as having voted using set-based statements: the ids
+    are bulk-loaded into a temp table, then one UPDATE ... FROM join flips
+    has_voted and one anti-join counts the ids that match no voter.
+    Counts are per distinct voter_id. The caller owns the transaction.
+    """
+    table = Voter.__table__
+    ids = _voted_ids
+
+    ids.drop(db.connection(), checkfirst=True)
+    ids.create(db.connection())
+
+    load = dialect_insert(db)(ids).on_conflict_do_nothing(index_elements=[ids.c.voter_id])
+    for chunk in chunked(voter_ids, IMPORT_CHUNK_SIZE):
+        db.execute(load, [{"voter_id": voter_id} for voter_id in chunk])
+
+    if supports_copy(db):
+        # Give the planner real row counts for the join below.
+        db.execute(text(f"ANALYZE {ids.name}"))
+
+    total = db.execute(select(func.count()).select_from(ids)).scalar()
+    not_found = db.execute(
+        select(func.count())
+        .select_from(ids)
+        .where(~exists().where(table.c.voter_id == ids.c.voter_id))
+    ).scalar()
+
+    newly_voted = db.execute(
+        update(table)
+        .where(table.c.voter_id == ids.c.voter_id)
+        .where(or_(table.c.has_voted.is_(False), table.c.has_voted.is_(None)))
+        .values(has_voted=True, change_seq=next_change_seq(db, VOTER_CHANGES))
+    ).rowcount
+
+    ids.drop(db.connection())
+    if newly_voted:
+        bump_data_version(db)
+
+    matched = total - not_found
+    return {
+        "updated_voted": matched,
+        "newly_voted": newly_voted,
+        "already_voted": matched - newly_voted,
+        "not_found": not_found,
+    }
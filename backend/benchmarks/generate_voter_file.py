@@ -0,0 +1,214 @@
+# backend/benchmarks/generate_voter_file.py
+"""
+Synthetic voter files for benchmarking.
+
+Generates a voter CSV with realistic-looking names and addresses, skewed
+(Zipf-like) county and precinct sizes, and a randomly chosen voter id header
+alias / column order, plus a matching "voted" file.
+
+    cd backend
+    python -m benchmarks.generate_voter_file --rows 100000 --out /tmp/voters.csv \
+        --voted-out /tmp/voted.csv
+"""
+
+import argparse
+import csv
+import gzip
+import random
+from itertools import accumulate
+from typing import List, Optional, Sequence, Tuple
+
+VOTER_ID_ALIASES = ("voter_id", "VoterID", "VOTER_ID")
+
+FIRST_NAMES = (
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda",
+    "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+    "Thomas", "Sarah", "Charles", "Karen", "Christopher", "Lisa", "Daniel", "Nancy",
+    "Matthew", "Betty", "Anthony", "Margaret", "Mark", "Sandra", "Donald", "Ashley",
+    "Steven", "Kimberly", "Paul", "Emily", "Andrew", "Donna", "Joshua", "Michelle",
+    "Katherine", "Catherine", "Jon", "Jonathan", "Maria", "Jose", "Luis", "Ana",
+)
+
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson",
+    "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee", "Perez", "Thompson",
+    "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson", "Walker",
+    "Young", "Allen", "King", "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores",
+    "Green", "Adams", "Nelson", "Baker", "Hall", "Rivera", "Campbell", "Mitchell",
+    "Carter", "Roberts", "Jonson", "Van Buren", "De La Cruz", "O'Brien", "Purdy",
+)
+
+STREETS = (
+    "Main St", "Oak Ave", "Maple Dr", "Cedar Ln", "Pine St", "Elm St", "Washington Blvd",
+    "Lake Rd", "Hill St", "Atlantic Ave", "Park Pl", "Sunset Dr", "River Rd",
+    "Church St", "Highland Ave", "Mill Rd", "Spring St", "Forest Ave", "Union St",
+)
+
+CITIES = (
+    "Springfield", "Riverside", "Franklin", "Greenville", "Bristol", "Clinton",
+    "Fairview", "Salem", "Madison", "Georgetown", "Arlington", "Ashland",
+)
+
+PARTIES = ("DEM", "REP", "NPA", "LIB", "GRN", "")
+
+VOTER_COLUMNS = (
+    "first_name",
+    "last_name",
+    "address",
+    "city",
+    "state",
+    "zip_code",
+    "county",
+    "precinct",
+    "registered_party",
+    "phone",
+    "email",
+)
+
+
+def zipf_cum_weights(n: int, s: float = 1.1) -> List[float]:
+    """Cumulative weights where item k is picked with probability ~ 1 / k**s."""
+    return list(accumulate(1.0 / (k ** s) for k in range(1, n + 1)))
+
+
+def county_names(n: int) -> List[str]:
+    return [f"County {i:02d}" for i in range(1, n + 1)]
+
+
+def voter_id_for(i: int) -> str:
+    return str(100000000 + i)
+
+
+def _open(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def generate_voter_file(
+    path: str,
+    rows: int,
+    counties: int = 20,
+    precincts_per_county: int = 60,
+    seed: int = 1,
+    id_alias: Optional[str] = None,
+) -> dict:
+    """
+    Write `rows` voters to `path` (gzip if it ends in .gz). County sizes and
+    precinct sizes within a county follow a Zipf-like skew; the voter id
+    header alias and column order are randomized per file.
+    Returns a summary with the header used and the generated county names.
+    """
+    rng = random.Random(seed)
+    county_list = county_names(counties)
+    county_weights = zipf_cum_weights(counties)
+    precinct_weights = zipf_cum_weights(precincts_per_county, s=0.8)
+    first_weights = zipf_cum_weights(len(FIRST_NAMES), s=0.7)
+    last_weights = zipf_cum_weights(len(LAST_NAMES), s=0.9)
+
+    id_alias = id_alias or rng.choice(VOTER_ID_ALIASES)
+    columns = list(VOTER_COLUMNS) + ["date_of_birth"]
+    rng.shuffle(columns)
+    header = [id_alias] + columns
+
+    with _open(path) as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for i in range(rows):
+            county = rng.choices(county_list, cum_weights=county_weights)[0]
+            precinct_no = rng.choices(range(1, precincts_per_county + 1), cum_weights=precinct_weights)[0]
+            first = rng.choices(FIRST_NAMES, cum_weights=first_weights)[0]
+            last = rng.choices(LAST_NAMES, cum_weights=last_weights)[0]
+            values = {
+                "first_name": first,
+                "last_name": last,
+                "address": f"{rng.randint(1, 9999)} {rng.choice(STREETS)}",
+                "city": rng.choice(CITIES),
+                "state": "ST",
+                "zip_code": f"{rng.randint(10000, 99999)}",
+                "county": county,
+                "precinct": f"{county[-2:]}-{precinct_no:03d}",
+                "registered_party": rng.choice(PARTIES),
+                "phone": f"555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}" if rng.random() < 0.6 else "",
+                "email": f"{first}.{last}{i}@example.com".lower().replace(" ", "") if rng.random() < 0.3 else "",
+                "date_of_birth": f"19{rng.randint(30, 99)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            }
+            writer.writerow([voter_id_for(i)] + [values[c] for c in columns])
+
+    return {"path": path, "rows": rows, "header": header, "counties": county_list}
+
+
+def generate_voted_file(
+    path: str,
+    voter_rows: int,
+    fraction: float = 0.3,
+    not_found_fraction: float = 0.02,
+    seed: int = 2,
+) -> dict:
+    """
+    Write a voted file listing `fraction` of the generated voters plus a few
+    unknown ids (`not_found_fraction` of the listed ones).
+    """
+    rng = random.Random(seed)
+    picked = rng.sample(range(voter_rows), int(voter_rows * fraction))
+    unknown = [voter_rows + k for k in range(int(len(picked) * not_found_fraction))]
+
+    with _open(path) as f:
+        writer = csv.writer(f)
+        writer.writerow([rng.choice(VOTER_ID_ALIASES), "ballot_type"])
+        for i in picked + unknown:
+            writer.writerow([voter_id_for(i), rng.choice(("EARLY", "ABSENTEE", "ELECTION_DAY"))])
+
+    return {"path": path, "rows": len(picked) + len(unknown), "not_found": len(unknown)}
+
+
+def sample_queries(rows: int, counties: Sequence[str], n: int = 50, seed: int = 3) -> List[Tuple[str, str]]:
+    """(field, q) pairs resembling what canvassers type."""
+    rng = random.Random(seed)
+    queries: List[Tuple[str, str]] = []
+    for _ in range(n):
+        kind = rng.random()
+        if kind < 0.35:
+            queries.append(("all", rng.choice(LAST_NAMES)[:4].lower()))
+        elif kind < 0.6:
+            queries.append(("all", f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"))
+        elif kind < 0.75:
+            queries.append(("address", rng.choice(STREETS).split()[0]))
+        elif kind < 0.85:
+            county = rng.choice(counties)
+            queries.append(("precinct", f"{county[-2:]}-{rng.randint(1, 20):03d}"))
+        elif kind < 0.95:
+            queries.append(("voter_id", voter_id_for(rng.randrange(rows))))
+        else:
+            queries.append(("all", f"{rng.choice(FIRST_NAMES)} {rng.choice(STREETS)}"))
+    return queries
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Generate synthetic voter and voted CSV files.")
+    parser.add_argument("--rows", type=int, default=10000, help="number of voters (10k to 5M)")
+    parser.add_argument("--counties", type=int, default=20)
+    parser.add_argument("--precincts-per-county", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", required=True, help="voter CSV path (.csv or .csv.gz)")
+    parser.add_argument("--voted-out", help="optional voted CSV path")
+    parser.add_argument("--voted-fraction", type=float, default=0.3)
+    args = parser.parse_args(argv)
+
+    summary = generate_voter_file(
+        args.out,
+        args.rows,
+        counties=args.counties,
+        precincts_per_county=args.precincts_per_county,
+        seed=args.seed,
+    )
+    print(f"wrote {summary['rows']} voters to {summary['path']} (header: {', '.join(summary['header'])})")
+
+    if args.voted_out:
+        voted = generate_voted_file(args.voted_out, args.rows, fraction=args.voted_fraction)
+        print(f"wrote {voted['rows']} voted ids to {voted['path']} ({voted['not_found']} unknown)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+# backend/benchmarks/run_benchmarks.py
+"""
+Import / search / tag / login benchmarks against one or more databases.
+
+    cd backend
+    pip install -r requirements.txt -r benchmarks/requirements.txt
+    python -m benchmarks.run_benchmarks --rows 100000 \
+        --database-url sqlite:////tmp/ttt_bench.db \
+        --database-url postgresql://localhost/ttt_bench \
+        --output bench_results.json --compare bench_baseline.json
+
+Each database URL is benchmarked in its own Python process (the app reads
+DATABASE_URL at import time, and this keeps peak RSS per engine honest).
+The databases are treated as scratch databases: ALL TABLES ARE DROPPED.
+SQLite URLs need an SQLite with FTS5 and its trigram tokenizer (3.34+),
+which the app's search uses there.
+
+The JSON report has one entry per database with rows/sec for the import
+endpoints, p50/p95 latency for search, tag and login endpoints and peak RSS.
+The login storm signs --login-users volunteers in at once (as at shift
+start) while timing /auth/me alongside, to show whether hashing starves
+other requests.
+--compare prints the change of every metric against an earlier report.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .generate_voter_file import generate_voted_file, generate_voter_file, sample_queries
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Metrics where a smaller number is better (used to label --compare output).
+LOWER_IS_BETTER = ("seconds", "p50_ms", "p95_ms", "max_ms", "mean_ms", "peak_rss_mb")
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def latency_summary(samples_ms: Sequence[float]) -> dict:
+    if not samples_ms:
+        return {"count": 0}
+    ordered = sorted(samples_ms)
+    if len(ordered) > 1:
+        cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+        p50, p95 = cuts[49], cuts[94]
+    else:
+        p50 = p95 = ordered[0]
+    return {
+        "count": len(ordered),
+        "p50_ms": round(p50, 2),
+        "p95_ms": round(p95, 2),
+        "max_ms": round(ordered[-1], 2),
+        "mean_ms": round(statistics.fmean(ordered), 2),
+    }
+
+
+def _timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000.0
+
+
+# -----------------------------------------------------
+# Worker: runs inside a child process for one database
+# -----------------------------------------------------
+def run_worker(args) -> dict:
+    os.environ["DATABASE_URL"] = args.worker
+    # Uploads and county snapshots (voter data) go next to the generated
+    # files, never into the source tree; app.paths reads these at import time
+    scratch = tempfile.mkdtemp(prefix="worker_", dir=os.path.dirname(os.path.abspath(args.voters_file)))
+    os.environ["UPLOADS_DIR"] = os.path.join(scratch, "uploads")
+    os.environ["SNAPSHOTS_DIR"] = os.path.join(scratch, "snapshots")
+    sys.path.insert(0, BACKEND_DIR)
+
+    from app.database import Base, engine, SessionLocal
+    from app import models
+
+    Base.metadata.drop_all(bind=engine)
+    if engine.dialect.name == "sqlite":
+        # The FTS5 mirrors are not models; left in place they would keep the
+        # previous run's rows (and are only rebuilt when created)
+        from sqlalchemy import text
+        from app.search_backend import SQLITE_FULLTEXT_TABLE
+        from app.trigram import SQLITE_TRIGRAM_TABLE
+
+        with engine.begin() as conn:
+            for table in (SQLITE_FULLTEXT_TABLE, SQLITE_TRIGRAM_TABLE):
+                conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.auth import create_access_token, get_password_hash
+
+    counties = json.loads(args.counties_json)
+    db = SessionLocal()
+    admin = models.User(email="bench-admin@example.com", hashed_password=get_password_hash("x"), is_admin=True)
+    volunteer = models.User(email="bench-volunteer@example.com", hashed_password=get_password_hash("x"))
+    db.add_all([admin, volunteer])
+    db.flush()
+    for county in counties[:3]:
+        db.add(models.UserCountyAccess(user_id=volunteer.id, county=county))
+    db.commit()
+    db.close()
+
+    client = TestClient(app)
+    admin_headers = {"Authorization": "Bearer " + create_access_token({"sub": "bench-admin@example.com"})}
+    user_headers = {"Authorization": "Bearer " + create_access_token({"sub": "bench-volunteer@example.com"})}
+
+    results: Dict[str, dict] = {}
+
+    def run(name: str, fn: Callable[[], dict]):
+        try:
+            results[name] = fn()
+        except Exception as exc:  # keep going: one broken endpoint should not hide the rest
+            results[name] = {"error": f"{type(exc).__name__}: {exc}"}
+
+    def post_file(url: str, path: str) -> dict:
+        with open(path, "rb") as f:
+            resp = client.post(url, files={"file": (os.path.basename(path), f)}, headers=admin_headers)
+        resp.raise_for_status()
+        return resp.json()
+
+    def import_bench(url: str, path: str, rows: int) -> Callable[[], dict]:
+        def bench():
+            start = time.perf_counter()
+            response = post_file(url, path)
+            seconds = time.perf_counter() - start
+            return {
+                "rows": rows,
+                "seconds": round(seconds, 3),
+                "rows_per_sec": round(rows / seconds, 1) if seconds else None,
+                "response": response,
+            }
+
+        return bench
+
+    run("import_voters", import_bench("/admin/import/voters", args.voters_file, args.rows))
+    run("import_voters_unchanged", import_bench("/admin/import/voters", args.voters_file, args.rows))
+    if engine.dialect.name == "postgresql":
+        run("import_voters_copy", import_bench("/admin/import/voters?mode=copy", args.voters_file, args.rows))
+    run("import_voted", import_bench("/admin/import/voted", args.voted_file, args.voted_rows))
+    results["peak_rss_mb_after_imports"] = _peak_rss_mb()
+
+    queries = sample_queries(args.rows, counties, n=args.search_samples)
+
+    def search_bench(headers: dict) -> Callable[[], dict]:
+        def bench():
+            samples = []
+            for field, q in queries:
+                samples.append(
+                    _timed(
+                        lambda: client.get(
+                            "/voters/", params={"q": q, "field": field, "page_size": 25}, headers=headers
+                        ).raise_for_status()
+                    )
+                )
+            return latency_summary(samples)
+
+        return bench
+
+    def browse_bench():
+        samples = []
+        for page in (1, 2, 10, 50, 200):
+            samples.append(
+                _timed(
+                    lambda: client.get(
+                        "/voters/", params={"page": page, "page_size": 50}, headers=user_headers
+                    ).raise_for_status()
+                )
+            )
+        return latency_summary(samples)
+
+    run("search_voters_admin", search_bench(admin_headers))
+    run("search_voters_volunteer", search_bench(user_headers))
+    run("browse_voters_volunteer", browse_bench)
+
+    def tag_bench():
+        db = SessionLocal()
+        voter_ids = [
+            r[0]
+            for r in db.query(models.Voter.id)
+            .filter(models.Voter.county.in_(counties[:3]))
+            .order_by(models.Voter.id)
+            .limit(args.tag_samples)
+            .all()
+        ]
+        db.close()
+
+        tag, dashboard, export, untag = [], [], [], []
+        for voter_id in voter_ids:
+            tag.append(_timed(lambda: client.post(f"/tags/{voter_id}", headers=user_headers).raise_for_status()))
+        for _ in range(10):
+            dashboard.append(_timed(lambda: client.get("/tags/dashboard", headers=user_headers).raise_for_status()))
+            export.append(_timed(lambda: client.get("/tags/export", headers=user_headers).raise_for_status()))
+        for voter_id in voter_ids:
+            untag.append(_timed(lambda: client.delete(f"/tags/{voter_id}", headers=user_headers).raise_for_status()))
+        return {
+            "tagged_voters": len(voter_ids),
+            "tag": latency_summary(tag),
+            "dashboard": latency_summary(dashboard),
+            "export": latency_summary(export),
+            "untag": latency_summary(untag),
+        }
+
+    run("tags", tag_bench)
+
+    def login_storm_bench():
+        import httpx
+
+        from app.password_hashing import hashing_pool
+
+        # One hash shared by every storm user: setup is not what is measured
+        hashed = get_password_hash("storm-password")
+        db = SessionLocal()
+        emails = [f"bench-storm-{i}@example.com" for i in range(args.login_users)]
+        db.add_all([models.User(email=email, hashed_password=hashed) for email in emails])
+        db.commit()
+        db.close()
+
+        async def storm():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+                logins: List[float] = []
+                probes: List[float] = []
+                done = asyncio.Event()
+
+                async def login(email: str):
+                    start = time.perf_counter()
+                    resp = await http.post("/auth/login", json={"email": email, "password": "storm-password"})
+                    resp.raise_for_status()
+                    logins.append((time.perf_counter() - start) * 1000.0)
+
+                async def probe():
+                    while not done.is_set():
+                        start = time.perf_counter()
+                        (await http.get("/auth/me", headers=user_headers)).raise_for_status()
+                        probes.append((time.perf_counter() - start) * 1000.0)
+                        await asyncio.sleep(0.05)
+
+                prober = asyncio.create_task(probe())
+                start = time.perf_counter()
+                await asyncio.gather(*(login(email) for email in emails))
+                seconds = time.perf_counter() - start
+                done.set()
+                await prober
+                return seconds, logins, probes
+
+        seconds, logins, probes = asyncio.run(storm())
+        return {
+            "logins": len(logins),
+            "seconds": round(seconds, 3),
+            "logins_per_sec": round(len(logins) / seconds, 1) if seconds else None,
+            "login": latency_summary(logins),
+            "me_during_storm": latency_summary(probes),
+            "hashing": hashing_pool.metrics(),
+        }
+
+    if args.login_users:
+        run("login_storm", login_storm_bench)
+
+    results["dialect"] = engine.dialect.name
+    results["peak_rss_mb"] = _peak_rss_mb()
+    return results
+
+
+# -----------------------------------------------------
+# Parent: generate files, run one worker per database, report
+# -----------------------------------------------------
+def _label(url: str) -> str:
+    try:
+        from sqlalchemy.engine import make_url
+
+        return make_url(url).render_as_string(hide_password=True)
+    except Exception:
+        return url
+
+
+def _flatten(prefix: str, value, out: Dict[str, float]):
+    if isinstance(value, dict):
+        for key, inner in value.items():
+            if key == "response":
+                continue
+            _flatten(f"{prefix}.{key}" if prefix else key, inner, out)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        out[prefix] = float(value)
+
+
+def compare_reports(baseline: dict, current: dict) -> List[str]:
+    before: Dict[str, float] = {}
+    after: Dict[str, float] = {}
+    _flatten("", baseline.get("results", {}), before)
+    _flatten("", current.get("results", {}), after)
+
+    lines = []
+    for key in sorted(set(before) & set(after)):
+        old, new = before[key], after[key]
+        if old == new or key.endswith(("count", ".rows", "tagged_voters", ".logins", "workers", "max_pending")):
+            continue
+        change = ((new - old) / old * 100.0) if old else float("inf")
+        better = (new < old) if key.rsplit(".", 1)[-1] in LOWER_IS_BETTER else (new > old)
+        lines.append(f"{key}: {old:g} -> {new:g} ({change:+.1f}%, {'better' if better else 'worse'})")
+    return lines
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark voter imports, search and tags.")
+    parser.add_argument("--rows", type=int, default=10000, help="voters to generate (10k to 5M)")
+    parser.add_argument("--counties", type=int, default=20)
+    parser.add_argument(
+        "--database-url",
+        action="append",
+        help="scratch database to benchmark (repeatable); defaults to a temporary SQLite file",
+    )
+    parser.add_argument("--search-samples", type=int, default=100)
+    parser.add_argument("--tag-samples", type=int, default=200)
+    parser.add_argument("--login-users", type=int, default=300, help="volunteers signing in at once (0 skips)")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    parser.add_argument("--workdir", help="where generated CSVs go (default: a temp dir)")
+
+    # internal: run the benchmarks for a single database in this process
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--voters-file", help=argparse.SUPPRESS)
+    parser.add_argument("--voted-file", help=argparse.SUPPRESS)
+    parser.add_argument("--voted-rows", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--counties-json", dest="counties_json", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(args)))
+        return
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="ttt_bench_")
+    urls = args.database_url or [f"sqlite:///{os.path.join(workdir, 'bench.db')}"]
+
+    gen_start = time.perf_counter()
+    voters = generate_voter_file(os.path.join(workdir, "voters.csv"), args.rows, counties=args.counties)
+    voted = generate_voted_file(os.path.join(workdir, "voted.csv"), args.rows)
+    print(f"generated {args.rows} voters / {voted['rows']} voted ids in {time.perf_counter() - gen_start:.1f}s")
+
+    results = {}
+    for url in urls:
+        label = _label(url)
+        print(f"benchmarking {label} ...")
+        proc = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.run_benchmarks",
+                "--worker", url,
+                "--rows", str(args.rows),
+                "--voters-file", voters["path"],
+                "--voted-file", voted["path"],
+                "--voted-rows", str(voted["rows"]),
+                "--counties-json", json.dumps(voters["counties"]),
+                "--search-samples", str(args.search_samples),
+                "--tag-samples", str(args.tag_samples),
+                "--login-users", str(args.login_users),
+            ],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+        )
+        lines = proc.stdout.strip().splitlines()
+        if proc.returncode != 0 or not lines:
+            results[label] = {"error": proc.stderr.strip().splitlines()[-1:] or ["worker failed"]}
+        else:
+            results[label] = json.loads(lines[-1])
+
+    report = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat() + "Z",
+            "rows": args.rows,
+            "voted_rows": voted["rows"],
+            "counties": args.counties,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}")
+
+    for label, result in results.items():
+        print(f"\n[{label}]")
+        for name, value in result.items():
+            if isinstance(value, dict):
+                shown = {k: v for k, v in value.items() if k != "response"}
+                print(f"  {name}: {shown}")
+            else:
+                print(f"  {name}: {value}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\ncompared with {args.compare}:")
+        for line in compare_reports(baseline, report) or ["no differences"]:
+            print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
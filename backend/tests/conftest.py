@@ -0,0 +1,36 @@
+# backend/tests/conftest.py
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+# The app reads its configuration at import time: point it at scratch
+# locations before anything imports it.
+_SCRATCH = tempfile.mkdtemp(prefix="ttt_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_SCRATCH, 'test.db')}"
+os.environ["UPLOADS_DIR"] = os.path.join(_SCRATCH, "uploads")
+os.environ["SNAPSHOTS_DIR"] = os.path.join(_SCRATCH, "snapshots")
+os.environ["HASH_WORKERS"] = "0"  # hash inline, no process pool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.principal_cache import principal_cache  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        for table in reversed(Base.metadata.sorted_tables):
+            session.execute(table.delete())
+        session.commit()
+        session.close()
+        # Counters start over with the tables, so cached principals would look current
+        principal_cache._entries.clear()
@@ -0,0 +1,82 @@
+# backend/tests/test_bulk_tags.py
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth import create_access_token
+from app.main import app
+from app.models import TagDeletion, User, UserCountyAccess, UserVoterTag, Voter
+
+
+@pytest.fixture
+def client(db):
+    user = User(email="vol@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    db.add(UserCountyAccess(user_id=user.id, county="North"))
+    db.add_all(
+        [
+            Voter(voter_id="N1", first_name="Ann", last_name="Lee", county="North", city="Leeds", change_seq=0),
+            Voter(voter_id="N2", first_name="Bo", last_name="Lee", county="North", city="York", change_seq=0),
+            Voter(voter_id="S1", first_name="Cy", last_name="Lee", county="South", city="Leeds", change_seq=0),
+        ]
+    )
+    db.commit()
+    return TestClient(app)
+
+
+def _headers():
+    return {"Authorization": "Bearer " + create_access_token({"sub": "vol@example.com"})}
+
+
+def _bulk(client, **payload):
+    return client.post("/tags/bulk", json=payload, headers=_headers())
+
+
+def _pk(db, voter_id):
+    return db.query(Voter.id).filter(Voter.voter_id == voter_id).scalar()
+
+
+def test_bulk_by_ids_reports_each_voter(client, db):
+    n1, s1 = _pk(db, "N1"), _pk(db, "S1")
+    body = _bulk(client, voter_ids=[n1, n1, s1, 9999]).json()
+    assert body["results"] == [
+        {"voter_id": n1, "status": "tagged"},
+        {"voter_id": s1, "status": "forbidden"},
+        {"voter_id": 9999, "status": "not_found"},
+    ]
+    assert body["counts"] == {"tagged": 1, "forbidden": 1, "not_found": 1}
+
+    assert _bulk(client, voter_ids=[n1]).json()["counts"] == {"already_tagged": 1}
+    assert db.query(UserVoterTag).count() == 1
+
+
+def test_bulk_by_filter_stays_in_the_callers_counties(client, db):
+    _bulk(client, voter_ids=[_pk(db, "N1")])
+
+    # S1 is in Leeds too, but not in the caller's counties
+    body = _bulk(client, filter={"city": "leeds"}).json()
+    assert body["counts"] == {"already_tagged": 1}
+
+    body = _bulk(client, filter={"county": "North"}).json()
+    assert body["counts"] == {"already_tagged": 1, "tagged": 1}
+
+    body = _bulk(client, filter={"county": "North"}, untag=True).json()
+    assert body["counts"] == {"untagged": 2}
+    assert db.query(UserVoterTag).count() == 0
+    assert db.query(TagDeletion).count() == 2
+
+    body = _bulk(client, voter_ids=[_pk(db, "N1")], untag=True).json()
+    assert body["counts"] == {"not_tagged": 1}
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {},
+        {"voter_ids": [1], "filter": {"city": "Leeds"}},
+        {"filter": {"city": "  "}},
+    ],
+)
+def test_bulk_needs_ids_or_a_filter(client, payload):
+    assert _bulk(client, **payload).status_code == 400
@@ -0,0 +1,68 @@
+# backend/tests/test_conditional_get.py
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth import create_access_token
+from app.data_version import BRANDING, bump_data_version
+from app.main import app
+from app.models import User, UserCountyAccess, Voter
+
+
+@pytest.fixture
+def client(db):
+    user = User(email="vol@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    db.add(UserCountyAccess(user_id=user.id, county="North"))
+    db.add(Voter(voter_id="N1", first_name="Ann", last_name="Lee", county="North", change_seq=0))
+    db.commit()
+    return TestClient(app)
+
+
+def _headers(**extra):
+    return {"Authorization": "Bearer " + create_access_token({"sub": "vol@example.com"}), **extra}
+
+
+def _revalidate(client, path, etag):
+    return client.get(path, headers=_headers(**{"If-None-Match": etag}))
+
+
+@pytest.mark.parametrize("path", ["/auth/me", "/branding/", "/tags/dashboard"])
+def test_unchanged_responses_are_not_modified(client, path):
+    response = client.get(path, headers=_headers())
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    not_modified = _revalidate(client, path, etag)
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+    # Compared weakly, and against each tag of a list
+    assert _revalidate(client, path, etag[2:]).status_code == 304
+    assert _revalidate(client, path, f'"other", {etag}').status_code == 304
+    assert _revalidate(client, path, '"other"').status_code == 200
+
+
+def test_changes_give_a_new_etag(client, db):
+    dashboard = client.get("/tags/dashboard", headers=_headers()).headers["ETag"]
+    me = client.get("/auth/me", headers=_headers()).headers["ETag"]
+    branding = client.get("/branding/").headers["ETag"]
+
+    voter_id = db.query(Voter.id).scalar()
+    assert client.post(f"/tags/{voter_id}", headers=_headers()).status_code == 200
+    response = _revalidate(client, "/tags/dashboard", dashboard)
+    assert response.status_code == 200
+    assert [v["voter_id"] for v in response.json()] == ["N1"]
+
+    bump_data_version(db, BRANDING)
+    db.commit()
+    assert _revalidate(client, "/branding/", branding).status_code == 200
+
+    # The validator covers the caller, not just the counters
+    other = User(email="other@example.com", hashed_password="x")
+    db.add(other)
+    db.commit()
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": "other@example.com"}), "If-None-Match": me}
+    assert client.get("/auth/me", headers=headers).status_code == 200
@@ -0,0 +1,40 @@
+# backend/tests/test_county_counts.py
+
+from sqlalchemy import func
+
+from app.models import CountyVoterCount, Voter
+from app.voter_import import VOTER_FIELDS, apply_voter_import
+
+
+def _row(voter_id, county, last_name="Lee"):
+    values = dict.fromkeys(VOTER_FIELDS, "")
+    values.update(first_name="Ann", last_name=last_name, county=county)
+    return (voter_id,) + tuple(values[name] for name in VOTER_FIELDS)
+
+
+def _counts(db):
+    return dict(db.query(CountyVoterCount.county, CountyVoterCount.voters))
+
+
+def _recount(db):
+    county = func.coalesce(Voter.county, "")
+    return dict(db.query(county, func.count(Voter.id)).group_by(county))
+
+
+def test_imports_keep_the_counts_without_recounting(db):
+    apply_voter_import(db, [_row("V1", "North"), _row("V2", "North"), _row("V3", "South"), _row("V4", "")])
+    db.commit()
+    assert _counts(db) == {"North": 2, "South": 1, "": 1} == _recount(db)
+
+    # V1 moves, V2 changes but stays, an empty county keeps V3 where it was, V5 is new
+    apply_voter_import(
+        db,
+        [_row("V1", "South"), _row("V2", "North", "Lin"), _row("V3", "", "Lin"), _row("V5", "East")],
+    )
+    db.commit()
+    assert _counts(db) == {"North": 1, "South": 2, "": 1, "East": 1} == _recount(db)
+
+    # The last voter of a county leaves: its row goes
+    apply_voter_import(db, [_row("V4", "East"), _row("V2", "South")])
+    db.commit()
+    assert _counts(db) == {"South": 3, "East": 2} == _recount(db)
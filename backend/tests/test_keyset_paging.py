@@ -0,0 +1,98 @@
+# backend/tests/test_keyset_paging.py
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth import create_access_token
+from app.data_version import bump_data_version
+from app.main import app
+from app.models import User, UserCountyAccess, UserVoterTag, Voter
+
+
+@pytest.fixture
+def client(db):
+    user = User(email="vol@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    db.add(UserCountyAccess(user_id=user.id, county="North"))
+    # Few distinct names, so pages split runs of equal names
+    for i in range(27):
+        first_name = "Ann" if i % 2 else "Bo"
+        db.add(Voter(voter_id=f"N{i}", first_name=first_name, last_name=f"Lee{i % 3}", county="North", change_seq=0))
+    db.add(Voter(voter_id="S1", first_name="Ann", last_name="Lee0", county="South", change_seq=0))
+    db.commit()
+    return TestClient(app)
+
+
+def _headers():
+    return {"Authorization": "Bearer " + create_access_token({"sub": "vol@example.com"})}
+
+
+def _search(client, **params):
+    response = client.get("/voters/", params={"page_size": 10, **params}, headers=_headers())
+    assert response.status_code == 200
+    return response.json()
+
+
+def _expected(db):
+    voters = db.query(Voter).filter(Voter.county == "North").all()
+    voters.sort(key=lambda v: (v.last_name, v.first_name, v.id))
+    return [v.voter_id for v in voters]
+
+
+def test_cursor_pages_match_offset_pages(client, db):
+    by_offset = []
+    for page in (1, 2, 3):
+        by_offset += [v["voter_id"] for v in _search(client, page=page)["voters"]]
+
+    by_cursor, cursor = [], None
+    while True:
+        body = _search(client, cursor=cursor) if cursor else _search(client)
+        by_cursor += [v["voter_id"] for v in body["voters"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert not body["has_more"]
+    assert by_cursor == by_offset == _expected(db)
+
+
+def test_cursor_is_not_shifted_by_earlier_inserts(client, db):
+    first = _search(client)
+    db.add(Voter(voter_id="N99", first_name="Al", last_name="Aa", county="North", change_seq=0))
+    bump_data_version(db)
+    db.commit()
+
+    second = _search(client, cursor=first["next_cursor"])
+    seen = [v["voter_id"] for v in first["voters"] + second["voters"]]
+    assert "N99" not in seen
+    assert seen == [v for v in _expected(db) if v != "N99"][:20]
+
+
+def test_malformed_cursor_is_rejected(client):
+    response = client.get("/voters/", params={"cursor": "nope"}, headers=_headers())
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("sort", ["name", "precinct", "voted"])
+def test_dashboard_pages_by_cursor(client, db, sort):
+    user = db.query(User).one()
+    for i, voter in enumerate(db.query(Voter).filter(Voter.county == "North")):
+        voter.precinct = f"P{i % 4}"
+        voter.has_voted = i % 3 == 0
+        db.add(UserVoterTag(user_id=user.id, voter_id=voter.id, change_seq=0))
+    db.commit()
+
+    everything = client.get("/tags/dashboard", params={"sort": sort}, headers=_headers()).json()
+    paged, cursor = [], None
+    while True:
+        params = {"sort": sort, "limit": 4}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/tags/dashboard", params=params, headers=_headers())
+        assert response.status_code == 200
+        paged += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert [v["id"] for v in paged] == [v["id"] for v in everything]
+    assert len(everything) == 27
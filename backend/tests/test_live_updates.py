@@ -0,0 +1,146 @@
+# backend/tests/test_live_updates.py
+"""
+LiveUpdateHub fan-out and backpressure. Subscriptions are fed through an
+event loop run by each test, standing in for the loops serving the streams.
+"""
+
+import asyncio
+
+from app import live_updates as live_updates_module
+from app.live_updates import LiveUpdateHub
+from app.models import User, UserVoterTag, Voter
+from app.principal_cache import Principal
+
+
+def _user(db, email, counties=(), is_admin=False) -> Principal:
+    user = User(email=email, hashed_password="x", is_admin=is_admin)
+    db.add(user)
+    db.flush()
+    return Principal(user.id, email, None, is_admin, frozenset(counties))
+
+
+def _voter(db, voter_id, county, tagged_by=()) -> Voter:
+    voter = Voter(voter_id=voter_id, first_name="Ann", last_name=voter_id, county=county, has_voted=False)
+    db.add(voter)
+    db.flush()
+    for user in tagged_by:
+        db.add(UserVoterTag(user_id=user.id, voter_id=voter.id, change_seq=0))
+    db.flush()
+    return voter
+
+
+def _drain(subscription) -> list:
+    messages = []
+    while not subscription.queue.empty():
+        messages.append(subscription.queue.get_nowait())
+    return messages
+
+
+def test_push_fans_out_to_every_stream_of_the_tagging_users(db):
+    async def scenario():
+        hub = LiveUpdateHub()
+        alice = _user(db, "alice@example.com", {"North"})
+        bob = _user(db, "bob@example.com", {"North"})
+        carol = _user(db, "carol@example.com", {"North"})
+        shared = _voter(db, "V1", "North", tagged_by=(alice, bob))
+        own = _voter(db, "V2", "North", tagged_by=(alice,))
+        db.commit()
+
+        alice_tabs = [hub.subscribe(alice), hub.subscribe(alice)]
+        bob_stream = hub.subscribe(bob)
+        carol_stream = hub.subscribe(carol)
+
+        hub.push_voters(db, [shared.id, own.id])
+        await asyncio.sleep(0)  # let the loop run the threadsafe callbacks
+
+        for tab in alice_tabs:
+            assert [m.count('"voter_id":"V') for m in _drain(tab)] == [1, 1]
+        bob_messages = _drain(bob_stream)
+        assert len(bob_messages) == 1 and '"voter_id":"V1"' in bob_messages[0]
+        assert _drain(carol_stream) == []
+
+    asyncio.run(scenario())
+
+
+def test_push_skips_counties_the_subscriber_no_longer_sees(db):
+    async def scenario():
+        hub = LiveUpdateHub()
+        volunteer = _user(db, "vol@example.com", {"North"})
+        admin = _user(db, "admin@example.com", is_admin=True)
+        voter = _voter(db, "V1", "South", tagged_by=(volunteer, admin))
+        db.commit()
+
+        volunteer_stream = hub.subscribe(volunteer)
+        admin_stream = hub.subscribe(admin)
+        hub.push_voters(db, [voter.id])
+        await asyncio.sleep(0)
+
+        assert _drain(volunteer_stream) == []
+        assert len(_drain(admin_stream)) == 1
+
+    asyncio.run(scenario())
+
+
+def test_push_changed_sends_only_voters_whose_watched_columns_moved(db):
+    async def scenario():
+        hub = LiveUpdateHub()
+        user = _user(db, "vol@example.com", {"North"})
+        voted = _voter(db, "V1", "North", tagged_by=(user,))
+        _voter(db, "V2", "North", tagged_by=(user,))
+        db.commit()
+        stream = hub.subscribe(user)
+
+        before = hub.tagged_state(db)
+        voted.has_voted = True
+        db.commit()
+        hub.push_changed(db, before)
+        await asyncio.sleep(0)
+
+        messages = _drain(stream)
+        assert len(messages) == 1 and '"voter_id":"V1"' in messages[0]
+
+    asyncio.run(scenario())
+
+
+def test_a_full_queue_is_replaced_by_one_resync(db, monkeypatch):
+    monkeypatch.setattr(live_updates_module, "LIVE_QUEUE_SIZE", 3)
+
+    async def scenario():
+        hub = LiveUpdateHub()
+        user = _user(db, "vol@example.com", {"North"})
+        voters = [_voter(db, f"V{i}", "North", tagged_by=(user,)) for i in range(5)]
+        db.commit()
+        slow = hub.subscribe(user)
+
+        hub.push_voters(db, [v.id for v in voters])
+        await asyncio.sleep(0)
+        # The fourth event overflowed: the three queued ones were dropped for a
+        # resync, and the fifth queued behind it
+        messages = _drain(slow)
+        assert messages[0] == live_updates_module.format_event("resync", {})
+        assert len(messages) == 2 and '"voter_id":"V4"' in messages[1]
+
+        # Once drained, the stream receives events again
+        hub.push_voters(db, [voters[0].id])
+        await asyncio.sleep(0)
+        assert len(_drain(slow)) == 1
+
+    asyncio.run(scenario())
+
+
+def test_unsubscribed_streams_receive_nothing(db):
+    async def scenario():
+        hub = LiveUpdateHub()
+        user = _user(db, "vol@example.com", {"North"})
+        voter = _voter(db, "V1", "North", tagged_by=(user,))
+        db.commit()
+
+        stream = hub.subscribe(user)
+        hub.unsubscribe(stream)
+        assert hub.subscriber_ids() == []
+
+        hub.push_voters(db, [voter.id])
+        await asyncio.sleep(0)
+        assert _drain(stream) == []
+
+    asyncio.run(scenario())
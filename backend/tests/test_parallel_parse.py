@@ -0,0 +1,68 @@
+# backend/tests/test_parallel_parse.py
+
+import csv
+import io
+import random
+
+import pytest
+
+from app import parallel_parse
+from app.parallel_parse import ParallelVoterRows, ends_inside_quotes
+from app.voter_import import iter_voter_rows
+
+HEADER = ["voter_id", "first_name", "last_name", "address", "county", "note"]
+
+
+def _write_voters(path, rows=200, seed=7):
+    random.seed(seed)
+    lines = [",".join(HEADER)]
+    for i in range(rows):
+        address = f"{i} Main St"
+        if i % 7 == 3:
+            address = f'"{i} Main St\nApt ""{i}""\nBack door"'  # multi-line, escaped quotes
+        note = "tall"
+        if i % 5 == 1:
+            note = "5'10\""  # a stray quote in an unquoted field is literal
+        if i % 11 == 4:
+            note = f'x"{i}"'
+        lines.append(f"V{i},Ann,Lee{random.randint(0, 9)},{address},North,{note}")
+    lines.append('end",Bo,Lin,"1 Quote Rd",South,')
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def _sequential(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return list(iter_voter_rows(f))
+
+
+@pytest.mark.parametrize("range_bytes", [29, 47, 64, 101, 1 << 20])
+def test_parallel_rows_match_the_sequential_parser(tmp_path, monkeypatch, range_bytes):
+    path = str(tmp_path / "voters.csv")
+    _write_voters(path)
+    monkeypatch.setattr(parallel_parse, "PARSE_RANGE_BYTES", range_bytes)
+
+    expected = _sequential(path)
+    assert len(expected) == 201
+    assert list(ParallelVoterRows(path, workers=2)) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "a,b\n",
+        'a,"b\n',
+        'a,"b""\n',
+        'a,"b""c"\n',
+        '5\'10",x\n',
+        '5\'10",x,"y\n',
+        '"a"b,"c\n',
+        '"a"b"c\n',
+        '"\n"\n"\n',
+    ],
+)
+def test_ends_inside_quotes_agrees_with_csv(text):
+    # An open quoted field swallows the lines after it: a record appended
+    # after the text comes out on its own only when every field was closed
+    records = list(csv.reader(io.StringIO(text + "end\n", newline="")))
+    assert ends_inside_quotes(text) == (records[-1] != ["end"])
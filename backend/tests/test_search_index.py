@@ -0,0 +1,103 @@
+# backend/tests/test_search_index.py
+
+from app.data_version import VOTER_CHANGES, VOTERS, VOTERS_EPOCH, bump_data_version, get_data_version, next_change_seq
+from app.models import Voter
+from app.search_index import VoterSearchIndex
+
+
+def _edit_phone(db, voter, phone):
+    # What PATCH /tags/{id}/contact writes, in another worker process
+    voter.phone = phone
+    voter.row_fingerprint = None
+    voter.change_seq = next_change_seq(db, VOTER_CHANGES)
+    bump_data_version(db, VOTERS)
+    db.commit()
+
+
+def _catch_up(index, db):
+    # What is_current() starts in the background when the version moved
+    index.refresh_changed(db)
+    return index.is_current(get_data_version(db, VOTERS))
+
+
+def test_repeated_contact_edits_reach_other_processes(db):
+    voter = Voter(voter_id="V1", first_name="Ann", last_name="Lee", county="North", phone="5550001", change_seq=0)
+    db.add(voter)
+    db.commit()
+    index = VoterSearchIndex()
+    index.load(db)
+
+    for phone in ("5550002", "5550003"):
+        _edit_phone(db, voter, phone)
+        assert index.version != get_data_version(db, VOTERS)
+        assert _catch_up(index, db)
+        assert index.search([phone], None, 10) == [voter.id]
+
+    assert index.search(["5550001"], None, 10) == []
+    assert index.search(["5550002"], None, 10) == []
+
+
+def test_imported_voters_are_picked_up_and_delete_all_reloads(db):
+    db.add(Voter(voter_id="V1", first_name="Ann", last_name="Lee", county="North", change_seq=0))
+    db.commit()
+    index = VoterSearchIndex()
+    index.load(db)
+
+    seq = next_change_seq(db, VOTER_CHANGES)
+    db.add(Voter(voter_id="V2", first_name="Bo", last_name="Lee", county="South", change_seq=seq))
+    bump_data_version(db, VOTERS)
+    db.commit()
+    assert _catch_up(index, db)
+    assert len(index.search(["lee"], None, 10)) == 2
+    assert len(index.search(["lee"], ["South"], 10)) == 1
+
+    db.query(Voter).delete()
+    bump_data_version(db, VOTERS)
+    bump_data_version(db, VOTERS_EPOCH)
+    db.commit()
+    assert _catch_up(index, db)
+    assert index.search(["lee"], None, 10) == []
+
+
+
+def test_index_and_sql_fallback_page_alike(db, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.auth import create_access_token
+    from app.main import app
+    from app.models import User
+    from app.routers import voter_routes
+    from app.search_index import search_index
+
+    db.add(User(email="admin@example.com", hashed_password="x", is_admin=True))
+    names = [f"{prefix}{i}" for i in range(8) for prefix in ("lee", "Lee", "de Lee")]
+    for i, last_name in enumerate(names):
+        db.add(Voter(voter_id=f"V{i}", first_name="Ann", last_name=last_name, city="Leeds", change_seq=0))
+    db.commit()
+    monkeypatch.setattr(voter_routes, "SEARCH_INDEX_IN_MEMORY", True)
+    client = TestClient(app)
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": "admin@example.com"})}
+
+    def page(cursor=None):
+        params = {"q": "leeds", "page_size": 10}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/voters/", params=params, headers=headers)
+        assert response.status_code == 200
+        body = response.json()
+        return [names[int(v["voter_id"][1:])] for v in body["voters"]], body["next_cursor"]
+
+    try:
+        # Page 1 from SQL (the index is not loaded), the rest from the index
+        assert not search_index.ready
+        first, cursor = page()
+        search_index.load(db)
+        rest = []
+        while cursor:
+            found, cursor = page(cursor)
+            rest += found
+    finally:
+        search_index.ready = False
+        search_index.clear()
+
+    assert first + rest == sorted(names)
@@ -0,0 +1,52 @@
+# backend/tests/test_stream_tickets.py
+
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.auth import create_access_token
+from app.deps import get_stream_user
+from app.main import app
+from app.models import StreamTicket, User
+
+
+@pytest.fixture
+def client(db):
+    db.add(User(email="vol@example.com", hashed_password="x"))
+    db.commit()
+    return TestClient(app)
+
+
+def _headers():
+    return {"Authorization": "Bearer " + create_access_token({"sub": "vol@example.com"})}
+
+
+def test_ticket_opens_one_stream_only(client):
+    ticket = client.post("/tags/live/ticket", headers=_headers()).json()["ticket"]
+
+    assert get_stream_user(ticket).email == "vol@example.com"
+    with pytest.raises(HTTPException) as reused:
+        get_stream_user(ticket)
+    assert reused.value.status_code == 401
+
+
+def test_expired_ticket_is_refused(client, db):
+    ticket = client.post("/tags/live/ticket", headers=_headers()).json()["ticket"]
+    db.query(StreamTicket).update({StreamTicket.expires_at: time.time() - 1})
+    db.commit()
+
+    with pytest.raises(HTTPException) as expired:
+        get_stream_user(ticket)
+    assert expired.value.status_code == 401
+
+
+def test_stream_refuses_access_tokens(client):
+    token = create_access_token({"sub": "vol@example.com"})
+    assert client.get("/tags/live", params={"ticket": token}).status_code == 401
+    assert client.get("/tags/live", params={"token": token}).status_code == 422
+
+
+def test_ticket_needs_a_signed_in_user(client):
+    assert client.post("/tags/live/ticket").status_code == 401
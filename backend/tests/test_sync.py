@@ -0,0 +1,165 @@
+# backend/tests/test_sync.py
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth import create_access_token
+from app.main import app
+from app.models import User, UserCountyAccess, Voter, VoterMove
+from app.sync_history import SYNC_HISTORY_DAYS, prune_sync_history
+from app.voter_import import VOTER_FIELDS, apply_voter_import
+
+
+def _row(voter_id, county, last_name="Lee"):
+    values = dict.fromkeys(VOTER_FIELDS, "")
+    values.update(first_name="Ann", last_name=last_name, county=county)
+    return (voter_id,) + tuple(values[name] for name in VOTER_FIELDS)
+
+
+def _import(db, *rows):
+    apply_voter_import(db, list(rows))
+    db.commit()
+
+
+@pytest.fixture
+def client(db):
+    user = User(email="vol@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    db.add(UserCountyAccess(user_id=user.id, county="North"))
+    db.commit()
+    return TestClient(app)
+
+
+def _sync(client, since=None, limit=1000):
+    params = {"limit": limit}
+    if since:
+        params["since"] = since
+    response = client.get(
+        "/sync/changes",
+        params=params,
+        headers={"Authorization": "Bearer " + create_access_token({"sub": "vol@example.com"})},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def _voter_pk(db, voter_id):
+    return db.query(Voter.id).filter(Voter.voter_id == voter_id).scalar()
+
+
+def test_incremental_sync_only_reads_the_callers_counties(client, db):
+    _import(db, _row("N1", "North"), _row("S1", "South"))
+    cursor = _sync(client)["next"]
+
+    # A statewide change: only North's voters come back, nothing is removed
+    _import(db, _row("N1", "North", "Lin"), _row("S1", "South", "Lin"))
+    changes = _sync(client, cursor)
+    assert [v["voter_id"] for v in changes["voters"]] == ["N1"]
+    assert changes["removed"] == []
+
+
+def test_voters_moved_out_are_removed(client, db):
+    _import(db, _row("N1", "North"), _row("N2", "North"), _row("S1", "South"))
+    cursor = _sync(client)["next"]
+
+    # N1 leaves North, S1 moves South -> East (never visible), N2 stays
+    _import(db, _row("N1", "South"), _row("S1", "East"), _row("N2", "North", "Lin"))
+    changes = _sync(client, cursor)
+    assert not changes["reset"]
+    assert [v["voter_id"] for v in changes["voters"]] == ["N2"]
+    assert changes["removed"] == [_voter_pk(db, "N1")]
+
+    # Seen once; and a voter moved back is sent as a voter, not a removal
+    cursor = changes["next"]
+    assert _sync(client, cursor)["removed"] == []
+    _import(db, _row("N1", "North"))
+    changes = _sync(client, cursor)
+    assert [v["voter_id"] for v in changes["voters"]] == ["N1"]
+    assert changes["removed"] == []
+
+
+def test_removals_follow_the_pages(client, db):
+    _import(db, *[_row(f"N{i}", "North") for i in range(4)])
+    cursor = _sync(client)["next"]
+
+    _import(db, *[_row(f"N{i}", "South" if i % 2 else "North", "Lin") for i in range(4)])
+    voters, removed = [], []
+    while True:
+        page = _sync(client, cursor, limit=1)
+        voters += [v["voter_id"] for v in page["voters"]]
+        removed += page["removed"]
+        cursor = page["next"]
+        if not page["has_more"]:
+            break
+    assert voters == ["N0", "N2"]
+    assert sorted(removed) == sorted(_voter_pk(db, v) for v in ("N1", "N3"))
+
+
+def test_pruned_moves_reset_older_cursors(client, db):
+    _import(db, _row("N1", "North"))
+    old_cursor = _sync(client)["next"]
+    _import(db, _row("N1", "South"))
+    current_cursor = _sync(client, old_cursor)["next"]
+
+    prune_sync_history(db, now=time.time() + SYNC_HISTORY_DAYS * 86400 + 60)
+    db.commit()
+    assert db.query(VoterMove).count() == 0
+    assert _sync(client, old_cursor)["reset"]
+    assert not _sync(client, current_cursor)["reset"]
+
+
+def test_full_sync_pages_each_voter_once(client, db):
+    _import(db, *[_row(f"N{i}", "North") for i in range(5)], _row("S1", "South"))
+
+    pages = []
+    cursor = None
+    while True:
+        page = _sync(client, cursor, limit=2)
+        pages.append(page)
+        cursor = page["next"]
+        if not page["has_more"]:
+            break
+    assert [page["reset"] for page in pages] == [True, False, False]
+    assert sorted(v["voter_id"] for page in pages for v in page["voters"]) == [f"N{i}" for i in range(5)]
+
+    caught_up = _sync(client, cursor)
+    assert not caught_up["reset"]
+    assert caught_up["voters"] == []
+
+
+def _admin_headers(db):
+    db.add(User(email="admin@example.com", hashed_password="x", is_admin=True))
+    db.commit()
+    return {"Authorization": "Bearer " + create_access_token({"sub": "admin@example.com"})}
+
+
+def test_delete_all_resets_cursors(client, db):
+    _import(db, _row("N1", "North"))
+    cursor = _sync(client)["next"]
+
+    assert client.delete("/admin/voters", headers=_admin_headers(db)).status_code == 200
+    _import(db, _row("N2", "North"))
+    changes = _sync(client, cursor)
+    assert changes["reset"]
+    assert [v["voter_id"] for v in changes["voters"]] == ["N2"]
+
+
+def test_county_grant_change_resets_cursors(client, db):
+    _import(db, _row("N1", "North"), _row("S1", "South"))
+    cursor = _sync(client)["next"]
+
+    # S1 was written before the cursor, so only a full sync can deliver it
+    user_id = db.query(User.id).filter(User.email == "vol@example.com").scalar()
+    response = client.put(
+        f"/admin/users/{user_id}/county-access",
+        json={"allowed_counties": ["North", "South"]},
+        headers=_admin_headers(db),
+    )
+    assert response.status_code == 200
+    changes = _sync(client, cursor)
+    assert changes["reset"]
+    assert sorted(v["voter_id"] for v in changes["voters"]) == ["N1", "S1"]
+    assert not _sync(client, changes["next"])["reset"]
@@ -0,0 +1,66 @@
+# backend/tests/test_sync_history.py
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth import create_access_token
+from app.main import app
+from app.models import TagDeletion, User, UserCountyAccess, Voter
+from app.sync_history import SYNC_HISTORY_DAYS, prune_sync_history
+
+
+@pytest.fixture
+def client(db):
+    user = User(email="vol@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    db.add(UserCountyAccess(user_id=user.id, county="North"))
+    db.add(Voter(voter_id="V1", first_name="Ann", last_name="Lee", county="North", change_seq=0))
+    db.commit()
+    return TestClient(app)
+
+
+def _headers():
+    return {"Authorization": "Bearer " + create_access_token({"sub": "vol@example.com"})}
+
+
+def _sync(client, since=None):
+    params = {"since": since} if since else {}
+    response = client.get("/sync/changes", params=params, headers=_headers())
+    assert response.status_code == 200
+    return response.json()
+
+
+def _tag_and_untag(client, db):
+    voter_id = db.query(Voter.id).scalar()
+    assert client.post(f"/tags/{voter_id}", headers=_headers()).status_code == 200
+    assert client.delete(f"/tags/{voter_id}", headers=_headers()).status_code == 200
+
+
+def test_untagging_is_synced_until_pruned(client, db):
+    old_cursor = _sync(client)["next"]
+    _tag_and_untag(client, db)
+
+    changes = _sync(client, old_cursor)
+    assert not changes["reset"]
+    assert changes["tags"] == [{"voter_id": db.query(Voter.id).scalar(), "tagged": False}]
+    current_cursor = changes["next"]
+
+    later = time.time() + SYNC_HISTORY_DAYS * 86400 + 60
+    assert prune_sync_history(db, now=later) == 1
+    db.commit()
+    assert db.query(TagDeletion).count() == 0
+
+    # The old cursor may have missed the pruned untagging: start over
+    assert _sync(client, old_cursor)["reset"]
+    # A cursor past it has missed nothing
+    assert not _sync(client, current_cursor)["reset"]
+
+
+def test_recent_untaggings_are_kept(client, db):
+    _tag_and_untag(client, db)
+
+    assert prune_sync_history(db) == 0
+    assert db.query(TagDeletion).count() == 1
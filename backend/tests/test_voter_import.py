@@ -0,0 +1,68 @@
+# backend/tests/test_voter_import.py
+
+from app.models import Voter
+from app.phonetic import metaphone
+from app.voter_import import VOTER_FIELDS, apply_voted_ids, upsert_voter_chunk
+
+
+def _row(voter_id, **fields):
+    values = dict.fromkeys(VOTER_FIELDS, "")
+    values.update(first_name="Ann", last_name="Lee", county="North")
+    values.update(fields)
+    return (voter_id,) + tuple(values[name] for name in VOTER_FIELDS)
+
+
+def _upsert(db, *rows):
+    imported, updated, unchanged, _ = upsert_voter_chunk(db, list(rows), change_seq=0)
+    db.commit()
+    return imported, updated, unchanged
+
+
+def _voter(db, voter_id):
+    db.expire_all()
+    return db.query(Voter).filter(Voter.voter_id == voter_id).one()
+
+
+def test_counts_are_per_csv_row(db):
+    # A repeated voter_id is an import followed by an update
+    assert _upsert(db, _row("V1"), _row("V2"), _row("V1", city="Leeds")) == (2, 1, 0)
+    assert _voter(db, "V1").city == "Leeds"
+
+    # Rows matching what is stored are not written
+    assert _upsert(db, _row("V1", city="Leeds"), _row("V2")) == (0, 0, 2)
+    assert _upsert(db, _row("V1", city="York"), _row("V2"), _row("V3")) == (1, 1, 1)
+    assert _voter(db, "V1").city == "York"
+
+
+def test_empty_values_do_not_overwrite(db):
+    _upsert(db, _row("V1", first_name="Ann", phone="5550001", city="Leeds"))
+
+    assert _upsert(db, _row("V1", first_name="", phone="", city="York")) == (0, 1, 0)
+    voter = _voter(db, "V1")
+    assert (voter.first_name, voter.phone, voter.city) == ("Ann", "5550001", "York")
+    assert voter.first_name_key == metaphone("Ann")
+
+    # Within one chunk as well: the later empty value keeps the earlier one
+    assert _upsert(db, _row("V2", phone="5550002"), _row("V2", phone="")) == (1, 1, 0)
+    assert _voter(db, "V2").phone == "5550002"
+
+
+def test_voted_ids_counts(db):
+    db.add_all(
+        [
+            Voter(voter_id="V1", first_name="Ann", last_name="Lee", has_voted=False, change_seq=0),
+            Voter(voter_id="V2", first_name="Bo", last_name="Lee", has_voted=True, change_seq=0),
+            Voter(voter_id="V3", first_name="Cy", last_name="Lee", has_voted=None, change_seq=0),
+        ]
+    )
+    db.commit()
+
+    # Counted per distinct voter_id
+    result = apply_voted_ids(db, ["V1", "V2", "V1", "V3", "X1", "X1"])
+    db.commit()
+    assert result == {"updated_voted": 3, "newly_voted": 2, "already_voted": 1, "not_found": 1}
+    assert all(_voter(db, voter_id).has_voted for voter_id in ("V1", "V2", "V3"))
+
+    result = apply_voted_ids(db, ["V1", "V2"])
+    db.commit()
+    assert result == {"updated_voted": 2, "newly_voted": 0, "already_voted": 2, "not_found": 0}
@@ -111,6 +111,19 @@ export async function apiSearchVoters(qOrParams, page = 1, pageSize = 25, field
   if (params?.field) url.searchParams.set("field", params.field);
   if (params?.page) url.searchParams.set("page", String(params.page));
   if (params?.pageSize) url.searchParams.set("page_size", String(params.pageSize));
+  if (params?.sort) url.searchParams.set("sort", params.sort);
+  if (params?.fuzzy) url.searchParams.set("fuzzy", "true");
+  if (params?.cursor) url.searchParams.set("cursor", params.cursor);
+
+  return fetchJson(url.toString(), {
+    headers: authHeaders(),
+  });
+}
+
+export async function apiSuggestVoters(q, limit = 10) {
+  const url = new URL(`${API_BASE}/voters/suggest`);
+  url.searchParams.set("q", q);
+  url.searchParams.set("limit", String(limit));
 
   return fetchJson(url.toString(), {
     headers: authHeaders(),
@@ -133,10 +146,94 @@ export async function apiUntagVoter(voterId) {
   });
 }
 
-export async function apiGetDashboard() {
-  return fetchJson(`${API_BASE}/tags/dashboard`, {
+// Tag (or untag) many voters at once: pass voterIds, or a filter such as
+// { precinct: "12" } or { street: "main st" }.
+export async function apiBulkTagVoters({ voterIds, filter, untag = false }) {
+  return fetchJson(`${API_BASE}/tags/bulk`, {
+    method: "POST",
+    headers: jsonHeaders(),
+    body: JSON.stringify(filter ? { filter, untag } : { voter_ids: voterIds, untag }),
+  });
+}
+
+// One page of the current user's tagged voters. nextCursor is null on the
+// last page; without a limit every tagged voter comes back at once.
+export async function apiGetDashboard({ sort = "name", limit, cursor } = {}) {
+  const url = new URL(`${API_BASE}/tags/dashboard`);
+  url.searchParams.set("sort", sort);
+  if (limit) url.searchParams.set("limit", String(limit));
+  if (cursor) url.searchParams.set("cursor", cursor);
+
+  const resp = await fetch(url.toString(), {
     headers: authHeaders(),
   });
+
+  if (!resp.ok) {
+    let msg = `Request failed with status ${resp.status}`;
+    try {
+      const data = await resp.json();
+      if (data && data.detail) {
+        msg = typeof data.detail === "string" ? data.detail : JSON.stringify(data.detail);
+      }
+    } catch (e) {}
+    throw new Error(msg);
+  }
+
+  return { voters: (await resp.json()) || [], nextCursor: resp.headers.get("X-Next-Cursor") };
+}
+
+// Live changes to the current user's tagged voters (Server-Sent Events).
+// onVoter gets each changed dashboard row; onResync means updates were
+// missed and the dashboard should be reloaded. Returns an object whose
+// close() ends the stream.
+//
+// EventSource cannot send headers, so each connection is opened with a
+// short-lived single-use ticket rather than the access token (which would
+// end up in server logs). A used ticket cannot reopen the stream, so after
+// an error we reconnect here with a new one and resync, since events may
+// have been missed in between.
+const LIVE_RECONNECT_MS = 5000;
+
+export function apiOpenLiveUpdates({ onVoter, onResync }) {
+  let source = null;
+  let retry = null;
+  let closed = false;
+
+  async function connect(reconnecting) {
+    let ticket;
+    try {
+      ({ ticket } = await fetchJson(`${API_BASE}/tags/live/ticket`, {
+        method: "POST",
+        headers: authHeaders(),
+      }));
+    } catch (e) {
+      if (!closed) retry = setTimeout(() => connect(reconnecting), LIVE_RECONNECT_MS);
+      return;
+    }
+    if (closed) return;
+
+    const url = new URL(`${API_BASE}/tags/live`);
+    url.searchParams.set("ticket", ticket);
+    source = new EventSource(url.toString());
+    source.addEventListener("voter", (e) => onVoter(JSON.parse(e.data)));
+    source.addEventListener("resync", () => onResync());
+    if (reconnecting) {
+      source.addEventListener("ready", () => onResync(), { once: true });
+    }
+    source.onerror = () => {
+      source.close();
+      if (!closed) retry = setTimeout(() => connect(true), LIVE_RECONNECT_MS);
+    };
+  }
+
+  connect(false);
+  return {
+    close() {
+      closed = true;
+      clearTimeout(retry);
+      if (source) source.close();
+    },
+  };
 }
 
 export async function apiExportTags() {
@@ -159,6 +256,30 @@ export async function apiExportTags() {
   return blob;
 }
 
+// Admin: the whole voter table (or one county) as a gzipped CSV download.
+export async function apiExportVoters({ county } = {}) {
+  const url = new URL(`${API_BASE}/admin/export/voters`);
+  url.searchParams.set("gzip", "true");
+  if (county) url.searchParams.set("county", county);
+
+  const resp = await fetch(url.toString(), {
+    headers: authHeaders(),
+  });
+
+  if (!resp.ok) {
+    let msg = `Export failed with status ${resp.status}`;
+    try {
+      const data = await resp.json();
+      if (data && data.detail) {
+        msg = typeof data.detail === "string" ? data.detail : JSON.stringify(data.detail);
+      }
+    } catch (e) {}
+    throw new Error(msg);
+  }
+
+  return resp.blob();
+}
+
 export async function apiUpdateTaggedVoterContact(voterId, payload) {
   return fetchJson(`${API_BASE}/tags/${voterId}/contact`, {
     method: "PATCH",
@@ -169,28 +290,50 @@ export async function apiUpdateTaggedVoterContact(voterId, payload) {
 
 // ==== ADMIN: IMPORT / DELETE ====
 
-export async function apiImportVoters(file) {
+// Imports run as background jobs on the server; we poll the job until it
+// finishes and resolve with the same result object the old synchronous
+// endpoints returned. onProgress (optional) receives each job status.
+async function runImportJob(path, file, onProgress) {
   const formData = new FormData();
   formData.append("file", file);
 
-  return fetchJson(`${API_BASE}/admin/import/voters`, {
+  const url = new URL(`${API_BASE}${path}`);
+  url.searchParams.set("background", "true");
+
+  let job = await fetchJson(url.toString(), {
     method: "POST",
     headers: authHeaders(),
     body: formData,
   });
-}
 
-export async function apiImportVoted(file) {
-  const formData = new FormData();
-  formData.append("file", file);
+  while (job && job.status !== "done" && job.status !== "failed") {
+    if (onProgress) onProgress(job);
+    await new Promise((resolve) => setTimeout(resolve, 1000));
+    job = await apiGetImportJob(job.job_id);
+  }
 
-  return fetchJson(`${API_BASE}/admin/import/voted`, {
-    method: "POST",
+  if (onProgress) onProgress(job);
+  if (!job || job.status === "failed") {
+    const errors = (job && job.errors) || [];
+    throw new Error(errors.length ? errors.join("; ") : "Import failed");
+  }
+  return job.result;
+}
+
+export async function apiGetImportJob(jobId) {
+  return fetchJson(`${API_BASE}/admin/import/jobs/${jobId}`, {
     headers: authHeaders(),
-    body: formData,
   });
 }
 
+export async function apiImportVoters(file, onProgress) {
+  return runImportJob("/admin/import/voters", file, onProgress);
+}
+
+export async function apiImportVoted(file, onProgress) {
+  return runImportJob("/admin/import/voted", file, onProgress);
+}
+
 export async function apiDeleteAllVoters() {
   return fetchJson(`${API_BASE}/admin/voters`, {
     method: "DELETE",
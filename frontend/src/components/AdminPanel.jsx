@@ -4,6 +4,7 @@ import {
   apiImportVoters,
   apiImportVoted,
   apiDeleteAllVoters,
+  apiExportVoters,
   apiInviteUser,
   apiUploadLogo,
   apiGetMe,
@@ -37,6 +38,10 @@ export default function AdminPanel() {
   const [importVotedError, setImportVotedError] = useState(null);
   const [importVotedLoading, setImportVotedLoading] = useState(false);
 
+  // Export voters
+  const [exportVotersError, setExportVotersError] = useState(null);
+  const [exportVotersLoading, setExportVotersLoading] = useState(false);
+
   // Delete voters
   const [deleteVotersResult, setDeleteVotersResult] = useState(null);
   const [deleteVotersError, setDeleteVotersError] = useState(null);
@@ -277,6 +282,27 @@ export default function AdminPanel() {
     }
   };
 
+  // ----- Handler: Export voters -----
+  const handleExportVoters = async () => {
+    setExportVotersLoading(true);
+    setExportVotersError(null);
+    try {
+      const blob = await apiExportVoters();
+      const url = URL.createObjectURL(blob);
+      const a = document.createElement("a");
+      a.href = url;
+      a.download = "voters.csv.gz";
+      document.body.appendChild(a);
+      a.click();
+      a.remove();
+      URL.revokeObjectURL(url);
+    } catch (err) {
+      setExportVotersError(err.message || "Failed to export voters");
+    } finally {
+      setExportVotersLoading(false);
+    }
+  };
+
   // ----- Handler: Delete all voters -----
   const handleDeleteAllVoters = async () => {
     if (
@@ -522,7 +548,7 @@ export default function AdminPanel() {
             Import Voters CSV:
             <input
               type="file"
-              accept=".csv"
+              accept=".csv,.gz"
               onChange={handleImportVoters}
               style={{ marginLeft: "0.5rem" }}
             />
@@ -544,7 +570,7 @@ export default function AdminPanel() {
             Import Voted CSV:
             <input
               type="file"
-              accept=".csv"
+              accept=".csv,.gz"
               onChange={handleImportVoted}
               style={{ marginLeft: "0.5rem" }}
             />
@@ -556,12 +582,25 @@ export default function AdminPanel() {
         )}
         {importVotedResult && (
           <p style={{ color: "green" }}>
-            Updated voted: {importVotedResult.updated_voted || 0} (Not found:{" "}
+            Updated voted: {importVotedResult.updated_voted || 0} (Newly voted:{" "}
+            {importVotedResult.newly_voted || 0}, Already voted:{" "}
+            {importVotedResult.already_voted || 0}, Not found:{" "}
             {importVotedResult.not_found || 0})
           </p>
         )}
       </section>
 
+      {/* Voter export */}
+      <section style={{ marginBottom: "1.5rem" }}>
+        <h3>Voter Export</h3>
+        <button type="button" onClick={handleExportVoters} disabled={exportVotersLoading}>
+          {exportVotersLoading ? "Exporting..." : "Export All Voters (.csv.gz)"}
+        </button>
+        {exportVotersError && (
+          <p style={{ color: "red", marginTop: "0.5rem" }}>{exportVotersError}</p>
+        )}
+      </section>
+
       {/* Danger zone: delete voters */}
       <section style={{ marginBottom: "1.5rem" }}>
         <h3>Danger Zone</h3>
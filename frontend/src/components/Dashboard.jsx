@@ -1,13 +1,17 @@
 import { useEffect, useState } from "react";
 import {
   apiGetDashboard,
+  apiOpenLiveUpdates,
   apiExportCallList,
   apiUntagVoter,
   apiUpdateTaggedVoterContact,
 } from "../api";
 
+const DASHBOARD_PAGE_SIZE = 500;
+
 export default function Dashboard() {
   const [voters, setVoters] = useState([]);
+  const [sort, setSort] = useState("name");
   const [error, setError] = useState("");
   const [loading, setLoading] = useState(false);
   const [exporting, setExporting] = useState(false);
@@ -20,12 +24,19 @@ export default function Dashboard() {
   const [editNote, setEditNote] = useState("");
   const [savingEdit, setSavingEdit] = useState(false);
 
-  async function loadDashboard() {
+  // Big call lists arrive page by page; rows show up as each page lands
+  async function loadDashboard(sortBy = sort) {
     try {
       setLoading(true);
-      const res = await apiGetDashboard();
-      setVoters(res || []);
       setError("");
+      let cursor = null;
+      let loaded = [];
+      do {
+        const res = await apiGetDashboard({ sort: sortBy, limit: DASHBOARD_PAGE_SIZE, cursor });
+        loaded = [...loaded, ...res.voters];
+        setVoters(loaded);
+        cursor = res.nextCursor;
+      } while (cursor);
     } catch (err) {
       setError(err.message || "Failed to load dashboard");
     } finally {
@@ -35,6 +46,22 @@ export default function Dashboard() {
 
   useEffect(() => {
     loadDashboard();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+
+  // Voted imports and contact edits are pushed here instead of polling
+  useEffect(() => {
+    const source = apiOpenLiveUpdates({
+      onVoter: (voter) =>
+        setVoters((prev) =>
+          prev.some((v) => v.id === voter.id)
+            ? prev.map((v) => (v.id === voter.id ? { ...v, ...voter } : v))
+            : [...prev, voter]
+        ),
+      onResync: () => loadDashboard(),
+    });
+    return () => source.close();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
   }, []);
 
   const total = voters.length;
@@ -125,11 +152,22 @@ export default function Dashboard() {
         <div>Total Tagged: {total}</div>
         <div>Voted: {votedCount}</div>
         <div>Not Voted: {notVotedCount}</div>
-        <button
-          onClick={loadDashboard}
-          disabled={loading}
-          style={{ marginLeft: "auto" }}
-        >
+        <label style={{ marginLeft: "auto" }}>
+          Sort:{" "}
+          <select
+            value={sort}
+            disabled={loading}
+            onChange={(e) => {
+              setSort(e.target.value);
+              loadDashboard(e.target.value);
+            }}
+          >
+            <option value="name">Name</option>
+            <option value="precinct">Precinct</option>
+            <option value="voted">Not voted first</option>
+          </select>
+        </label>
+        <button onClick={() => loadDashboard()} disabled={loading}>
           {loading ? "Refreshing..." : "Refresh"}
         </button>
       </div>
@@ -1,5 +1,5 @@
 import { useEffect, useMemo, useState } from "react";
-import { apiSearchVoters, apiTagVoter, apiUntagVoter } from "../api";
+import { apiBulkTagVoters, apiSearchVoters, apiSuggestVoters, apiTagVoter, apiUntagVoter } from "../api";
 
 export default function VoterSearch(props) {
   // ✅ Safe defaults: if parent doesn't pass these, we still work.
@@ -10,7 +10,9 @@ export default function VoterSearch(props) {
 
   const [query, setQuery] = useState("");
   const [field, setField] = useState("all");
+  const [fuzzy, setFuzzy] = useState(false);
   const [voters, setVoters] = useState([]);
+  const [suggestions, setSuggestions] = useState([]);
   const [error, setError] = useState("");
 
   const [page, setPage] = useState(1);
@@ -22,7 +24,7 @@ export default function VoterSearch(props) {
   async function loadVoters(newPage = page, newPageSize = pageSize) {
     try {
       setError("");
-      const res = await apiSearchVoters(query, newPage, newPageSize, field);
+      const res = await apiSearchVoters({ q: query, page: newPage, pageSize: newPageSize, field, fuzzy });
 
       setVoters(res?.voters || []);
       setPage(res?.page || newPage);
@@ -40,6 +42,29 @@ export default function VoterSearch(props) {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, []);
 
+  // As-you-type completions for the search box (names and streets)
+  useEffect(() => {
+    const typed = query.trim();
+    if (typed.length < 2) {
+      setSuggestions([]);
+      return undefined;
+    }
+    let cancelled = false;
+    const timer = setTimeout(() => {
+      apiSuggestVoters(typed)
+        .then((res) => {
+          if (!cancelled) setSuggestions(Array.isArray(res) ? res : []);
+        })
+        .catch(() => {
+          if (!cancelled) setSuggestions([]);
+        });
+    }, 150);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [query]);
+
   async function handleSearch(e) {
     e.preventDefault();
     setPage(1);
@@ -61,6 +86,19 @@ export default function VoterSearch(props) {
     }
   }
 
+  async function tagPage() {
+    try {
+      setError("");
+      const res = await apiBulkTagVoters({ voterIds: voters.map((v) => v.id) });
+      const added = (res?.results || [])
+        .filter((r) => r.status === "tagged" || r.status === "already_tagged")
+        .map((r) => r.voter_id);
+      setTaggedIds([...taggedIds, ...added.filter((id) => !taggedIds.includes(id))]);
+    } catch (e) {
+      setError(e?.message || "Failed to tag voters");
+    }
+  }
+
   const start = voters.length === 0 ? 0 : (page - 1) * pageSize + 1;
   const end = (page - 1) * pageSize + voters.length;
 
@@ -86,8 +124,14 @@ export default function VoterSearch(props) {
           value={query}
           onChange={(e) => setQuery(e.target.value)}
           placeholder="Search voters..."
+          list="voter-search-suggestions"
           style={{ flex: 1, padding: "0.5rem" }}
         />
+        <datalist id="voter-search-suggestions">
+          {suggestions.map((s) => (
+            <option key={`${s.kind}:${s.text}`} value={s.text} />
+          ))}
+        </datalist>
         <select value={field} onChange={(e) => setField(e.target.value)} style={{ padding: "0.5rem" }}>
           <option value="all">All fields</option>
           <option value="first_name">First name</option>
@@ -103,6 +147,10 @@ export default function VoterSearch(props) {
           <option value="email">Email</option>
           <option value="voter_id">Voter ID</option>
         </select>
+        <label style={{ display: "flex", alignItems: "center", gap: "0.25rem" }} title="Match names that sound alike">
+          <input type="checkbox" checked={fuzzy} onChange={(e) => setFuzzy(e.target.checked)} />
+          Sounds like
+        </label>
         <button type="submit">Search</button>
       </form>
 
@@ -112,6 +160,10 @@ export default function VoterSearch(props) {
         </div>
 
         <div style={{ display: "flex", alignItems: "center", gap: "0.5rem" }}>
+          <button disabled={voters.length === 0} onClick={tagPage}>
+            Tag all on page
+          </button>
+
           <label>
             Rows per page:{" "}
             <select